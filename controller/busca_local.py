@@ -0,0 +1,312 @@
+import time
+
+EPSILON = 1e-9
+
+
+class RotaBusca:
+    """
+    Rota de um caminhão na busca local: paradas como índices da tabela de distâncias e,
+    em listas paralelas, o prazo mais apertado, o peso e a carga (entregas) de cada parada.
+    """
+    __slots__ = ("origem", "paradas", "prazos", "pesos", "cargas", "capacidade", "horas_maximas", "carga", "tempo")
+
+    def __init__(self, origem: int, paradas: list, prazos: list, pesos: list, cargas: list,
+                 capacidade: float, horas_maximas: float, tempo: float):
+        self.origem = origem
+        self.paradas = list(paradas)
+        self.prazos = list(prazos)
+        self.pesos = list(pesos)
+        self.cargas = list(cargas)
+        self.capacidade = capacidade
+        self.horas_maximas = horas_maximas
+        self.carga = sum(pesos)
+        self.tempo = tempo
+
+
+class BuscaLocalRotas:
+    """
+    Melhora rotas já alocadas com movimentos de busca local, até não haver melhoria ou
+    acabar o tempo dado:
+        - 2-opt: inverte um trecho da rota;
+        - or-opt: move um bloco de 1 a 3 paradas para outra posição da mesma rota;
+        - realocação: move uma parada para outro caminhão (ou junta à parada da mesma cidade);
+        - troca: troca paradas entre dois caminhões.
+
+    A variação de custo de cada movimento é calculada em O(1) pela tabela de distâncias;
+    só os movimentos que melhoram passam pela verificação O(m) de prazos e horas.
+    O objetivo é a soma dos tempos das rotas: abertas (terminam na última parada) ou, com
+    com_retorno, fechadas; nesse caso a origem faz o papel da parada seguinte à última.
+    """
+
+    def __init__(self, rotas: list, distancias: list, com_retorno: bool = False):
+        """
+        Args:
+            rotas (list[RotaBusca]): rotas viáveis (cumprem prazos, horas e capacidade).
+            distancias (list[list[float]]): distancias[i][j] entre os índices usados nas rotas.
+            com_retorno (bool): se o tempo das rotas inclui a volta da última parada à origem.
+        """
+        self.rotas = rotas
+        self.d = distancias
+        self.com_retorno = com_retorno
+        self.movimentos = {"2-opt": 0, "or-opt": 0, "realocacao": 0, "troca": 0}
+        self.avaliacoes = 0
+        self.tempo_esgotado = False
+        self._fim = float('inf')
+
+    def custo_total(self) -> float:
+        return sum(rota.tempo for rota in self.rotas)
+
+    def executar(self, tempo_limite: float) -> dict:
+        """
+        Aplica movimentos de primeira melhoria até um ótimo local ou até `tempo_limite` segundos.
+
+        Returns:
+            dict: custo antes/depois, movimentos aplicados por tipo, avaliações, segundos gastos
+            e se o tempo acabou antes do ótimo local.
+        """
+        inicio = time.perf_counter()
+        self._fim = inicio + tempo_limite
+        custo_inicial = self.custo_total()
+
+        melhorou = True
+        while melhorou and not self.tempo_esgotado:
+            melhorou = False
+            for vizinhanca in (self._dois_opt, self._or_opt, self._realocar, self._trocar):
+                if vizinhanca():
+                    melhorou = True
+                if self.tempo_esgotado:
+                    break
+
+        return {
+            "custo_inicial": custo_inicial,
+            "custo_final": self.custo_total(),
+            "movimentos": dict(self.movimentos),
+            "avaliacoes": self.avaliacoes,
+            "segundos": time.perf_counter() - inicio,
+            "tempo_esgotado": self.tempo_esgotado,
+        }
+
+    def _esgotou(self) -> bool:
+        """ Conta uma avaliação; consulta o relógio a cada 64 para não pesar no laço. """
+        self.avaliacoes += 1
+        if not self.avaliacoes & 63 and time.perf_counter() >= self._fim:
+            self.tempo_esgotado = True
+        return self.tempo_esgotado
+
+    def _tempo_se_viavel(self, rota: RotaBusca, paradas: list, prazos: list):
+        """ Tempo da rota com essas paradas, ou None se violar algum prazo ou as horas. O(m). """
+        d = self.d
+        tempo = 0
+        anterior = rota.origem
+        for parada, prazo in zip(paradas, prazos):
+            tempo += d[anterior][parada]
+            if tempo > prazo:
+                return None
+            anterior = parada
+        if self.com_retorno:
+            tempo += d[anterior][rota.origem]
+        return tempo if tempo <= rota.horas_maximas else None
+
+    def _seguinte(self, origem: int, paradas: list, posicao: int):
+        """ Parada na posição dada; depois da última, a origem (rotas com retorno) ou None. """
+        if posicao < len(paradas):
+            return paradas[posicao]
+        return origem if self.com_retorno else None
+
+    def _delta_remocao(self, rota: RotaBusca, i: int, k: int = 1) -> float:
+        """ Variação de custo ao retirar as paradas i..i+k-1 da rota. """
+        d, p = self.d, rota.paradas
+        anterior = rota.origem if i == 0 else p[i - 1]
+        delta = -d[anterior][p[i]]
+        proxima = self._seguinte(rota.origem, p, i + k)
+        if proxima is not None:
+            delta += d[anterior][proxima] - d[p[i + k - 1]][proxima]
+        return delta
+
+    def _delta_insercao(self, origem: int, paradas: list, t: int, primeira: int, ultima: int) -> float:
+        """ Variação de custo ao inserir um bloco (primeira..ultima) antes da posição t de `paradas`. """
+        d = self.d
+        anterior = origem if t == 0 else paradas[t - 1]
+        delta = d[anterior][primeira]
+        proxima = self._seguinte(origem, paradas, t)
+        if proxima is not None:
+            delta += d[ultima][proxima] - d[anterior][proxima]
+        return delta
+
+    def _aplicar(self, rota: RotaBusca, paradas, prazos, pesos, cargas, tempo):
+        rota.paradas, rota.prazos, rota.pesos, rota.cargas = paradas, prazos, pesos, cargas
+        rota.carga = sum(pesos)
+        rota.tempo = tempo
+
+    def _dois_opt(self) -> bool:
+        d = self.d
+        melhorou = False
+        for rota in self.rotas:
+            reiniciar = True
+            while reiniciar:
+                reiniciar = False
+                p = rota.paradas
+                m = len(p)
+                for i in range(m - 1):
+                    anterior = rota.origem if i == 0 else p[i - 1]
+                    for j in range(i + 1, m):
+                        if self._esgotou():
+                            return melhorou
+                        delta = d[anterior][p[j]] - d[anterior][p[i]]
+                        proxima = self._seguinte(rota.origem, p, j + 1)
+                        if proxima is not None:
+                            delta += d[p[i]][proxima] - d[p[j]][proxima]
+                        if delta >= -EPSILON:
+                            continue
+                        inverter = lambda lista: lista[:i] + lista[i:j + 1][::-1] + lista[j + 1:]
+                        paradas, prazos = inverter(rota.paradas), inverter(rota.prazos)
+                        tempo = self._tempo_se_viavel(rota, paradas, prazos)
+                        if tempo is None or tempo >= rota.tempo - EPSILON:
+                            continue
+                        self._aplicar(rota, paradas, prazos, inverter(rota.pesos), inverter(rota.cargas), tempo)
+                        self.movimentos["2-opt"] += 1
+                        melhorou = reiniciar = True
+                        break
+                    if reiniciar:
+                        break
+        return melhorou
+
+    def _or_opt(self) -> bool:
+        melhorou = False
+        for rota in self.rotas:
+            reiniciar = True
+            while reiniciar:
+                reiniciar = False
+                m = len(rota.paradas)
+                for k in (1, 2, 3):
+                    for i in range(m - k + 1):
+                        p = rota.paradas
+                        remocao = self._delta_remocao(rota, i, k)
+                        resto = p[:i] + p[i + k:]
+                        for t in range(len(resto) + 1):
+                            if self._esgotou():
+                                return melhorou
+                            if t == i:
+                                continue
+                            if remocao + self._delta_insercao(rota.origem, resto, t, p[i], p[i + k - 1]) >= -EPSILON:
+                                continue
+                            mover = lambda lista: (lista[:i] + lista[i + k:])[:t] + lista[i:i + k] + (lista[:i] + lista[i + k:])[t:]
+                            paradas, prazos = mover(rota.paradas), mover(rota.prazos)
+                            tempo = self._tempo_se_viavel(rota, paradas, prazos)
+                            if tempo is None or tempo >= rota.tempo - EPSILON:
+                                continue
+                            self._aplicar(rota, paradas, prazos, mover(rota.pesos), mover(rota.cargas), tempo)
+                            self.movimentos["or-opt"] += 1
+                            melhorou = reiniciar = True
+                            break
+                        if reiniciar:
+                            break
+                    if reiniciar:
+                        break
+        return melhorou
+
+    def _realocar(self) -> bool:
+        melhorou = False
+        for origem in self.rotas:
+            i = 0
+            while i < len(origem.paradas):
+                movida = False
+                parada, peso = origem.paradas[i], origem.pesos[i]
+                remocao = self._delta_remocao(origem, i)
+                for destino in self.rotas:
+                    if destino is origem or destino.carga + peso > destino.capacidade:
+                        continue
+                    if self._esgotou():
+                        return melhorou
+
+                    if parada in destino.paradas: # A cidade já é parada do destino: a carga vai junto
+                        posicoes = [None]
+                    else:
+                        posicoes = range(len(destino.paradas) + 1)
+                    for t in posicoes:
+                        insercao = 0 if t is None else self._delta_insercao(destino.origem, destino.paradas, t, parada, parada)
+                        if remocao + insercao >= -EPSILON:
+                            continue
+                        if self._mover_entre_rotas(origem, i, destino, t):
+                            self.movimentos["realocacao"] += 1
+                            melhorou = movida = True
+                            break
+                    if movida:
+                        break
+                if not movida:
+                    i += 1
+        return melhorou
+
+    def _mover_entre_rotas(self, origem: RotaBusca, i: int, destino: RotaBusca, t) -> bool:
+        """ Move a parada i de `origem` para a posição t de `destino` (t=None: junta à parada existente). """
+        sem = lambda lista: lista[:i] + lista[i + 1:]
+        paradas_o, prazos_o = sem(origem.paradas), sem(origem.prazos)
+        tempo_o = self._tempo_se_viavel(origem, paradas_o, prazos_o)
+        if tempo_o is None:
+            return False
+
+        parada = origem.paradas[i]
+        if t is None:
+            j = destino.paradas.index(parada)
+            paradas_d = destino.paradas
+            prazos_d = destino.prazos[:j] + [min(destino.prazos[j], origem.prazos[i])] + destino.prazos[j + 1:]
+            pesos_d = destino.pesos[:j] + [destino.pesos[j] + origem.pesos[i]] + destino.pesos[j + 1:]
+            cargas_d = destino.cargas[:j] + [destino.cargas[j] + origem.cargas[i]] + destino.cargas[j + 1:]
+        else:
+            com = lambda lista, item: lista[:t] + [item] + lista[t:]
+            paradas_d = com(destino.paradas, parada)
+            prazos_d = com(destino.prazos, origem.prazos[i])
+            pesos_d = com(destino.pesos, origem.pesos[i])
+            cargas_d = com(destino.cargas, origem.cargas[i])
+        tempo_d = self._tempo_se_viavel(destino, paradas_d, prazos_d)
+        if tempo_d is None or tempo_o + tempo_d >= origem.tempo + destino.tempo - EPSILON:
+            return False
+
+        self._aplicar(destino, list(paradas_d), prazos_d, pesos_d, cargas_d, tempo_d)
+        self._aplicar(origem, paradas_o, prazos_o, sem(origem.pesos), sem(origem.cargas), tempo_o)
+        return True
+
+    def _trocar(self) -> bool:
+        d = self.d
+        melhorou = False
+        for a_idx, rota_a in enumerate(self.rotas):
+            for rota_b in self.rotas[a_idx + 1:]:
+                for i in range(len(rota_a.paradas)):
+                    for j in range(len(rota_b.paradas)):
+                        if self._esgotou():
+                            return melhorou
+                        pa, pb = rota_a.paradas[i], rota_b.paradas[j]
+                        if pa in rota_b.paradas or pb in rota_a.paradas:
+                            continue
+                        if (rota_a.carga - rota_a.pesos[i] + rota_b.pesos[j] > rota_a.capacidade
+                                or rota_b.carga - rota_b.pesos[j] + rota_a.pesos[i] > rota_b.capacidade):
+                            continue
+                        delta = self._delta_substituicao(rota_a, i, pb) + self._delta_substituicao(rota_b, j, pa)
+                        if delta >= -EPSILON:
+                            continue
+
+                        troca = lambda lista, pos, item: lista[:pos] + [item] + lista[pos + 1:]
+                        paradas_a, prazos_a = troca(rota_a.paradas, i, pb), troca(rota_a.prazos, i, rota_b.prazos[j])
+                        paradas_b, prazos_b = troca(rota_b.paradas, j, pa), troca(rota_b.prazos, j, rota_a.prazos[i])
+                        tempo_a = self._tempo_se_viavel(rota_a, paradas_a, prazos_a)
+                        tempo_b = self._tempo_se_viavel(rota_b, paradas_b, prazos_b) if tempo_a is not None else None
+                        if tempo_b is None or tempo_a + tempo_b >= rota_a.tempo + rota_b.tempo - EPSILON:
+                            continue
+
+                        pesos_a, pesos_b = troca(rota_a.pesos, i, rota_b.pesos[j]), troca(rota_b.pesos, j, rota_a.pesos[i])
+                        cargas_a, cargas_b = troca(rota_a.cargas, i, rota_b.cargas[j]), troca(rota_b.cargas, j, rota_a.cargas[i])
+                        self._aplicar(rota_a, paradas_a, prazos_a, pesos_a, cargas_a, tempo_a)
+                        self._aplicar(rota_b, paradas_b, prazos_b, pesos_b, cargas_b, tempo_b)
+                        self.movimentos["troca"] += 1
+                        melhorou = True
+        return melhorou
+
+    def _delta_substituicao(self, rota: RotaBusca, i: int, nova: int) -> float:
+        """ Variação de custo ao trocar a parada i da rota por `nova`. """
+        d, p = self.d, rota.paradas
+        anterior = rota.origem if i == 0 else p[i - 1]
+        delta = d[anterior][nova] - d[anterior][p[i]]
+        proxima = self._seguinte(rota.origem, p, i + 1)
+        if proxima is not None:
+            delta += d[nova][proxima] - d[p[i]][proxima]
+        return delta
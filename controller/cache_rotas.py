@@ -0,0 +1,111 @@
+import sys
+from collections import OrderedDict
+
+
+class CacheRotas:
+    """
+    Cache LRU limitado das ordens de visita já resolvidas pelo Roteirizador.
+
+    Ao longo de uma alocação, o mesmo problema (centro de origem, conjunto de paradas com
+    seus prazos) é resolvido várias vezes: para cada caminhão do mesmo centro com as mesmas
+    paradas e a cada nova entrega para uma cidade que o caminhão já visita. A chave é
+    canônica (frozenset), então a ordem em que as entregas foram alocadas não importa.
+
+    O cache tem dois limites: número de entradas e tamanho aproximado em bytes. Ao passar de
+    qualquer um, as entradas usadas há mais tempo são descartadas.
+
+    Parte do princípio de que o grafo não muda enquanto o cache está em uso; se mudar,
+    chame limpar() (o Roteirizador faz isso junto com OraculoCaminhos.invalidar()).
+    """
+    BYTES_POR_PARADA = 80 # Tupla (cidade, prazo) da chave com o float do prazo
+
+    def __init__(self, max_entradas: int = 4096, max_bytes: int = 16 * 1024 * 1024):
+        """
+        Args:
+            max_entradas (int): número máximo de rotas guardadas.
+            max_bytes (int): tamanho máximo aproximado (sys.getsizeof das chaves e valores).
+        """
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.entradas = OrderedDict() # {chave: (valor, bytes)}, da menos para a mais recente
+        self.bytes = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.despejos = 0
+
+    @staticmethod
+    def chave(origem: str, paradas: list, prazos_paradas: list, restricoes=None) -> tuple:
+        """
+        Monta a chave canônica de um problema de rota.
+
+        Args:
+            origem (str): cidade de partida.
+            paradas (list[str]): cidades a visitar (sem repetição).
+            prazos_paradas (list[float]): prazo mais apertado de cada parada.
+            restricoes: demais parâmetros que mudam a resposta (ex.: limite de horas).
+        """
+        return origem, frozenset(zip(paradas, prazos_paradas)), restricoes
+
+    def obter(self, chave: tuple):
+        """ Retorna o valor guardado (marcando-o como recente) ou None. """
+        item = self.entradas.get(chave)
+        if item is None:
+            self.falhas += 1
+            return None
+        self.acertos += 1
+        self.entradas.move_to_end(chave)
+        return item[0]
+
+    def guardar(self, chave: tuple, valor: tuple):
+        """ Guarda o valor e descarta as entradas mais antigas que passarem dos limites. """
+        if self.max_entradas <= 0:
+            return
+        anterior = self.entradas.pop(chave, None)
+        if anterior is not None:
+            self.bytes -= anterior[1]
+        tamanho = self._tamanho_aproximado(chave, valor)
+        self.entradas[chave] = (valor, tamanho)
+        self.bytes += tamanho
+        while self.entradas and (len(self.entradas) > self.max_entradas or self.bytes > self.max_bytes):
+            _, (_, tamanho_removido) = self.entradas.popitem(last=False)
+            self.bytes -= tamanho_removido
+            self.despejos += 1
+
+    def limpar(self):
+        """ Descarta todas as entradas e zera os contadores. """
+        self.entradas.clear()
+        self.bytes = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.despejos = 0
+
+    @classmethod
+    def _tamanho_aproximado(cls, chave: tuple, valor: tuple) -> int:
+        """
+        Estimativa barata do tamanho de uma entrada: sys.getsizeof da chave, do conjunto de
+        paradas e dos itens do valor (e dos atributos de objetos guardados nele), sem descer
+        mais. Nomes de cidade são compartilhados com o grafo e não contam.
+        """
+        paradas = chave[1]
+        tamanho = sys.getsizeof(chave) + sys.getsizeof(paradas) + len(paradas) * cls.BYTES_POR_PARADA
+        for item in valor:
+            tamanho += sys.getsizeof(item)
+            if hasattr(item, '__dict__'):
+                tamanho += sum(map(sys.getsizeof, vars(item).values()))
+        return tamanho
+
+    def estatisticas(self) -> dict:
+        """ Retorna acertos, falhas, taxa de acertos, despejos e a ocupação atual. """
+        total = self.acertos + self.falhas
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "taxa_acertos": (self.acertos / total) if total else 0.0,
+            "despejos": self.despejos,
+            "entradas": len(self.entradas),
+            "bytes": self.bytes,
+        }
+
+    def __repr__(self):
+        return (f"CacheRotas com {len(self.entradas)}/{self.max_entradas} entradas "
+                f"(~{self.bytes} bytes) | Acertos: {self.acertos} | Falhas: {self.falhas}")
@@ -0,0 +1,110 @@
+class _RotaEconomia:
+    """ Rota parcial da construção: entregas na ordem de visita e o resumo usado nas fusões. """
+    __slots__ = ("entregas", "peso", "tempo", "folga", "inicio", "fim", "ativa")
+
+    def __init__(self, indice: int, cidade: str, peso: float, chegada: float, prazo: float):
+        self.entregas = [indice]
+        self.peso = peso
+        self.tempo = chegada          # Chegada na última entrega (sem o retorno ao centro)
+        self.folga = prazo - chegada  # Menor (prazo - chegada) entre as entregas da rota
+        self.inicio = cidade
+        self.fim = cidade
+        self.ativa = True
+
+
+def construir_rotas_economias(origem: str, destinos: list, pesos: list, prazos: list, distancia,
+                              capacidade_maxima: float, horas_maximas: float, retorno=None):
+    """
+    Constrói rotas pelo método das economias de Clarke–Wright: abertas (terminam na última
+    entrega) ou, com `retorno`, voltando ao centro.
+
+    Cada entrega começa numa rota própria. Ligar o fim de uma rota (cidade a) ao início de
+    outra (cidade b) economiza distancia(origem, b) - distancia(a, b), mais retorno(a) se as
+    rotas voltam ao centro (a primeira deixa de voltar de a). Como a economia só
+    depende do par de cidades, os pares de cidades são ordenados uma vez (O(C² log C)) e as
+    fusões são buscadas entre as rotas que terminam em a e as que começam em b. Cada fusão
+    é validada em O(1): peso, horas e a folga mínima de prazo da segunda rota, cujas
+    chegadas atrasam todas do mesmo valor.
+
+    Pares com economia negativa também são tentados (depois dos positivos): numa frota
+    limitada, juntar duas rotas viáveis libera um caminhão.
+
+    Args:
+        origem (str): cidade do centro de distribuição.
+        destinos (list[str]): destino de cada entrega.
+        pesos (list[float]): peso de cada entrega.
+        prazos (list[float]): prazo de cada entrega.
+        distancia (callable): distancia(a, b) -> menor distância entre duas cidades.
+        capacidade_maxima (float): carga máxima de uma rota (maior caminhão disponível).
+        horas_maximas (float): duração máxima de uma rota (maior jornada disponível).
+        retorno (callable): cidade -> tempo de volta ao centro (None = rotas abertas).
+
+    Returns:
+        tuple:
+            list[list[int]]: índices das entregas de cada rota, na ordem de visita.
+            dict: {índice: motivo} das entregas inviáveis mesmo sozinhas
+                ('inalcancavel', 'capacidade', 'prazo' ou 'horas').
+    """
+    inf = float('inf')
+    cidades = list(dict.fromkeys(destinos))
+    ate_cidade = {cidade: distancia(origem, cidade) for cidade in cidades}
+    volta = {cidade: (retorno(cidade) if retorno is not None else 0) for cidade in cidades}
+
+    inviaveis = {}
+    por_inicio = {cidade: {} for cidade in cidades} # {cidade: {id(rota): rota}} (dict mantém a ordem de inserção)
+    por_fim = {cidade: {} for cidade in cidades}
+    rotas = []
+    for i, cidade in enumerate(destinos):
+        chegada = ate_cidade[cidade]
+        if chegada == inf:
+            inviaveis[i] = "inalcancavel"
+        elif pesos[i] > capacidade_maxima:
+            inviaveis[i] = "capacidade"
+        elif chegada > prazos[i]:
+            inviaveis[i] = "prazo"
+        elif chegada + volta[cidade] > horas_maximas:
+            inviaveis[i] = "horas"
+        else:
+            rota = _RotaEconomia(i, cidade, pesos[i], chegada, prazos[i])
+            rotas.append(rota)
+            por_inicio[cidade][id(rota)] = rota
+            por_fim[cidade][id(rota)] = rota
+
+    pares = []
+    for a in cidades:
+        for b in cidades:
+            trecho = distancia(a, b)
+            if trecho != inf and ate_cidade[b] != inf:
+                pares.append((ate_cidade[b] + volta[a] - trecho, a, b, trecho))
+    pares.sort(key=lambda par: -par[0]) # sort é estável: empates ficam na ordem das cidades
+
+    for _, a, b, trecho in pares:
+        terminam_em_a = por_fim[a]
+        comecam_em_b = por_inicio[b]
+        if not terminam_em_a or not comecam_em_b:
+            continue
+        for primeira in list(terminam_em_a.values()):
+            if not primeira.ativa or primeira.fim != a:
+                continue
+            for segunda in list(comecam_em_b.values()):
+                if segunda is primeira or not segunda.ativa:
+                    continue
+                atraso = primeira.tempo + trecho - ate_cidade[b] # Quanto as chegadas da segunda rota atrasam
+                if (primeira.peso + segunda.peso > capacidade_maxima
+                        or segunda.tempo + atraso + volta[segunda.fim] > horas_maximas
+                        or segunda.folga < atraso):
+                    continue
+
+                del terminam_em_a[id(primeira)]
+                del comecam_em_b[id(segunda)]
+                del por_fim[segunda.fim][id(segunda)]
+                primeira.entregas.extend(segunda.entregas)
+                primeira.peso += segunda.peso
+                primeira.folga = min(primeira.folga, segunda.folga - atraso)
+                primeira.tempo = segunda.tempo + atraso
+                primeira.fim = segunda.fim
+                por_fim[primeira.fim][id(primeira)] = primeira
+                segunda.ativa = False
+                break # 'primeira' agora termina em outra cidade
+
+    return [rota.entregas for rota in rotas if rota.ativa], inviaveis
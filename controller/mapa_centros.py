@@ -0,0 +1,95 @@
+import heapq
+
+
+class MapaCentrosProximos:
+    """
+    Pré-cálculo, para cada cidade do grafo, do centro de distribuição mais próximo.
+
+    Executa um único Dijkstra multi-origem semeado com a cidade de todos os centros.
+    Cada cidade pode ser fixada uma vez por centro, então, ao final da busca, cada
+    cidade tem o ranking completo (ou os `limite_ranking` primeiros) dos centros
+    ordenados por distância. Depois de construído, centro_mais_proximo vira uma
+    consulta O(1) em dicionário.
+    """
+
+    def __init__(self, grafo, centros, limite_ranking: int = None):
+        """
+        Inicializa o mapa (a busca só é executada em construir()).
+
+        Args:
+            grafo (Grafo): qualquer implementação de grafo que exponha vizinhos(no).
+            centros (List[CentroDistribuicao]): centros que servem de origem da busca.
+            limite_ranking (int): quantos centros guardar por cidade (None = todos).
+        """
+        self.grafo = grafo
+        self.centros = list(centros)
+        self.limite_ranking = limite_ranking if limite_ranking is not None else len(self.centros)
+        self.ranking_por_cidade = {}  # {cidade: [(indice_centro, distancia), ...]} em ordem crescente
+        self.construido = False
+
+    def construir(self):
+        """
+        Executa o Dijkstra multi-origem.
+
+        A fila guarda (distancia, indice_centro, cidade); o índice do centro desempata
+        distâncias iguais, preservando a regra antiga de ficar com o primeiro centro da
+        lista. Uma cidade que já fixou `limite_ranking` centros não é mais expandida,
+        pois nenhum caminho que passe por ela pode entrar no ranking de outra cidade.
+        """
+        self.ranking_por_cidade = {}
+        if self.limite_ranking <= 0:
+            self.construido = True
+            return self
+
+        melhor = {}  # {(cidade, indice_centro): menor distância conhecida}
+        pq = []
+        for idx, centro in enumerate(self.centros):
+            if centro.cidade in self.grafo: # Centros fora do grafo são inalcançáveis
+                melhor[(centro.cidade, idx)] = 0
+                pq.append((0, idx, centro.cidade))
+        heapq.heapify(pq)
+
+        fixados = set()
+        while pq:
+            dist_u, idx, u = heapq.heappop(pq)
+            if (u, idx) in fixados:
+                continue
+
+            ranking_u = self.ranking_por_cidade.setdefault(u, [])
+            if len(ranking_u) >= self.limite_ranking:
+                continue
+            fixados.add((u, idx))
+            ranking_u.append((idx, dist_u))
+
+            for vizinho, peso in self.grafo.vizinhos(u):
+                if (vizinho, idx) in fixados:
+                    continue
+                nova_dist = dist_u + peso
+                if nova_dist < melhor.get((vizinho, idx), float('inf')):
+                    melhor[(vizinho, idx)] = nova_dist
+                    heapq.heappush(pq, (nova_dist, idx, vizinho))
+
+        self.construido = True
+        return self
+
+    def mais_proximo(self, cidade: str):
+        """
+        Retorna (CentroDistribuicao, distancia) do centro mais próximo da cidade,
+        ou (None, inf) se nenhum centro alcança a cidade.
+        """
+        if not self.construido:
+            self.construir()
+        ranking = self.ranking_por_cidade.get(cidade)
+        if not ranking:
+            return None, float('inf')
+        idx, distancia = ranking[0]
+        return self.centros[idx], distancia
+
+    def ranking(self, cidade: str) -> list:
+        """ Retorna a lista [(CentroDistribuicao, distancia), ...] do mais próximo ao mais distante. """
+        if not self.construido:
+            self.construir()
+        return [(self.centros[idx], dist) for idx, dist in self.ranking_por_cidade.get(cidade, [])]
+
+    def __repr__(self):
+        return f"MapaCentrosProximos com {len(self.centros)} centros e {len(self.ranking_por_cidade)} cidades rotuladas"
@@ -0,0 +1,227 @@
+class OraculoCaminhos:
+    """
+    Camada de consulta de distâncias/caminhos entre o Roteirizador e o grafo.
+
+    Calcula a árvore de caminhos mínimos de cada origem uma única vez (via
+    grafo.dijkstra) e responde às consultas seguintes com buscas em dicionário.
+    Funciona com qualquer implementação de grafo do projeto, pois todas expõem
+    dijkstra(origem) -> (distancias, anterior).
+
+    Sem memorização, todas as buscas ficam a cargo da própria estrutura de grafo (com sua
+    fila e seu motor), o que permite comparar as implementações dentro do Roteirizador.
+
+    Parte do princípio de que o grafo não muda enquanto o oráculo está em uso;
+    se arestas forem adicionadas, chame invalidar().
+    """
+
+    def __init__(self, grafo, memorizar: bool = True):
+        """
+        Inicializa o oráculo.
+
+        Args:
+            grafo (Grafo): instância de qualquer implementação de grafo do projeto.
+            memorizar (bool): se False, distancia e caminho_mais_curto são repassados para
+                grafo.caminho_mais_curto e cada linha de matriz_paradas é um
+                grafo.dijkstra_multialvo, sem passar pelas árvores memorizadas (útil para
+                comparar as estruturas).
+        """
+        self.grafo = grafo
+        self.memorizar = memorizar
+        self.arvores = {}   # {origem: (distancias, anterior)}
+        self.caminhos = {}  # {(origem, destino): (caminho, distancia)}
+        self.acertos = 0    # Consultas respondidas com árvore já calculada
+        self.falhas = 0     # Consultas que exigiram um novo Dijkstra
+        self.buscas_parciais = 0 # grafo.dijkstra_multialvo feitos por matriz_paradas (sem memorização)
+
+    def invalidar(self):
+        """ Descarta todas as árvores memorizadas e zera os contadores. """
+        self.arvores.clear()
+        self.caminhos.clear()
+        self.acertos = 0
+        self.falhas = 0
+        self.buscas_parciais = 0
+
+    def arvore(self, origem: str):
+        """
+        Retorna a árvore de caminhos mínimos a partir da origem, calculando-a se necessário.
+
+        Returns:
+            tuple:
+                dict: Mapeamento de cidades para suas menores distâncias desde a origem.
+                dict: Mapeamento de cada cidade para seu antecessor no caminho mais curto.
+        """
+        arvore = self.arvores.get(origem)
+        if arvore is None:
+            self.falhas += 1
+            arvore = self.grafo.dijkstra(origem)
+            self.arvores[origem] = arvore
+        else:
+            self.acertos += 1
+        return arvore
+
+    def distancia(self, origem: str, destino: str) -> float:
+        """ Retorna apenas a menor distância entre origem e destino (inf se inalcançável). """
+        if not self.memorizar:
+            return self.grafo.caminho_mais_curto(origem, destino)[1]
+
+        distancias, _ = self.arvore(origem)
+        return distancias.get(destino, float('inf'))
+
+    def caminho_mais_curto(self, origem: str, destino: str):
+        """
+        Mesmo contrato de Grafo.caminho_mais_curto, porém servido a partir da árvore memorizada.
+
+        Returns:
+            tuple:
+                list: Caminho mais curto como lista de cidades (ou None).
+                float: Distância total do caminho (ou inf).
+        """
+        if not self.memorizar:
+            return self.grafo.caminho_mais_curto(origem, destino)
+
+        chave = (origem, destino)
+        memorizado = self.caminhos.get(chave)
+        if memorizado is not None:
+            self.acertos += 1
+            caminho, distancia = memorizado
+            return (list(caminho) if caminho else None), distancia
+
+        distancias, anterior = self.arvore(origem)
+        distancia = distancias.get(destino, float('inf'))
+        caminho = None
+        if distancia != float('inf'):
+            caminho = self._reconstruir_caminho(anterior, origem, destino, len(distancias))
+            if caminho is None:
+                distancia = float('inf')
+
+        self.caminhos[chave] = (caminho, distancia)
+        return (list(caminho) if caminho else None), distancia
+
+    def matriz_paradas(self, origem: str, paradas: list) -> 'MatrizParadas':
+        """
+        Matriz de distâncias/antecessores entre a origem e as paradas de uma rota.
+
+        Com memorização (o padrão do Roteirizador), as linhas são as árvores completas de
+        arvore(): cada origem é buscada uma única vez no grafo inteiro e reaproveitada por todas
+        as rotas seguintes, então a parada antecipada não compensaria. Sem memorização, cada
+        linha é um grafo.dijkstra_multialvo, executado pela própria estrutura (com sua fila e seu
+        motor) e interrompido assim que todas as paradas são fixadas, em vez de um
+        caminho_mais_curto por par de paradas.
+
+        Args:
+            origem (str): cidade de partida.
+            paradas (list[str]): cidades a visitar (sem repetição).
+        """
+        if self.memorizar:
+            return MatrizParadas(origem, paradas, lambda fonte, _: self.arvore(fonte))
+        return MatrizParadas(origem, paradas, self._dijkstra_multialvo)
+
+    def _dijkstra_multialvo(self, origem: str, alvos: list):
+        """ Linha de matriz_paradas sem memorização: busca multi-alvo da própria estrutura de grafo. """
+        self.buscas_parciais += 1
+        return self.grafo.dijkstra_multialvo(origem, alvos)
+
+    @staticmethod
+    def _reconstruir_caminho(anterior: dict, origem: str, destino: str, num_nos: int):
+        """ Percorre os antecessores do destino até a origem; None se a cadeia estiver quebrada. """
+        caminho = []
+        atual = destino
+        for _ in range(num_nos + 1): # Loop de segurança contra ciclos em 'anterior'
+            if atual is None:
+                return None
+            caminho.append(atual)
+            if atual == origem:
+                caminho.reverse()
+                return caminho
+            atual = anterior.get(atual)
+        return None
+
+    def estatisticas(self) -> dict:
+        """ Retorna os contadores de acertos/falhas e a quantidade de origens memorizadas. """
+        total = self.acertos + self.falhas
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "taxa_acertos": (self.acertos / total) if total else 0.0,
+            "origens_memorizadas": len(self.arvores),
+            "buscas_parciais": self.buscas_parciais,
+        }
+
+    def __repr__(self):
+        return (f"OraculoCaminhos sobre {self.grafo!r} | Acertos: {self.acertos} | "
+                f"Falhas: {self.falhas} | Origens: {len(self.arvores)}")
+
+
+class MatrizParadas:
+    """
+    Distâncias e antecessores entre a origem e as paradas de uma rota candidata.
+
+    Cada linha da matriz (origem ou parada) vem de uma única busca no grafo, feita na
+    primeira consulta àquela fonte e reaproveitada por todas as ordens de visita avaliadas
+    para a rota; assim o trabalho no grafo por avaliação fica limitado a |S| + 1 buscas,
+    não importa quantas ordens o resolvedor experimente. Os caminhos cidade a cidade só
+    são reconstruídos (pelos antecessores) para a ordem vencedora, em expandir().
+
+    Criada por OraculoCaminhos.matriz_paradas, que decide como cada linha é buscada.
+    """
+
+    def __init__(self, origem: str, paradas: list, buscar):
+        """
+        Args:
+            origem (str): cidade de partida da rota.
+            paradas (list[str]): cidades a visitar (sem repetição).
+            buscar (callable): (fonte, alvos) -> (distancias, anterior), com as distâncias
+                finais de todos os alvos alcançáveis e os antecessores até eles.
+        """
+        self.origem = origem
+        self.paradas = paradas
+        self._buscar = buscar
+        self._linhas = {} # {fonte: (distancias, anterior)}
+        self._matriz = None
+
+    def _linha(self, fonte: str):
+        linha = self._linhas.get(fonte)
+        if linha is None:
+            linha = self._linhas[fonte] = self._buscar(fonte, self.paradas)
+        return linha
+
+    def distancia(self, origem: str, destino: str) -> float:
+        """ Menor distância de uma fonte (origem ou parada) até uma parada; inf se inalcançável. """
+        return self._linha(origem)[0].get(destino, float('inf'))
+
+    def distancias(self):
+        """
+        Matriz no formato dos resolvedores de resolvedor_rotas.
+
+        Returns:
+            tuple:
+                list[float]: dist_origem[i], da origem até a parada i.
+                list[list[float]]: dist[i][j], da parada i até a parada j.
+        """
+        if self._matriz is None:
+            dist_origem = [self.distancia(self.origem, parada) for parada in self.paradas]
+            dist = [[self.distancia(a, b) for b in self.paradas] for a in self.paradas]
+            self._matriz = (dist_origem, dist)
+        return self._matriz
+
+    def caminho(self, origem: str, destino: str):
+        """ Caminho cidade a cidade entre uma fonte e uma parada (None se inalcançável). """
+        distancias, anterior = self._linha(origem)
+        if distancias.get(destino, float('inf')) == float('inf'):
+            return None
+        return OraculoCaminhos._reconstruir_caminho(anterior, origem, destino, len(anterior))
+
+    def expandir(self, sequencia_paradas: list):
+        """ Rota completa da origem pelas paradas na ordem dada; None se algum trecho for inalcançável. """
+        rota = [self.origem]
+        cidade_atual = self.origem
+        for proxima_parada in sequencia_paradas:
+            segmento = self.caminho(cidade_atual, proxima_parada)
+            if not segmento:
+                return None
+            rota.extend(segmento[1:])
+            cidade_atual = proxima_parada
+        return rota
+
+    def __repr__(self):
+        return f"MatrizParadas de {self.origem} | {len(self.paradas)} paradas | Linhas buscadas: {len(self._linhas)}"
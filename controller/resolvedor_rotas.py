@@ -0,0 +1,285 @@
+import numpy as np
+
+from model.linha_tempo_rota import LinhaTempoRota
+
+# Até este número de paradas o Held–Karp em Python puro é mais rápido que montar os arrays NumPy
+LIMITE_HELD_KARP_PYTHON = 8
+
+
+def tempos_de_chegada(dist_origem: list, dist: list, ordem: list) -> list:
+    """
+    Calcula o tempo acumulado de chegada em cada parada de uma ordem de visita.
+
+    Args:
+        dist_origem (list[float]): dist_origem[j] = distância da origem até a parada j.
+        dist (list[list[float]]): dist[i][j] = distância da parada i até a parada j.
+        ordem (list[int]): índices das paradas na ordem de visita.
+
+    Returns:
+        list[float]: tempo de chegada em cada parada, na mesma ordem de `ordem`.
+    """
+    chegadas = []
+    tempo = 0
+    anterior = None
+    for parada in ordem:
+        tempo += dist_origem[parada] if anterior is None else dist[anterior][parada]
+        chegadas.append(tempo)
+        anterior = parada
+    return chegadas
+
+
+def resolver_held_karp(dist_origem: list, dist: list, prazos: list = None, dist_retorno: list = None):
+    """
+    Encontra a ordem de visita de menor custo que parte da origem e passa por todas as
+    paradas uma única vez, via programação dinâmica de Held–Karp sobre subconjuntos
+    (bitmasks). Custo O(2^n · n²) em vez de O(n!). A rota é aberta (termina na última
+    parada), a menos que `dist_retorno` seja dado.
+
+    Args:
+        dist_origem (list[float]): dist_origem[j] = distância da origem até a parada j.
+        dist (list[list[float]]): dist[i][j] = distância da parada i até a parada j.
+        prazos (list[float]): prazo de chegada de cada parada (inf = sem prazo). Estados que
+            chegam a uma parada depois do prazo são descartados; como o custo é o próprio
+            tempo, o estado de menor tempo domina os demais e a solução continua exata.
+        dist_retorno (list[float]): dist_retorno[j] = distância da parada j de volta à origem.
+            O retorno só entra na escolha da última parada (não afeta os prazos), então a
+            programação dinâmica é a mesma.
+
+    Returns:
+        tuple:
+            list[int]: índices das paradas na ordem de visita (None se não houver rota viável).
+            float: custo total da rota, com o retorno se pedido (inf se não houver rota viável).
+    """
+    n = len(dist_origem)
+    if n == 0:
+        return [], 0
+    if prazos is None:
+        prazos = [float('inf')] * n
+    if dist_retorno is None:
+        dist_retorno = [0] * n
+
+    if n <= LIMITE_HELD_KARP_PYTHON:
+        return _held_karp_python(dist_origem, dist, prazos, dist_retorno)
+    return _held_karp_numpy(dist_origem, dist, prazos, dist_retorno)
+
+
+def _held_karp_python(dist_origem, dist, prazos, dist_retorno):
+    n = len(dist_origem)
+    total = 1 << n
+    inf = float('inf')
+    custo = [[inf] * n for _ in range(total)] # custo[mascara][j]: menor tempo visitando 'mascara' e terminando em j
+    pai = [[-1] * n for _ in range(total)]
+
+    for j in range(n):
+        if dist_origem[j] <= prazos[j]:
+            custo[1 << j][j] = dist_origem[j]
+
+    for mascara in range(1, total):
+        linha = custo[mascara]
+        for j in range(n):
+            custo_j = linha[j]
+            if custo_j == inf:
+                continue
+            dist_j = dist[j]
+            for t in range(n):
+                bit = 1 << t
+                if mascara & bit:
+                    continue
+                novo = custo_j + dist_j[t]
+                proxima = mascara | bit
+                if novo <= prazos[t] and novo < custo[proxima][t]:
+                    custo[proxima][t] = novo
+                    pai[proxima][t] = j
+
+    cheia = total - 1
+    finais = [custo[cheia][j] + dist_retorno[j] for j in range(n)]
+    ultimo = min(range(n), key=finais.__getitem__)
+    if finais[ultimo] == inf:
+        return None, inf
+    return _reconstruir_ordem(pai, cheia, ultimo), finais[ultimo]
+
+
+def _held_karp_numpy(dist_origem, dist, prazos, dist_retorno):
+    """
+    Mesmo algoritmo, vetorizado por camadas (máscaras com o mesmo número de bits):
+    cada camada é expandida de uma vez com uma soma (m, n, 1) + (1, n, n) e um argmin.
+    """
+    n = len(dist_origem)
+    total = 1 << n
+    matriz = np.asarray(dist, dtype=float)
+    limites = np.asarray(prazos, dtype=float)
+    bits = 1 << np.arange(n)
+
+    custo = np.full((total, n), np.inf)
+    pai = np.full((total, n), -1, dtype=np.int64)
+    iniciais = np.asarray(dist_origem, dtype=float)
+    custo[bits, np.arange(n)] = np.where(iniciais <= limites, iniciais, np.inf)
+
+    mascaras = np.arange(total)
+    bits_ligados = np.zeros(total, dtype=np.int64)
+    for b in range(n):
+        bits_ligados += (mascaras >> b) & 1
+
+    for camada in range(1, n):
+        atuais = mascaras[bits_ligados == camada]
+        candidatos = custo[atuais][:, :, None] + matriz[None, :, :] # (m, j, t)
+        melhor_j = candidatos.argmin(axis=1)
+        melhor = np.take_along_axis(candidatos, melhor_j[:, None, :], axis=1)[:, 0, :]
+        melhor[melhor > limites] = np.inf
+        for t in range(n):
+            livres = (atuais & bits[t]) == 0
+            proximas = atuais[livres] | bits[t]
+            custo[proximas, t] = melhor[livres, t] # Cada (proxima, t) vem de uma única máscara da camada
+            pai[proximas, t] = melhor_j[livres, t]
+
+    cheia = total - 1
+    finais = custo[cheia] + np.asarray(dist_retorno, dtype=float)
+    ultimo = int(finais.argmin())
+    if finais[ultimo] == np.inf:
+        return None, float('inf')
+    return _reconstruir_ordem(pai, cheia, ultimo), float(finais[ultimo])
+
+
+def _reconstruir_ordem(pai, mascara: int, ultimo: int) -> list:
+    """ Refaz a ordem de visita seguindo os predecessores a partir do estado final. """
+    ordem = []
+    atual = ultimo
+    while atual != -1:
+        ordem.append(atual)
+        anterior = int(pai[mascara][atual])
+        mascara ^= 1 << atual
+        atual = anterior
+    ordem.reverse()
+    return ordem
+
+
+def resolver_branch_and_bound(dist_origem: list, dist: list, prazos: list = None, limite_total: float = float('inf'),
+                              dist_retorno: list = None):
+    """
+    Busca exata em profundidade sobre as ordens de visita, descartando uma ordem parcial
+    assim que ela não pode mais levar a uma rota viável e melhor que a atual.
+
+    Uma ordem parcial é podada quando:
+        - chega a alguma parada depois do seu prazo (Entrega.prazo);
+        - passa do limite total de horas (Caminhao.horas_operacao_maximas_dia);
+        - já custa tanto quanto a melhor rota completa encontrada.
+    Como as distâncias vêm de caminhos mínimos (valem a desigualdade triangular), cada
+    parada restante s será alcançada no mínimo em tempo + dist[atual][s]; esse limite
+    inferior é testado contra os três critérios acima antes de descer na árvore. Com
+    `dist_retorno`, a rota termina de volta na origem e, pela mesma desigualdade, nenhuma
+    rota que chega à parada s em t termina antes de t + dist_retorno[s].
+
+    Args:
+        dist_origem (list[float]): dist_origem[j] = distância da origem até a parada j.
+        dist (list[list[float]]): dist[i][j] = distância da parada i até a parada j.
+        prazos (list[float]): prazo de chegada de cada parada (inf = sem prazo).
+        limite_total (float): tempo máximo da rota completa.
+        dist_retorno (list[float]): dist_retorno[j] = distância da parada j de volta à origem
+            (None = rota aberta, termina na última parada).
+
+    Returns:
+        tuple:
+            list[int]: índices das paradas na ordem de visita (None se não houver rota viável).
+            float: custo total da rota, com o retorno se pedido (inf se não houver rota viável).
+            dict: nós explorados/podados, podas por motivo e paradas cujo prazo causou poda.
+    """
+    n = len(dist_origem)
+    inf = float('inf')
+    if prazos is None:
+        prazos = [inf] * n
+    if dist_retorno is None:
+        dist_retorno = [0] * n
+
+    estatisticas = {
+        "nos_explorados": 0,
+        "nos_podados": 0,
+        "podas_prazo": 0,
+        "podas_horas": 0,
+        "podas_custo": 0,
+        "podas_inalcancavel": 0,
+        "paradas_prazo_violado": set(),
+    }
+    if n == 0:
+        return [], 0, estatisticas
+
+    melhor = {"ordem": None, "custo": inf}
+    ordem_parcial = []
+
+    def motivo_poda(parada, chegada):
+        """ Retorna a chave do motivo de poda para chegar em 'parada' no tempo 'chegada', ou None. """
+        if chegada == inf:
+            return "podas_inalcancavel"
+        if chegada > prazos[parada]:
+            estatisticas["paradas_prazo_violado"].add(parada)
+            return "podas_prazo"
+        termino_minimo = chegada + dist_retorno[parada]
+        if termino_minimo > limite_total:
+            return "podas_horas"
+        if termino_minimo >= melhor["custo"]:
+            return "podas_custo"
+        return None
+
+    def expandir(atual, tempo, restantes):
+        if not restantes:
+            total = tempo + dist_retorno[atual]
+            if total < melhor["custo"]:
+                melhor["custo"] = total
+                melhor["ordem"] = list(ordem_parcial)
+            return
+
+        linha = dist_origem if atual is None else dist[atual]
+        for proxima in sorted(restantes, key=lambda r: linha[r]): # Mais próxima primeiro: boa rota cedo
+            estatisticas["nos_explorados"] += 1
+            chegada = tempo + linha[proxima]
+            motivo = motivo_poda(proxima, chegada)
+
+            if motivo is None:
+                # Limite inferior para as paradas que sobram a partir de 'proxima'
+                linha_proxima = dist[proxima]
+                for restante in restantes:
+                    if restante != proxima:
+                        motivo = motivo_poda(restante, chegada + linha_proxima[restante])
+                        if motivo is not None:
+                            break
+
+            if motivo is not None:
+                estatisticas[motivo] += 1
+                estatisticas["nos_podados"] += 1
+                continue
+
+            ordem_parcial.append(proxima)
+            expandir(proxima, chegada, restantes - {proxima})
+            ordem_parcial.pop()
+
+    expandir(None, 0, frozenset(range(n)))
+    return melhor["ordem"], melhor["custo"], estatisticas
+
+
+def melhor_insercao(origem: str, paradas: list, prazos: list, nova_parada: str, prazo_nova: float,
+                    distancia, limite_total: float = float('inf'), retorno=None):
+    """
+    Inserção mais barata de uma nova parada numa rota já ordenada, sem reordenar as demais.
+
+    Testa a nova parada em cada posição da rota atual e fica com a de menor acréscimo de
+    tempo que respeita todos os prazos e o limite de horas. A verificação de cada posição
+    é O(1) graças às folgas da LinhaTempoRota; use diretamente a linha do tempo do
+    caminhão (LinhaTempoRota.melhor_insercao) para não remontá-la a cada chamada.
+
+    Args:
+        origem (str): cidade de partida da rota.
+        paradas (list[str]): cidades da rota atual, na ordem de visita.
+        prazos (list[float]): prazo de cada parada de `paradas` (inf = sem prazo).
+        nova_parada (str): cidade a ser inserida.
+        prazo_nova (float): prazo da nova parada.
+        distancia (callable): distancia(a, b) -> menor distância entre duas cidades.
+        limite_total (float): tempo máximo da rota completa.
+        retorno (callable): cidade -> tempo de volta à origem (None = rota aberta).
+
+    Returns:
+        tuple:
+            int: posição de inserção em `paradas` (None se nenhuma posição for viável).
+            float: tempo total da rota após a inserção (inf se inviável).
+            dict: posições testadas e quais restrições impediram as demais posições.
+    """
+    linha_tempo = LinhaTempoRota.a_partir_de_paradas(origem, paradas, prazos, distancia, retorno)
+    return linha_tempo.melhor_insercao(nova_parada, prazo_nova, distancia, limite_total, retorno)
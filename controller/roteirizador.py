@@ -1,11 +1,25 @@
 import os
+import queue
 import sys
-from itertools import permutations
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 # Adiciona o diretório raiz do projeto ao sys.path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 
 from model.entrega import Entrega
+from controller.oraculo_caminhos import OraculoCaminhos
+from controller.mapa_centros import MapaCentrosProximos
+from controller.resolvedor_rotas import resolver_held_karp, resolver_branch_and_bound
+from controller.economias_clarke_wright import construir_rotas_economias
+from controller.busca_local import BuscaLocalRotas, RotaBusca
+from controller.cache_rotas import CacheRotas
+from controller.tabela_retorno import TabelaRetornoCentros
+from model.linha_tempo_rota import LinhaTempoRota
+from model.indice_frota import IndiceFrota
+from model.frota_colunar import FrotaColunar
+from model.parada_consolidada import ParadaConsolidada
+from model.diagnostico_falha import MotivoFalha, DiagnosticoFalha, HistogramaFalhas
 # Importe suas outras classes de modelo se precisar de type hinting ou acesso direto
 # from model.centro_distribuicao import CentroDistribuicao
 # from model.caminhao import Caminhao
@@ -16,234 +30,937 @@ class Roteirizador:
     Orquestra a roteirização de entregas a partir de múltiplos centros de distribuição.
 
     A cada entrega, identifica o centro mais próximo, calcula a rota mais curta
-    (via Grafo.caminho_mais_curto) e tenta alocar a carga em um caminhão disponível,
-    respeitando as restrições de capacidade, tempo de operação e prazos de entrega.
+    (via OraculoCaminhos, que memoriza as árvores de Dijkstra do grafo) e tenta alocar
+    a carga em um caminhão disponível, respeitando as restrições de capacidade,
+    tempo de operação e prazos de entrega.
     """
 
-    def __init__(self, centros, entregas, grafo):
+    ALGORITMOS_ROTA = ('held_karp', 'branch_and_bound', 'insercao')
+    ESTRUTURAS_FROTA = {'colunar': FrotaColunar, 'indice': IndiceFrota}
+    LIMITE_PARADAS_EXATO = 10 # Com orçamento de tempo, rotas maiores que isso usam inserção
+    MIN_PARADAS_CACHE = 3 # Rotas menores são resolvidas mais rápido do que a consulta ao cache
+    MOTIVOS_LOTE = { # Motivos de construir_rotas_economias -> MotivoFalha
+        "inalcancavel": MotivoFalha.DESTINO_INALCANCAVEL,
+        "capacidade": MotivoFalha.CAPACIDADE,
+        "prazo": MotivoFalha.PRAZO_ENTREGA,
+        "horas": MotivoFalha.HORAS_CAMINHAO,
+    }
+
+    def __init__(self, centros, entregas, grafo, usar_oraculo=True, algoritmo_rota='held_karp', estrutura_frota='colunar',
+                 processos=1, tamanho_cache_rotas=4096, considerar_retorno=True):
         """
         Inicializa o roteirizador.
         Args:
             centros (List[CentroDistribuicao]): lista de centros de distribuição.
             entregas (List[Entrega]): lista de entregas a serem roteirizadas.
             grafo (Grafo): instância de Grafo para cálculo de rotas.
+            usar_oraculo (bool): se True (padrão), memoriza as árvores de caminhos mínimos
+                por origem; se False, cada consulta executa um novo Dijkstra no grafo.
+            algoritmo_rota (str): 'held_karp' (padrão) para a rota exata mais curta,
+                'branch_and_bound' para a busca que já poda por prazos e horas do caminhão, ou
+                'insercao' para inserir a nova parada na rota atual do caminhão sem reordená-la
+                (heurística de custo linear no tamanho da rota, sem garantia de ótimo).
+            estrutura_frota (str): como filtrar os caminhões viáveis antes da roteirização:
+                'colunar' (padrão, FrotaColunar: máscara NumPy sobre a frota inteira) ou
+                'indice' (IndiceFrota: listas ordenadas por capacidade disponível).
+            processos (int): com mais de 1, as rotas exatas (held_karp/branch_and_bound) dos
+                caminhões candidatos são calculadas em paralelo num pool com esse número de
+                processos; cada processo recebe uma cópia do grafo uma única vez por alocar_entregas.
+                Compensa com muitos caminhões candidatos e rotas longas; em instâncias pequenas o
+                custo de enviar tarefas supera o ganho. A inserção é barata demais e segue serial.
+            tamanho_cache_rotas (int): máximo de rotas exatas resolvidas guardadas no CacheRotas
+                (LRU por origem + paradas e prazos); 0 desliga o cache.
+            considerar_retorno (bool): se True (padrão), o tempo de cada rota inclui a volta da
+                última parada ao centro de origem (TabelaRetornoCentros), e é esse total que
+                precisa caber em horas_operacao_maximas_dia; se False, a rota termina na última entrega.
         """
         self.centros = centros
         self.entregas = entregas
         self.grafo = grafo
+        self.oraculo = OraculoCaminhos(grafo, memorizar=usar_oraculo)
+        self.mapa_centros = None # MapaCentrosProximos, construído sob demanda
+        self.considerar_retorno = considerar_retorno
+        self.tabela_retorno = None # TabelaRetornoCentros, construída sob demanda
+        self.algoritmo_rota = algoritmo_rota.lower()
+        if self.algoritmo_rota not in self.ALGORITMOS_ROTA:
+            raise ValueError(f"algoritmo_rota deve ser um de {self.ALGORITMOS_ROTA}")
+        self.estrutura_frota = estrutura_frota.lower()
+        if self.estrutura_frota not in self.ESTRUTURAS_FROTA:
+            raise ValueError(f"estrutura_frota deve ser uma de {tuple(self.ESTRUTURAS_FROTA)}")
+        self.processos = processos
+        self.usar_oraculo = usar_oraculo
+        self._executor = None # ProcessPoolExecutor ativo durante alocar_entregas (processos > 1)
+        self._orcamento = None # Prazos e tempos por fase durante alocar_entregas_com_orcamento
+        self.estatisticas_busca = {"nos_explorados": 0, "nos_podados": 0} # Acumulado do branch-and-bound
+        self.ultima_busca_rota = None # Estatísticas da última chamada ao branch-and-bound
+        self.motivos_ultima_rota = None # Restrições que impediram a última rota (branch-and-bound/inserção)
+        self.ultima_linha_tempo = None # LinhaTempoRota da última rota candidata calculada
+        self.frota = None # FrotaColunar/IndiceFrota, refeito a cada alocar_entregas
+        self.cache_rotas = CacheRotas(tamanho_cache_rotas) if tamanho_cache_rotas > 0 else None
+        self.histograma_falhas = HistogramaFalhas() # Motivos das entregas não alocadas na última alocação
 
-    def centro_mais_proximo(self, destino_entrega: str):
-        # ... (código existente do centro_mais_proximo - sem alterações aqui) ...
-        menor_dist = float('inf')
-        centro_selecionado = None
+    def obter_mapa_centros(self) -> MapaCentrosProximos:
+        """ Retorna o mapa cidade -> centro mais próximo, construindo-o (um único Dijkstra multi-origem) se necessário. """
+        if self.mapa_centros is None:
+            self.mapa_centros = MapaCentrosProximos(self.grafo, self.centros).construir()
+        return self.mapa_centros
 
-        if not self.centros:
-            return None, menor_dist
+    def obter_tabela_retorno(self) -> TabelaRetornoCentros:
+        """ Retorna a tabela cidade -> distância de volta a cada centro, construindo-a com as árvores dos centros no oráculo se necessário. """
+        if self.tabela_retorno is None:
+            self.tabela_retorno = TabelaRetornoCentros(self.oraculo, self.centros).construir()
+        return self.tabela_retorno
 
-        for cd_origem in self.centros:
-            _, dist_calculada = self.grafo.caminho_mais_curto(cd_origem.cidade, destino_entrega)
-            if dist_calculada < menor_dist:
-                menor_dist = dist_calculada
-                centro_selecionado = cd_origem
-        
-        if centro_selecionado is None:
+    def _funcao_retorno(self, origem_rota: str):
+        """ cidade -> tempo de volta a `origem_rota` (consulta à tabela), ou None se o retorno não é considerado. """
+        if not self.considerar_retorno:
+            return None
+        ate_origem = self.obter_tabela_retorno().distancias_ate(origem_rota)
+        return lambda cidade: ate_origem.get(cidade, float('inf'))
+
+    def centro_mais_proximo(self, destino_entrega: str):
+        """
+        Retorna (CentroDistribuicao, distancia) do centro mais próximo do destino,
+        ou (None, inf) se nenhum centro o alcança. Consulta O(1) no MapaCentrosProximos.
+        """
+        if not self.centros:
             return None, float('inf')
-        return centro_selecionado, menor_dist
+        return self.obter_mapa_centros().mais_proximo(destino_entrega)
+
+    def _calcular_melhor_rota_para_destinos(self, origem_rota: str, destinos_visitar: list, entrega_atual_para_prazo: 'Entrega' = None,
+                                            entregas_na_rota: list = None, limite_horas: float = float('inf')):
+        """
+        Calcula a melhor ordem de visita dos destinos com o Held–Karp (resolver_held_karp)
+        sobre a matriz de distâncias entre as paradas, em vez de enumerar permutações.
+        Com considerar_retorno, o custo inclui a volta ao centro, lida da TabelaRetornoCentros.
+
+        Prefere a rota mais curta que cumpre o prazo da entrega atual; se nenhuma cumprir,
+        devolve a mais curta de todas (a decisão de usá-la fica com o chamador).
+
+        Com algoritmo_rota='branch_and_bound', usa também os prazos de `entregas_na_rota` (Entrega ou ParadaConsolidada) e o
+        `limite_horas` do caminhão para podar a busca e só devolve rotas que cumprem tudo;
+        as estatísticas da busca ficam em self.ultima_busca_rota (None se a rota veio do cache).
 
-    def _calcular_melhor_rota_para_destinos(self, origem_rota: str, destinos_visitar: list, entrega_atual_para_prazo: 'Entrega' = None):
-        # ... (código existente do _calcular_melhor_rota_para_destinos - sem alterações aqui) ...
+        As ordens de visita já resolvidas para a mesma origem, paradas e prazos vêm de
+        self.cache_rotas (ver _resolver_memorizado). As distâncias vêm de uma MatrizParadas
+        (OraculoCaminhos.matriz_paradas): no máximo uma busca no grafo por parada, feita só
+        quando consultada, e a rota cidade a cidade é expandida apenas para a ordem escolhida.
+
+        Returns:
+            tuple:
+                list: Rota expandida cidade a cidade (None se algum destino for inalcançável).
+                float: Tempo total da rota (com o retorno, se considerado).
+                bool: Se o prazo da entrega atual é atendido.
+        """
         if not destinos_visitar:
+            self.ultima_linha_tempo = LinhaTempoRota(origem_rota)
             return [origem_rota], 0, True
 
-        melhor_rota_final = None
-        menor_tempo_final = float('inf')
-        prazo_atendido_pela_melhor_rota = False # Renomeado para clareza
+        paradas = list(dict.fromkeys(destinos_visitar)) # Destinos repetidos viram uma única parada
+        entregas_com_prazo = list(entregas_na_rota or []) + ([entrega_atual_para_prazo] if entrega_atual_para_prazo else [])
+        prazos_paradas = self._prazos_por_parada(paradas, entregas_com_prazo)
+        self.ultima_linha_tempo = None
+        matriz = self.oraculo.matriz_paradas(origem_rota, paradas) # Linhas buscadas sob demanda
+        retorno = self._funcao_retorno(origem_rota)
+        dist_retorno = [retorno(parada) for parada in paradas] if retorno else None
 
-        for ordem_visita in permutations(destinos_visitar):
-            rota_candidata_atual = [origem_rota]
-            tempo_total_candidato = 0
-            cidade_atual_na_rota = origem_rota
-            rota_valida_nesta_permutacao = True
-            prazo_entrega_atual_ok_nesta_permutacao = True
+        if self.algoritmo_rota == 'branch_and_bound':
+            return self._calcular_rota_branch_and_bound(matriz, prazos_paradas, entrega_atual_para_prazo, limite_horas,
+                                                        retorno, dist_retorno)
 
-            for proximo_destino_na_ordem in ordem_visita:
-                segmento_rota, tempo_segmento = self.grafo.caminho_mais_curto(cidade_atual_na_rota, proximo_destino_na_ordem)
+        sem_prazos = [float('inf')] * len(paradas)
+        ordem, tempo_total, _ = self._resolver_memorizado(
+            origem_rota, paradas, sem_prazos, None,
+            lambda: (*resolver_held_karp(*matriz.distancias(), None, dist_retorno), None)
+        )
+        if ordem is None:
+            return None, float('inf'), False
+        linha_tempo = self._linha_tempo_da_ordem(matriz, prazos_paradas, ordem, retorno)
 
-                if not segmento_rota or tempo_segmento == float('inf'): # Adicionado verificação de tempo_segmento
-                    rota_valida_nesta_permutacao = False
-                    break
+        prazo_atendido = True
+        if entrega_atual_para_prazo and entrega_atual_para_prazo.destino in paradas:
+            idx_alvo = paradas.index(entrega_atual_para_prazo.destino)
+            if linha_tempo.chegadas[ordem.index(idx_alvo)] > entrega_atual_para_prazo.prazo:
+                # A mais curta estoura o prazo: resolve de novo descartando estados que chegam tarde ao alvo
+                prazos = list(sem_prazos)
+                prazos[idx_alvo] = entrega_atual_para_prazo.prazo
+                ordem_no_prazo, tempo_no_prazo, _ = self._resolver_memorizado(
+                    origem_rota, paradas, prazos, None,
+                    lambda: (*resolver_held_karp(*matriz.distancias(), prazos, dist_retorno), None)
+                )
+                if ordem_no_prazo is not None:
+                    ordem, tempo_total = ordem_no_prazo, tempo_no_prazo
+                    linha_tempo = self._linha_tempo_da_ordem(matriz, prazos_paradas, ordem, retorno)
+                else:
+                    prazo_atendido = False
 
-                rota_candidata_atual.extend(segmento_rota[1:])
-                tempo_total_candidato += tempo_segmento
-                cidade_atual_na_rota = proximo_destino_na_ordem
+        rota = matriz.expandir(linha_tempo.paradas)
+        if rota is None:
+            return None, float('inf'), False
+        self.ultima_linha_tempo = linha_tempo
+        return rota, tempo_total, prazo_atendido
 
-                if entrega_atual_para_prazo and proximo_destino_na_ordem == entrega_atual_para_prazo.destino:
-                    if tempo_total_candidato > entrega_atual_para_prazo.prazo:
-                        prazo_entrega_atual_ok_nesta_permutacao = False
-            
-            if rota_valida_nesta_permutacao:
-                if tempo_total_candidato < menor_tempo_final:
-                    # Se é mais curta E atende ao prazo da entrega atual
-                    if prazo_entrega_atual_ok_nesta_permutacao:
-                        menor_tempo_final = tempo_total_candidato
-                        melhor_rota_final = rota_candidata_atual
-                        prazo_atendido_pela_melhor_rota = True
-                    # Se é mais curta, mas NÃO atende ao prazo, e ainda não temos uma que atenda
-                    elif not prazo_atendido_pela_melhor_rota:
-                        # Ainda atualizamos para ter a rota mais curta possível, mesmo que fora do prazo
-                        # A decisão de usar essa rota será do chamador
-                        menor_tempo_final = tempo_total_candidato
-                        melhor_rota_final = rota_candidata_atual
-                        # prazo_atendido_pela_melhor_rota continua False
-                # Caso especial: tempo igual, mas esta atende ao prazo e a anterior não
-                elif tempo_total_candidato == menor_tempo_final and prazo_entrega_atual_ok_nesta_permutacao and not prazo_atendido_pela_melhor_rota:
-                    melhor_rota_final = rota_candidata_atual
-                    prazo_atendido_pela_melhor_rota = True
-
-
-        if melhor_rota_final is None:
-             return None, float('inf'), False
-        
-        return melhor_rota_final, menor_tempo_final, prazo_atendido_pela_melhor_rota
+    def _resolver_memorizado(self, origem_rota: str, paradas: list, prazos: list, limite_horas, resolver):
+        """
+        Consulta self.cache_rotas antes de resolver um problema de ordem de visita.
+
+        A chave é a origem, o conjunto de (parada, prazo) e o limite de horas; a ordem fica
+        guardada como sequência de cidades, então vale para qualquer ordem das paradas na
+        chamada. Problemas com menos de MIN_PARADAS_CACHE paradas vão direto ao resolvedor.
 
+        Args:
+            resolver (callable): () -> (ordem em índices de `paradas` ou None, tempo, extra).
+
+        Returns:
+            tuple: (ordem, tempo, extra), do cache ou de resolver().
+        """
+        if self.cache_rotas is None or len(paradas) < self.MIN_PARADAS_CACHE:
+            return resolver()
+
+        chave = CacheRotas.chave(origem_rota, paradas, prazos, limite_horas)
+        memorizada = self.cache_rotas.obter(chave)
+        if memorizada is not None:
+            sequencia, tempo_total, extra = memorizada
+            if sequencia is None:
+                return None, tempo_total, extra
+            posicao = {parada: i for i, parada in enumerate(paradas)}
+            return [posicao[cidade] for cidade in sequencia], tempo_total, extra
+
+        ordem, tempo_total, extra = resolver()
+        sequencia = None if ordem is None else tuple(paradas[i] for i in ordem)
+        self.cache_rotas.guardar(chave, (sequencia, tempo_total, extra))
+        return ordem, tempo_total, extra
+
+    def _calcular_rota_branch_and_bound(self, matriz, prazos_paradas, entrega_atual, limite_horas,
+                                        retorno=None, dist_retorno=None):
+        """ Variante de _calcular_melhor_rota_para_destinos que delega a resolver_branch_and_bound. """
+        self.ultima_busca_rota = None # Continua None se a resposta vier do cache
+        origem_rota, paradas = matriz.origem, matriz.paradas
+
+        def resolver():
+            ordem, tempo_total, estatisticas = resolver_branch_and_bound(
+                *matriz.distancias(), prazos_paradas, limite_horas, dist_retorno
+            )
+            self.ultima_busca_rota = estatisticas
+            self.estatisticas_busca["nos_explorados"] += estatisticas["nos_explorados"]
+            self.estatisticas_busca["nos_podados"] += estatisticas["nos_podados"]
+            violadas = frozenset(paradas[i] for i in estatisticas["paradas_prazo_violado"])
+            return ordem, tempo_total, (violadas, estatisticas["podas_horas"] > 0)
+
+        ordem, tempo_total, (violadas, horas_excedidas) = self._resolver_memorizado(
+            origem_rota, paradas, prazos_paradas, limite_horas, resolver
+        )
+        destino_atual = entrega_atual.destino if entrega_atual else None
+        self.motivos_ultima_rota = {
+            "prazo_nova_violado": destino_atual in violadas,
+            "prazo_outras_violado": bool(violadas - {destino_atual}),
+            "horas_excedidas": horas_excedidas,
+        }
+        if ordem is None:
+            return None, float('inf'), False
+
+        rota = matriz.expandir([paradas[i] for i in ordem])
+        if rota is None:
+            return None, float('inf'), False
+        self.ultima_linha_tempo = self._linha_tempo_da_ordem(matriz, prazos_paradas, ordem, retorno)
+        return rota, tempo_total, True
+
+    def _calcular_rota_por_insercao(self, caminhao, entrega_obj: 'Entrega'):
+        """
+        Insere o destino da entrega na posição mais barata da rota atual do caminhão,
+        mantendo a ordem das paradas já planejadas. Usa a LinhaTempoRota do caminhão, então
+        cada posição é verificada em O(1) e só dois trechos novos são consultados no oráculo.
+
+        Returns:
+            tuple: mesmo formato de _calcular_melhor_rota_para_destinos; só devolve rotas que
+            cumprem todos os prazos e as horas do caminhão (motivos em self.motivos_ultima_rota).
+        """
+        origem_rota = caminhao.centro_origem.cidade
+        retorno = self._funcao_retorno(origem_rota)
+        linha_tempo = caminhao.linha_tempo
+        if linha_tempo is None: # Rota definida fora do roteirizador: monta a linha do tempo uma vez
+            paradas = caminhao.paradas_na_ordem()
+            linha_tempo = LinhaTempoRota.a_partir_de_paradas(
+                origem_rota, paradas, self._prazos_por_parada(paradas, caminhao.entregas), self.oraculo.distancia, retorno
+            )
+            caminhao.linha_tempo = linha_tempo
+
+        self.ultima_linha_tempo = None
+        posicao, _, motivos = linha_tempo.melhor_insercao(
+            entrega_obj.destino, entrega_obj.prazo, self.oraculo.distancia, caminhao.horas_operacao_maximas_dia, retorno
+        )
+        self.motivos_ultima_rota = motivos
+        if posicao is None:
+            return None, float('inf'), False
+
+        nova_linha_tempo = linha_tempo.com_insercao(
+            posicao, entrega_obj.destino, entrega_obj.prazo, self.oraculo.distancia, retorno
+        )
+        rota = self._expandir_rota(origem_rota, nova_linha_tempo.paradas)
+        if rota is None:
+            return None, float('inf'), False
+        self.ultima_linha_tempo = nova_linha_tempo
+        return rota, nova_linha_tempo.tempo_total, True
+
+    @staticmethod
+    def _prazos_por_parada(paradas: list, entregas: list) -> list:
+        """ Prazo mais apertado entre as entregas de cada parada (inf se nenhuma entrega tiver a cidade como destino). """
+        idx_parada = {parada: i for i, parada in enumerate(paradas)}
+        prazos = [float('inf')] * len(paradas)
+        for entrega in entregas:
+            i = idx_parada.get(entrega.destino)
+            if i is not None:
+                prazos[i] = min(prazos[i], entrega.prazo)
+        return prazos
+
+    @staticmethod
+    def _linha_tempo_da_ordem(matriz, prazos_paradas, ordem, retorno=None) -> LinhaTempoRota:
+        """ Monta a LinhaTempoRota de uma ordem de visita já resolvida (só os trechos consecutivos são consultados). """
+        return LinhaTempoRota.a_partir_de_paradas(
+            matriz.origem, [matriz.paradas[i] for i in ordem], [prazos_paradas[i] for i in ordem], matriz.distancia, retorno
+        )
+
+    def _expandir_rota(self, origem_rota: str, sequencia_paradas: list):
+        """ Concatena os caminhos mínimos entre paradas consecutivas; None se algum trecho for inalcançável. """
+        rota = [origem_rota]
+        cidade_atual = origem_rota
+        for proxima_parada in sequencia_paradas:
+            segmento_rota, _ = self.oraculo.caminho_mais_curto(cidade_atual, proxima_parada)
+            if not segmento_rota:
+                return None
+            rota.extend(segmento_rota[1:])
+            cidade_atual = proxima_parada
+        return rota
+
+
+    def _avaliar_caminhao(self, caminhao, entrega_obj: 'Entrega'):
+        """
+        Calcula a rota do caminhão com a nova entrega, no algoritmo configurado.
+
+        Returns:
+            tuple: rota, tempo total, se o prazo da entrega é atendido, LinhaTempoRota da rota
+            (ou None) e as restrições que impediram a rota (branch-and-bound/inserção).
+        """
+        usar_insercao = self.algoritmo_rota == 'insercao'
+        if not usar_insercao:
+            # Entregas para a mesma cidade viram uma parada só (peso somado, prazo mais apertado)
+            paradas_caminhao = ParadaConsolidada.agrupar(caminhao.entregas)
+            destinos = self._destinos_com_nova_entrega(paradas_caminhao, entrega_obj)
+        if self._orcamento is not None and not usar_insercao:
+            # Com orçamento de tempo: exato só para rotas pequenas e enquanto durar a fase exata
+            usar_insercao = (time.perf_counter() >= self._orcamento["fim_fase_exata"]
+                             or len(destinos) > self.LIMITE_PARADAS_EXATO)
+        inicio = time.perf_counter()
+
+        if usar_insercao:
+            rota, tempo, prazo_atendido = self._calcular_rota_por_insercao(caminhao, entrega_obj)
+        else:
+            rota, tempo, prazo_atendido = self._calcular_melhor_rota_para_destinos(
+                caminhao.centro_origem.cidade,
+                destinos,
+                entrega_obj,
+                entregas_na_rota=paradas_caminhao,
+                limite_horas=caminhao.horas_operacao_maximas_dia
+            )
+        motivos = self.motivos_ultima_rota if usar_insercao or self.algoritmo_rota == 'branch_and_bound' else None
+
+        if self._orcamento is not None:
+            fase = "insercao" if usar_insercao else "exata"
+            self._orcamento["segundos_por_fase"][fase] += time.perf_counter() - inicio
+            self._orcamento["avaliacoes_por_fase"][fase] += 1
+        return rota, tempo, prazo_atendido, self.ultima_linha_tempo, motivos
+
+    @staticmethod
+    def _destinos_com_nova_entrega(paradas_caminhao: list, entrega_obj: 'Entrega') -> list:
+        """ Cidades distintas a visitar: as paradas atuais do caminhão e o destino da nova entrega. """
+        destinos = [parada.destino for parada in paradas_caminhao]
+        if entrega_obj.destino not in destinos:
+            destinos.append(entrega_obj.destino)
+        return destinos
+
+    def _avaliar_candidatos(self, caminhoes: list, entrega_obj: 'Entrega'):
+        """
+        Gera a avaliação (_avaliar_caminhao) de cada caminhão, na ordem da lista. No modo
+        paralelo as rotas são distribuídas entre os processos e recolhidas em ordem.
+        """
+        if self._executor is None or self.algoritmo_rota == 'insercao' or len(caminhoes) < 2:
+            for caminhao in caminhoes:
+                if self._orcamento_esgotado():
+                    return # Fica a melhor opção entre os caminhões já avaliados
+                yield self._avaliar_caminhao(caminhao, entrega_obj)
+            return
+
+        tarefas = []
+        for c in caminhoes:
+            paradas_caminhao = ParadaConsolidada.agrupar(c.entregas)
+            tarefas.append((c.centro_origem.cidade, self._destinos_com_nova_entrega(paradas_caminhao, entrega_obj),
+                            entrega_obj, paradas_caminhao, c.horas_operacao_maximas_dia))
+        lote = max(1, len(tarefas) // (self.processos * 4))
+        for rota, tempo, prazo_atendido, linha_tempo, motivos, busca in \
+                self._executor.map(_avaliar_no_trabalhador, tarefas, chunksize=lote):
+            if busca is not None:
+                self.ultima_busca_rota = busca
+                self.estatisticas_busca["nos_explorados"] += busca["nos_explorados"]
+                self.estatisticas_busca["nos_podados"] += busca["nos_podados"]
+            yield rota, tempo, prazo_atendido, linha_tempo, motivos
+
+    def alocar_entregas_com_orcamento(self, tempo_limite: float, fracao_exata: float = 0.5):
+        """
+        Alocação com limite de tempo, que degrada em vez de estourar o prazo:
+            1. fase exata: até fracao_exata * tempo_limite, rotas com até LIMITE_PARADAS_EXATO
+               paradas usam o algoritmo configurado (held_karp/branch_and_bound); as maiores
+               já usam inserção;
+            2. fase de inserção: depois disso, toda rota é calculada por inserção;
+            3. tempo esgotado: a entrega em avaliação fica com o melhor caminhão visto até ali
+               e as seguintes são reportadas como erro, sem avaliação.
+        O relatório é sempre completo (uma entrada por entrega) e só contém alocações viáveis.
+
+        Args:
+            tempo_limite (float): orçamento total em segundos.
+            fracao_exata (float): fração do orçamento reservada à fase exata.
+
+        Returns:
+            tuple:
+                list: relatório no mesmo formato de alocar_entregas.
+                dict: segundos e avaliações por fase, entregas não avaliadas e tempo total.
+        """
+        inicio = time.perf_counter()
+        self._orcamento = {
+            "fim": inicio + tempo_limite,
+            "fim_fase_exata": inicio + tempo_limite * fracao_exata,
+            "segundos_por_fase": {"exata": 0.0, "insercao": 0.0},
+            "avaliacoes_por_fase": {"exata": 0, "insercao": 0},
+            "entregas_sem_tempo": 0,
+        }
+        try:
+            relatorio_final = self._alocar_entregas()
+        finally:
+            orcamento, self._orcamento = self._orcamento, None
+
+        return relatorio_final, {
+            "segundos_total": time.perf_counter() - inicio,
+            "segundos_por_fase": orcamento["segundos_por_fase"],
+            "avaliacoes_por_fase": orcamento["avaliacoes_por_fase"],
+            "entregas_sem_tempo": orcamento["entregas_sem_tempo"],
+            "tempo_esgotado": orcamento["entregas_sem_tempo"] > 0 or time.perf_counter() >= orcamento["fim"],
+        }
+
+    def _orcamento_esgotado(self) -> bool:
+        """ True se há orçamento de tempo ativo e ele já acabou. """
+        return self._orcamento is not None and time.perf_counter() >= self._orcamento["fim"]
 
     def alocar_entregas(self):
-        relatorio_final = []
+        """
+        Aloca as entregas na frota; com processos > 1, mantém o pool de processos aberto durante a passada.
 
-        for entrega_obj in self.entregas:
-            cd_origem_da_entrega, _ = self.centro_mais_proximo(entrega_obj.destino)
+        Entregas não alocadas trazem em "erro" um DiagnosticoFalha (o texto sai de mensagens());
+        os motivos de todas elas ficam somados em self.histograma_falhas.
+        """
+        if self.processos is None or self.processos <= 1:
+            return self._alocar_entregas()
 
-            if cd_origem_da_entrega is None:
-                relatorio_final.append({
-                    "entrega": entrega_obj,
-                    # MODIFICAÇÃO: Erro agora é uma lista de strings
-                    "erro": [f"Destino '{entrega_obj.destino}' inalcançável por qualquer Centro de Distribuição."]
-                })
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.processos,
+            initializer=_inicializar_trabalhador,
+            initargs=(self.grafo, self.usar_oraculo, self.algoritmo_rota, self.estrutura_frota, self.considerar_retorno)
+        )
+        try:
+            return self._alocar_entregas()
+        finally:
+            self._executor.shutdown()
+            self._executor = None
+
+    def alocar_entregas_por_centro(self, processos: int = None):
+        """
+        Alocação particionada por centro de distribuição.
+
+        Cada entrega é atribuída ao seu centro mais próximo e cada partição (entregas de um
+        centro + somente a frota desse centro) é alocada de forma independente, em processos
+        separados. Assim o trabalho cresce com o número de centros, e uma região lenta não
+        segura as demais. Diferente de alocar_entregas, uma entrega não pode ir para o
+        caminhão de outro centro.
+
+        Args:
+            processos (int): número máximo de processos (None = um por partição, limitado ao
+                número de CPUs; 1 = partições executadas em sequência no próprio processo).
+
+        Returns:
+            list: relatório no mesmo formato de alocar_entregas, na ordem de self.entregas.
+        """
+        self.oraculo.invalidar()
+        self.mapa_centros = None
+        self.tabela_retorno = None
+        self.histograma_falhas.limpar()
+        relatorio_final = [None] * len(self.entregas)
+        indice_centro = {centro: i for i, centro in enumerate(self.centros)}
+        particoes = {} # {índice do centro: [índices das entregas]}
+
+        for i, entrega_obj in enumerate(self.entregas):
+            centro, _ = self.centro_mais_proximo(entrega_obj.destino)
+            if centro is None:
+                relatorio_final[i] = self._registro_falha(
+                    DiagnosticoFalha.simples(entrega_obj, MotivoFalha.DESTINO_INALCANCAVEL)
+                )
                 continue
-            
-            entrega_obj.origem = cd_origem_da_entrega.cidade
+            entrega_obj.origem = centro.cidade
+            particoes.setdefault(indice_centro[centro], []).append(i)
 
-            melhor_opcao_para_entrega = {
-                "caminhao": None, "centro_alocado": None, "rota": None,
-                "tempo_total_rota": float('inf'), "alocada": False
-            }
-            
-            falhas_agregadas = {
-                "capacidade_peso": 0,
-                "rota_invalida_ou_inalcancavel": 0,
-                "prazo_entrega_excedido": 0,
-                "horas_caminhao_excedidas": 0,
-                "prazo_outras_entregas_violado": 0,
-                "total_caminhoes_verificados_para_entrega": 0,
-                "caminhoes_sem_cd_origem_definido": 0
+        if processos is None:
+            processos = min(len(particoes), os.cpu_count() or 1)
+
+        if processos <= 1:
+            for idx_centro, indices in particoes.items():
+                parcial = Roteirizador(
+                    [self.centros[idx_centro]], [self.entregas[i] for i in indices], self.grafo,
+                    usar_oraculo=self.usar_oraculo, algoritmo_rota=self.algoritmo_rota, estrutura_frota=self.estrutura_frota,
+                    considerar_retorno=self.considerar_retorno
+                )
+                for i, item in zip(indices, parcial.alocar_entregas()):
+                    relatorio_final[i] = self._registro_falha(item["erro"]) if "erro" in item else item
+            return relatorio_final
+
+        with ProcessPoolExecutor(
+            max_workers=processos,
+            initializer=_inicializar_trabalhador,
+            initargs=(self.grafo, self.usar_oraculo, self.algoritmo_rota, self.estrutura_frota, self.considerar_retorno)
+        ) as executor:
+            futuros = {
+                idx_centro: executor.submit(_alocar_particao_no_trabalhador, self.centros[idx_centro],
+                                            [self.entregas[i] for i in indices])
+                for idx_centro, indices in particoes.items()
             }
-            caminhoes_considerados_validos_inicialmente = 0
-
-            for cd_caminhao_iter in self.centros:
-                for caminhao_candidato in cd_caminhao_iter.caminhoes:
-                    falhas_agregadas["total_caminhoes_verificados_para_entrega"] += 1
-                    
-                    if not hasattr(caminhao_candidato, 'centro_origem') or not hasattr(caminhao_candidato.centro_origem, 'cidade'):
-                        falhas_agregadas["caminhoes_sem_cd_origem_definido"] +=1
-                        continue 
-                    
-                    origem_da_rota_do_caminhao_str = caminhao_candidato.centro_origem.cidade
-                    
-                    peso_total_com_nova_entrega = sum(e.peso for e in caminhao_candidato.entregas) + entrega_obj.peso
-                    if peso_total_com_nova_entrega > caminhao_candidato.capacidade_kg_total:
-                        falhas_agregadas["capacidade_peso"] += 1
-                        continue 
-
-                    caminhoes_considerados_validos_inicialmente += 1
-                    destinos_para_o_caminhao = [e.destino for e in caminhao_candidato.entregas] + [entrega_obj.destino]
-                    
-                    nova_rota_calculada, tempo_total_calculado, prazo_entrega_atual_atendido = \
-                        self._calcular_melhor_rota_para_destinos(
-                            origem_da_rota_do_caminhao_str,
-                            destinos_para_o_caminhao,
-                            entrega_obj
-                        )
-
-                    if not nova_rota_calculada:
-                        falhas_agregadas["rota_invalida_ou_inalcancavel"] += 1
-                        continue 
-
-                    if not prazo_entrega_atual_atendido:
-                        falhas_agregadas["prazo_entrega_excedido"] += 1
-                    if tempo_total_calculado > caminhao_candidato.horas_operacao_maximas_dia:
-                        falhas_agregadas["horas_caminhao_excedidas"] += 1
-                    
-                    entregas_ja_no_caminhao = caminhao_candidato.entregas 
-                    todas_entregas_para_verificacao_prazo = list(entregas_ja_no_caminhao) + [entrega_obj]
-                    prazos_todos_ok = self.verificar_prazos_para_rota(
-                        nova_rota_calculada, 
-                        tempo_total_calculado,
-                        todas_entregas_para_verificacao_prazo, 
-                        origem_da_rota_do_caminhao_str
-                    )
-                    if not prazos_todos_ok:
-                        falhas_agregadas["prazo_outras_entregas_violado"] += 1
-
-                    if prazo_entrega_atual_atendido and \
-                       tempo_total_calculado <= caminhao_candidato.horas_operacao_maximas_dia and \
-                       prazos_todos_ok:
-                        if tempo_total_calculado < melhor_opcao_para_entrega["tempo_total_rota"]:
-                            melhor_opcao_para_entrega.update({
-                                "caminhao": caminhao_candidato,
-                                "centro_alocado": caminhao_candidato.centro_origem,
-                                "rota": nova_rota_calculada,
-                                "tempo_total_rota": tempo_total_calculado,
-                                "alocada": True
-                            })
-            
-            if melhor_opcao_para_entrega["alocada"]:
-                caminhao_escolhido = melhor_opcao_para_entrega["caminhao"]
-                caminhao_escolhido.adicionar_entrega_a_lista(entrega_obj)
-                caminhao_escolhido.atualizar_rota_e_tempo(
-                    melhor_opcao_para_entrega["rota"],
-                    melhor_opcao_para_entrega["tempo_total_rota"]
+            for idx_centro, futuro in futuros.items():
+                centro = self.centros[idx_centro]
+                indices = particoes[idx_centro]
+                itens, estado_final = futuro.result()
+                # O processo trabalhou em cópias: reaplica as alocações nos objetos originais, na mesma ordem
+                for i, (idx_caminhao, rota, tempo, diagnostico) in zip(indices, itens):
+                    entrega_obj = self.entregas[i]
+                    if idx_caminhao is None:
+                        diagnostico.entrega = entrega_obj
+                        relatorio_final[i] = self._registro_falha(diagnostico)
+                        continue
+                    caminhao = centro.caminhoes[idx_caminhao]
+                    caminhao.adicionar_entrega_a_lista(entrega_obj)
+                    relatorio_final[i] = {
+                        "entrega": entrega_obj, "caminhao": caminhao, "centro": centro, "rota": rota, "tempo": tempo
+                    }
+                for idx_caminhao, (rota, tempo, linha_tempo) in estado_final.items():
+                    centro.caminhoes[idx_caminhao].atualizar_rota_e_tempo(rota, tempo, linha_tempo)
+        return relatorio_final
+
+    def alocar_entregas_em_lote(self):
+        """
+        Alocação em lote: em vez de decidir entrega por entrega na ordem da lista, monta de
+        uma vez as rotas de cada centro pelo método das economias (construir_rotas_economias)
+        e depois distribui as rotas pelos caminhões livres do centro.
+
+        As entregas são tentadas primeiro no centro mais próximo; as que sobram passam ao
+        segundo centro mais próximo, e assim por diante. Só caminhões ainda sem entregas
+        são usados.
+
+        Returns:
+            list: relatório no mesmo formato de alocar_entregas, na ordem de self.entregas.
+                "rota" e "tempo" são os da rota final do caminhão.
+        """
+        self.oraculo.invalidar()
+        self.mapa_centros = None
+        self.tabela_retorno = None
+        self.histograma_falhas.limpar()
+        relatorio_final = [None] * len(self.entregas)
+        motivos = {} # {índice da entrega: (centro, MotivoFalha) da última recusa}
+        pendentes = []
+
+        for i, entrega_obj in enumerate(self.entregas):
+            centro, _ = self.centro_mais_proximo(entrega_obj.destino)
+            if centro is None:
+                relatorio_final[i] = self._registro_falha(
+                    DiagnosticoFalha.simples(entrega_obj, MotivoFalha.DESTINO_INALCANCAVEL)
+                )
+                continue
+            entrega_obj.origem = centro.cidade
+            pendentes.append(i)
+
+        mapa = self.obter_mapa_centros()
+        for posicao in range(len(self.centros)):
+            indices_por_centro = {}
+            for i in pendentes:
+                ranking = mapa.ranking(self.entregas[i].destino)
+                if posicao < len(ranking):
+                    indices_por_centro.setdefault(ranking[posicao][0], []).append(i)
+            for centro, indices in indices_por_centro.items():
+                self._alocar_lote_no_centro(centro, indices, relatorio_final, motivos)
+            pendentes = [i for i in pendentes if relatorio_final[i] is None]
+            if not pendentes:
+                break
+
+        for i in pendentes:
+            centro, motivo = motivos.get(i, (None, MotivoFalha.SEM_CAMINHAO_LIVRE))
+            relatorio_final[i] = self._registro_falha(DiagnosticoFalha.simples(
+                self.entregas[i], motivo, centro.cidade if centro else None
+            ))
+        return relatorio_final
+
+    def _alocar_lote_no_centro(self, centro, indices: list, relatorio_final: list, motivos: dict):
+        """
+        Monta as rotas das entregas `indices` a partir do centro e as atribui aos caminhões livres.
+
+        As rotas são construídas com os limites do maior caminhão livre (capacidade e horas
+        de um mesmo caminhão, então toda rota cabe nele) e atribuídas da mais pesada para a
+        mais leve ao menor caminhão livre que as comporta. O que sobra é reconstruído com o
+        próximo maior caminhão, até não haver caminhão livre ou entrega pendente.
+        Preenche relatorio_final[i] das entregas alocadas e motivos[i] = (centro, MotivoFalha) das recusadas.
+        """
+        livres = [c for c in centro.caminhoes if not c.entregas]
+        pendentes = list(indices)
+        retorno = self._funcao_retorno(centro.cidade)
+        for referencia in sorted(livres, key=lambda c: -c.capacidade_kg_total):
+            if not pendentes:
+                break
+            if referencia not in livres:
+                continue
+
+            indice_da_entrega = {self.entregas[i]: i for i in pendentes}
+            paradas_lote, inviaveis_sozinhas = self._paradas_do_lote(
+                centro.cidade, [self.entregas[i] for i in pendentes], referencia, retorno
+            )
+            for entrega_obj, motivo in inviaveis_sozinhas.items():
+                motivos[indice_da_entrega[entrega_obj]] = (centro, self.MOTIVOS_LOTE[motivo])
+            rotas, inviaveis = construir_rotas_economias(
+                centro.cidade,
+                [p.destino for p in paradas_lote],
+                [p.peso for p in paradas_lote],
+                [p.prazo for p in paradas_lote],
+                self.oraculo.distancia,
+                referencia.capacidade_kg_total,
+                referencia.horas_operacao_maximas_dia,
+                retorno
+            )
+            for j, motivo in inviaveis.items():
+                for entrega_obj in paradas_lote[j].entregas:
+                    motivos[indice_da_entrega[entrega_obj]] = (centro, self.MOTIVOS_LOTE[motivo])
+
+            rotas.sort(key=lambda rota: -sum(paradas_lote[j].peso for j in rota)) # Mais pesadas escolhem primeiro
+            for rota in rotas:
+                entregas_rota = [e for j in rota for e in paradas_lote[j].entregas] # De volta às entregas
+                peso_rota = sum(e.peso for e in entregas_rota)
+                paradas = list(dict.fromkeys(e.destino for e in entregas_rota)) # Cidade repetida: entrega na primeira passagem
+                linha_tempo = LinhaTempoRota.a_partir_de_paradas(
+                    centro.cidade, paradas, self._prazos_por_parada(paradas, entregas_rota), self.oraculo.distancia, retorno
+                )
+                caminhao = min(
+                    (c for c in livres
+                     if c.capacidade_kg_total >= peso_rota and c.horas_operacao_maximas_dia >= linha_tempo.tempo_total),
+                    key=lambda c: c.capacidade_kg_total, default=None
                 )
-                relatorio_final.append({
-                    "entrega": entrega_obj,
-                    "caminhao": caminhao_escolhido,
-                    "centro": melhor_opcao_para_entrega["centro_alocado"],
-                    "rota": melhor_opcao_para_entrega["rota"],
-                    "tempo": melhor_opcao_para_entrega["tempo_total_rota"]
-                })
+                rota_expandida = self._expandir_rota(centro.cidade, paradas) if caminhao else None
+                if rota_expandida is None:
+                    continue
+
+                livres.remove(caminhao)
+                for entrega_obj in entregas_rota:
+                    caminhao.adicionar_entrega_a_lista(entrega_obj)
+                    entrega_obj.origem = centro.cidade
+                caminhao.atualizar_rota_e_tempo(rota_expandida, linha_tempo.tempo_total, linha_tempo)
+                for entrega_obj in entregas_rota:
+                    relatorio_final[indice_da_entrega[entrega_obj]] = {
+                        "entrega": entrega_obj, "caminhao": caminhao, "centro": centro,
+                        "rota": rota_expandida, "tempo": linha_tempo.tempo_total
+                    }
+
+            pendentes = [i for i in pendentes if relatorio_final[i] is None]
+
+    def _paradas_do_lote(self, origem: str, entregas: list, referencia, retorno=None):
+        """
+        Consolida as entregas do lote em paradas (ParadaConsolidada) para a construção das
+        rotas: uma por cidade, dividida se passar da capacidade do caminhão de referência.
+        Entregas inviáveis mesmo sozinhas (com os motivos de construir_rotas_economias) ficam
+        de fora, para que o prazo de uma delas não derrube as outras entregas da cidade.
+        Com `retorno`, a viagem direta inclui a volta ao centro na verificação de horas.
+
+        Returns:
+            tuple:
+                list[ParadaConsolidada]: paradas das entregas viáveis.
+                dict: {Entrega: motivo} das inviáveis.
+        """
+        chegada_por_cidade = {}
+        viaveis, inviaveis = [], {}
+        for entrega_obj in entregas:
+            chegada = chegada_por_cidade.get(entrega_obj.destino)
+            if chegada is None:
+                chegada = chegada_por_cidade[entrega_obj.destino] = self.oraculo.distancia(origem, entrega_obj.destino)
+            volta = retorno(entrega_obj.destino) if retorno is not None else 0
+            if chegada == float('inf'):
+                inviaveis[entrega_obj] = "inalcancavel"
+            elif entrega_obj.peso > referencia.capacidade_kg_total:
+                inviaveis[entrega_obj] = "capacidade"
+            elif chegada > entrega_obj.prazo:
+                inviaveis[entrega_obj] = "prazo"
+            elif chegada + volta > referencia.horas_operacao_maximas_dia:
+                inviaveis[entrega_obj] = "horas"
             else:
-                # MODIFICAÇÃO: Construir lista de strings para os erros
-                lista_erros_detalhados = []
-                if falhas_agregadas["caminhoes_sem_cd_origem_definido"] == falhas_agregadas["total_caminhoes_verificados_para_entrega"] and falhas_agregadas["total_caminhoes_verificados_para_entrega"] > 0 :
-                     lista_erros_detalhados.append(f"AVISO INTERNO: Todos os {falhas_agregadas['total_caminhoes_verificados_para_entrega']} caminhões verificados foram ignorados por não terem Centro de Distribuição de origem definido corretamente.")
-                elif falhas_agregadas["caminhoes_sem_cd_origem_definido"] > 0:
-                    lista_erros_detalhados.append(f"AVISO INTERNO: {falhas_agregadas['caminhoes_sem_cd_origem_definido']} caminhões ignorados por não terem Centro de Distribuição de origem definido corretamente.")
-
-                if falhas_agregadas["capacidade_peso"] == caminhoes_considerados_validos_inicialmente and caminhoes_considerados_validos_inicialmente > 0:
-                    lista_erros_detalhados.append(f"Todos os {caminhoes_considerados_validos_inicialmente} caminhões (com Centro de Distribuição definido e capacidade inicial verificável) não possuem capacidade de peso suficiente.")
-                elif falhas_agregadas["capacidade_peso"] > 0:
-                     lista_erros_detalhados.append(f"{falhas_agregadas['capacidade_peso']}/{caminhoes_considerados_validos_inicialmente} caminhões (com Centro de Distribuição definido) sem capacidade de peso.")
-                
-                if falhas_agregadas["rota_invalida_ou_inalcancavel"] == (caminhoes_considerados_validos_inicialmente - falhas_agregadas["capacidade_peso"]) and (caminhoes_considerados_validos_inicialmente - falhas_agregadas["capacidade_peso"]) > 0 :
-                     lista_erros_detalhados.append("Todos os caminhões com capacidade tiveram rotas inválidas/inalcançáveis.")
-                elif falhas_agregadas["rota_invalida_ou_inalcancavel"] > 0:
-                    lista_erros_detalhados.append(f"{falhas_agregadas['rota_invalida_ou_inalcancavel']} tentativas de rota falharam (rota inválida/inalcançável).")
-                
-                if falhas_agregadas["prazo_entrega_excedido"] > 0:
-                    lista_erros_detalhados.append(f"{falhas_agregadas['prazo_entrega_excedido']} tentativas excederiam o prazo da entrega ({entrega_obj.prazo}h).")
-                if falhas_agregadas["horas_caminhao_excedidas"] > 0:
-                    lista_erros_detalhados.append(f"{falhas_agregadas['horas_caminhao_excedidas']} tentativas excederiam as horas de operação do caminhão.")
-                if falhas_agregadas["prazo_outras_entregas_violado"] > 0:
-                    lista_erros_detalhados.append(f"{falhas_agregadas['prazo_outras_entregas_violado']} tentativas violariam prazos de entregas pré-existentes no caminhão.")
-                
-                if not lista_erros_detalhados:
-                    if falhas_agregadas["total_caminhoes_verificados_para_entrega"] > 0:
-                        lista_erros_detalhados.append(f"Nenhum caminhão atendeu a todos os critérios (verificados: {falhas_agregadas['total_caminhoes_verificados_para_entrega']}).")
-                    else:
-                        lista_erros_detalhados.append("Nenhum caminhão disponível nos Centros de Distribuiçãos para verificação.")
-                
-                relatorio_final.append({"entrega": entrega_obj, "erro": lista_erros_detalhados}) # "erro" agora contém a lista
+                viaveis.append(entrega_obj)
+        return ParadaConsolidada.agrupar(viaveis, referencia.capacidade_kg_total), inviaveis
+
+    def melhorar_rotas(self, tempo_limite: float, relatorio_final: list = None) -> dict:
+        """
+        Fase opcional de melhoria, depois da alocação: busca local (BuscaLocalRotas) sobre as
+        rotas de todos os caminhões com entregas, limitada a `tempo_limite` segundos, para
+        reduzir a soma das horas das rotas sem violar capacidade, horas ou prazos.
+
+        As paradas (cidade + todas as entregas do caminhão para ela) podem mudar de ordem e de
+        caminhão. Ao final, os caminhões alterados têm entregas, rota, tempo e linha do tempo
+        refeitos (e são reposicionados em self.frota, se já montada); se `relatorio_final` for
+        dado, suas entradas alocadas são atualizadas.
+
+        Args:
+            tempo_limite (float): orçamento de tempo em segundos.
+            relatorio_final (list): relatório devolvido por alocar_entregas (opcional).
+
+        Returns:
+            dict: estatísticas da busca (custo inicial/final em horas, movimentos, tempo gasto).
+        """
+        caminhoes, rotas = [], []
+        indice_cidade = {}
+        def indice(cidade):
+            return indice_cidade.setdefault(cidade, len(indice_cidade))
+
+        for centro in self.centros:
+            for caminhao in centro.caminhoes:
+                if not caminhao.entregas or not hasattr(caminhao, 'centro_origem'):
+                    continue
+                origem = caminhao.centro_origem.cidade
+                paradas = caminhao.paradas_na_ordem()
+                por_destino = {p.destino: p for p in ParadaConsolidada.agrupar(caminhao.entregas)}
+                linha_tempo = LinhaTempoRota.a_partir_de_paradas(
+                    origem, paradas, self._prazos_por_parada(paradas, caminhao.entregas), self.oraculo.distancia,
+                    self._funcao_retorno(origem)
+                )
+                if not linha_tempo.prazos_atendidos() or linha_tempo.tempo_total > caminhao.horas_operacao_maximas_dia:
+                    continue # Rota já inviável: fica como está
+                caminhoes.append(caminhao)
+                rotas.append(RotaBusca(
+                    indice(origem), [indice(p) for p in paradas], linha_tempo.prazos,
+                    [por_destino[p].peso for p in paradas], [por_destino[p].entregas for p in paradas],
+                    caminhao.capacidade_kg_total, caminhao.horas_operacao_maximas_dia, linha_tempo.tempo_total
+                ))
+
+        cidades = list(indice_cidade)
+        matriz = self.oraculo.matriz_paradas(cidades[0], cidades) if cidades else None
+        distancias = [[matriz.distancia(a, b) for b in cidades] for a in cidades]
+        busca = BuscaLocalRotas(rotas, distancias, com_retorno=self.considerar_retorno)
+        estatisticas = busca.executar(tempo_limite)
+
+        for caminhao, rota in zip(caminhoes, rotas):
+            paradas = [cidades[p] for p in rota.paradas]
+            novas_entregas = [e for carga in rota.cargas for e in carga]
+            if paradas == caminhao.paradas_na_ordem() and set(novas_entregas) == set(caminhao.entregas):
+                continue
+            for entrega_obj in list(caminhao.entregas):
+                caminhao.remover_entrega_da_lista(entrega_obj)
+            for entrega_obj in novas_entregas:
+                caminhao.adicionar_entrega_a_lista(entrega_obj)
+                entrega_obj.origem = caminhao.centro_origem.cidade
+            linha_tempo = LinhaTempoRota.a_partir_de_paradas(
+                caminhao.centro_origem.cidade, paradas, rota.prazos, self.oraculo.distancia,
+                self._funcao_retorno(caminhao.centro_origem.cidade)
+            )
+            caminhao.atualizar_rota_e_tempo(
+                self._expandir_rota(caminhao.centro_origem.cidade, paradas), linha_tempo.tempo_total, linha_tempo
+            )
+            if self.frota is not None: # A carga mudou: alocar_entregas_em_fluxo pode reutilizar a frota
+                self.frota.atualizar(caminhao)
+
+        if relatorio_final is not None:
+            caminhao_da_entrega = {e: c for c in caminhoes for e in c.entregas}
+            for item in relatorio_final:
+                caminhao = caminhao_da_entrega.get(item["entrega"])
+                if "erro" not in item and caminhao is not None:
+                    item.update({"caminhao": caminhao, "centro": caminhao.centro_origem,
+                                 "rota": caminhao.rota, "tempo": caminhao.tempo_rota_atual})
+        return estatisticas
+
+    def _alocar_entregas(self):
+        self._preparar_alocacao()
+        return [self._alocar_entrega(entrega_obj) for entrega_obj in self.entregas]
+
+    def _preparar_alocacao(self):
+        """ Zera os caches que dependem do grafo e monta a estrutura da frota a partir do estado atual dos caminhões. """
+        # O grafo pode ter mudado desde a última passada; as árvores são recalculadas sob demanda
+        self.oraculo.invalidar()
+        if self.cache_rotas is not None:
+            self.cache_rotas.limpar()
+        self.mapa_centros = None
+        self.tabela_retorno = None
+        self.estatisticas_busca = {"nos_explorados": 0, "nos_podados": 0}
+        self.histograma_falhas.limpar()
+        self.frota = self.ESTRUTURAS_FROTA[self.estrutura_frota](self.centros)
+
+    def alocar_entregas_em_fluxo(self, fonte, reutilizar_frota: bool = False):
+        """
+        Alocação contínua: consome entregas de um iterável ou de uma queue.Queue (até receber
+        None) e devolve, como gerador, o registro de cada entrega (mesmo formato das entradas
+        de alocar_entregas) assim que ela é decidida.
+
+        Nada é acumulado além do estado da frota: as entregas não entram em self.entregas e
+        os registros não são guardados. O estado da frota e os caches do grafo continuam
+        entre chamadas; se o grafo mudar, chame self.oraculo.invalidar() e
+        self.cache_rotas.limpar().
+
+        Args:
+            fonte (Iterable[Entrega] | queue.Queue): origem das entregas.
+            reutilizar_frota (bool): se True, mantém a estrutura da frota (FrotaColunar/IndiceFrota)
+                montada na chamada anterior em vez de remontá-la. Só é seguro quando ninguém
+                altera os caminhões fora do Roteirizador entre as chamadas (ex.: o servidor de
+                despacho, que aloca um micro-lote por chamada).
+
+        Yields:
+            dict: {"entrega", "caminhao", "centro", "rota", "tempo"} ou {"entrega", "erro": DiagnosticoFalha}.
+        """
+        if isinstance(fonte, queue.Queue):
+            fonte = iter(fonte.get, None)
+        # Por padrão a frota é remontada a cada chamada: os caminhões podem ter mudado por fora entre elas
+        if self.frota is None or not reutilizar_frota:
+            self.frota = self.ESTRUTURAS_FROTA[self.estrutura_frota](self.centros)
+        for entrega_obj in fonte:
+            yield self._alocar_entrega(entrega_obj)
+
+    def _alocar_entrega(self, entrega_obj: 'Entrega') -> dict:
+        """
+        Decide a alocação de uma entrega na frota (self.frota já montada) e aplica a escolha.
+
+        Returns:
+            dict: registro do relatório para a entrega (alocação ou DiagnosticoFalha em "erro").
+        """
+        if self._orcamento_esgotado():
+            self._orcamento["entregas_sem_tempo"] += 1
+            return self._registro_falha(DiagnosticoFalha.simples(entrega_obj, MotivoFalha.TEMPO_ESGOTADO))
+
+        cd_origem_da_entrega, _ = self.centro_mais_proximo(entrega_obj.destino)
+
+        if cd_origem_da_entrega is None:
+            return self._registro_falha(DiagnosticoFalha.simples(entrega_obj, MotivoFalha.DESTINO_INALCANCAVEL))
         
-        return relatorio_final
+        entrega_obj.origem = cd_origem_da_entrega.cidade
+
+        melhor_opcao_para_entrega = {
+            "caminhao": None, "centro_alocado": None, "rota": None,
+            "tempo_total_rota": float('inf'), "alocada": False
+        }
+        
+        falhas = [0] * len(MotivoFalha) # Contadores indexados por MotivoFalha
+
+        def tempo_minimo_por_origem(origem, destino=entrega_obj.destino):
+            # Qualquer rota que passe pelo destino dura ao menos a ida direta até ele
+            distancia = self.oraculo.distancia(origem, destino)
+            return 0 if distancia == float('inf') else distancia # Inalcançável: falha contada na rota
+
+        # Só os caminhões com capacidade, e que ao menos indo direto ao destino cumprem o prazo
+        # e as horas do dia, são roteirizados
+        candidatos, descartes = self.frota.candidatos(entrega_obj.peso, tempo_minimo_por_origem, entrega_obj.prazo)
+        falhas[MotivoFalha.SEM_CD_ORIGEM] = self.frota.sem_origem
+        falhas[MotivoFalha.CAPACIDADE] = descartes["capacidade"]
+        falhas[MotivoFalha.PRAZO_ENTREGA] = descartes["prazo"]
+        falhas[MotivoFalha.HORAS_CAMINHAO] = descartes["horas"]
+        caminhoes_considerados_validos_inicialmente = len(candidatos) + descartes["prazo"] + descartes["horas"]
+
+        viaveis = []
+        for caminhao_candidato in candidatos:
+            if not caminhao_candidato.pode_adicionar_carga(entrega_obj.peso): # Arredondamento na chave do índice
+                falhas[MotivoFalha.CAPACIDADE] += 1
+                caminhoes_considerados_validos_inicialmente -= 1
+                continue
+            viaveis.append(caminhao_candidato)
+
+        # Resultados chegam na ordem de 'viaveis' (também no modo paralelo): o desempate não muda
+        for caminhao_candidato, avaliacao in zip(viaveis, self._avaliar_candidatos(viaveis, entrega_obj)):
+            nova_rota_calculada, tempo_total_calculado, prazo_entrega_atual_atendido, \
+                linha_tempo_candidata, motivos_rota = avaliacao
+            origem_da_rota_do_caminhao_str = caminhao_candidato.centro_origem.cidade
+
+            if not nova_rota_calculada:
+                if motivos_rota:
+                    self._contabilizar_motivos(falhas, motivos_rota)
+                else:
+                    falhas[MotivoFalha.ROTA_INVALIDA] += 1
+                continue 
+
+            if not prazo_entrega_atual_atendido:
+                falhas[MotivoFalha.PRAZO_ENTREGA] += 1
+            if tempo_total_calculado > caminhao_candidato.horas_operacao_maximas_dia:
+                falhas[MotivoFalha.HORAS_CAMINHAO] += 1
+            
+            if linha_tempo_candidata is not None:
+                # Folgas já calculadas na linha do tempo: verificação O(1), sem refazer a rota
+                prazos_todos_ok = linha_tempo_candidata.prazos_atendidos()
+            else:
+                # Uma parada por cidade, com o prazo mais apertado entre as entregas dela
+                todas_entregas_para_verificacao_prazo = ParadaConsolidada.agrupar(caminhao_candidato.entregas + [entrega_obj])
+                prazos_todos_ok = self.verificar_prazos_para_rota(
+                    nova_rota_calculada, 
+                    tempo_total_calculado,
+                    todas_entregas_para_verificacao_prazo, 
+                    origem_da_rota_do_caminhao_str
+                )
+            if not prazos_todos_ok:
+                falhas[MotivoFalha.PRAZO_OUTRAS_ENTREGAS] += 1
+
+            if prazo_entrega_atual_atendido and \
+               tempo_total_calculado <= caminhao_candidato.horas_operacao_maximas_dia and \
+               prazos_todos_ok:
+                if tempo_total_calculado < melhor_opcao_para_entrega["tempo_total_rota"]:
+                    melhor_opcao_para_entrega.update({
+                        "caminhao": caminhao_candidato,
+                        "centro_alocado": caminhao_candidato.centro_origem,
+                        "rota": nova_rota_calculada,
+                        "tempo_total_rota": tempo_total_calculado,
+                        "linha_tempo": linha_tempo_candidata,
+                        "alocada": True
+                    })
+    
+        if melhor_opcao_para_entrega["alocada"]:
+            caminhao_escolhido = melhor_opcao_para_entrega["caminhao"]
+            caminhao_escolhido.adicionar_entrega_a_lista(entrega_obj)
+            caminhao_escolhido.atualizar_rota_e_tempo(
+                melhor_opcao_para_entrega["rota"],
+                melhor_opcao_para_entrega["tempo_total_rota"],
+                melhor_opcao_para_entrega["linha_tempo"]
+            )
+            self.frota.atualizar(caminhao_escolhido)
+            return {
+                "entrega": entrega_obj,
+                "caminhao": caminhao_escolhido,
+                "centro": melhor_opcao_para_entrega["centro_alocado"],
+                "rota": melhor_opcao_para_entrega["rota"],
+                "tempo": melhor_opcao_para_entrega["tempo_total_rota"]
+            }
+        else:
+            if self._orcamento_esgotado():
+                falhas[MotivoFalha.AVALIACAO_INTERROMPIDA] = 1
+            # Só contadores: o texto é montado por DiagnosticoFalha.mensagens() quando for exibido
+            return self._registro_falha(DiagnosticoFalha(
+                entrega_obj, falhas, self.frota.total_caminhoes, caminhoes_considerados_validos_inicialmente
+            ))
+
+    def _registro_falha(self, diagnostico: DiagnosticoFalha) -> dict:
+        """ Entrada do relatório para uma entrega não alocada; soma o diagnóstico em self.histograma_falhas. """
+        self.histograma_falhas.registrar(diagnostico)
+        return {"entrega": diagnostico.entrega, "erro": diagnostico}
+
+    def _contabilizar_motivos(self, falhas: list, motivos: dict):
+        """ Traduz as restrições que impediram a rota (branch-and-bound/inserção) para os contadores de falha. """
+        reconhecida = False
+        if motivos.get("prazo_nova_violado"):
+            falhas[MotivoFalha.PRAZO_ENTREGA] += 1
+            reconhecida = True
+        if motivos.get("prazo_outras_violado"):
+            falhas[MotivoFalha.PRAZO_OUTRAS_ENTREGAS] += 1
+            reconhecida = True
+        if motivos.get("horas_excedidas"):
+            falhas[MotivoFalha.HORAS_CAMINHAO] += 1
+            reconhecida = True
+        if not reconhecida:
+            falhas[MotivoFalha.ROTA_INVALIDA] += 1
 
     def verificar_prazos_para_rota(self, rota_calculada: list, tempo_total_rota_nao_usado: float, entregas_na_rota: list, origem_rota_str: str):
         # ... (código existente do verificar_prazos_para_rota - renomeei um arg não usado para clareza) ...
@@ -256,7 +973,7 @@ class Roteirizador:
 
         for i in range(len(rota_calculada) - 1):
             proxima_cidade_na_rota = rota_calculada[i+1]
-            _, tempo_segmento = self.grafo.caminho_mais_curto(cidade_atual, proxima_cidade_na_rota)
+            tempo_segmento = self.oraculo.distancia(cidade_atual, proxima_cidade_na_rota)
 
             if tempo_segmento == float('inf'):
                 return False 
@@ -268,4 +985,55 @@ class Roteirizador:
                 entrega_correspondente = map_destino_para_entrega[cidade_atual]
                 if tempo_acumulado_na_rota > entrega_correspondente.prazo:
                     return False 
-        return True
\ No newline at end of file
+        return True
+
+
+# Estado de cada processo do pool: um Roteirizador sem frota, com o próprio oráculo sobre a cópia do grafo
+_roteirizador_trabalhador = None
+
+
+def _inicializar_trabalhador(grafo, usar_oraculo, algoritmo_rota, estrutura_frota='colunar', considerar_retorno=True):
+    """ Executado uma vez em cada processo do pool: recebe a cópia do grafo e monta o roteirizador local. """
+    global _roteirizador_trabalhador
+    _roteirizador_trabalhador = Roteirizador([], [], grafo, usar_oraculo=usar_oraculo, algoritmo_rota=algoritmo_rota,
+                                             estrutura_frota=estrutura_frota, considerar_retorno=considerar_retorno)
+
+
+def _avaliar_no_trabalhador(tarefa):
+    """ Calcula a rota de um caminhão candidato num processo do pool (mesmo cálculo de _avaliar_caminhao). """
+    origem, destinos, entrega_obj, entregas_na_rota, limite_horas = tarefa
+    roteirizador = _roteirizador_trabalhador
+    roteirizador.ultima_busca_rota = None
+    rota, tempo, prazo_atendido = roteirizador._calcular_melhor_rota_para_destinos(
+        origem, destinos, entrega_obj, entregas_na_rota=entregas_na_rota, limite_horas=limite_horas
+    )
+    return (rota, tempo, prazo_atendido, roteirizador.ultima_linha_tempo,
+            roteirizador.motivos_ultima_rota, roteirizador.ultima_busca_rota)
+
+
+def _alocar_particao_no_trabalhador(centro, entregas):
+    """
+    Aloca as entregas de uma partição só com a frota do centro (num processo do pool).
+
+    Returns:
+        tuple:
+            list[tuple]: por entrega, (índice do caminhão em centro.caminhoes, rota, tempo, None)
+                se alocada, ou (None, None, None, DiagnosticoFalha).
+            dict: {índice do caminhão: (rota, tempo, LinhaTempoRota)} com o estado final dos
+                caminhões que receberam entregas.
+    """
+    base = _roteirizador_trabalhador
+    parcial = Roteirizador([centro], entregas, base.grafo, usar_oraculo=base.usar_oraculo,
+                           algoritmo_rota=base.algoritmo_rota, estrutura_frota=base.estrutura_frota,
+                           considerar_retorno=base.considerar_retorno)
+    indice_caminhao = {caminhao: i for i, caminhao in enumerate(centro.caminhoes)}
+    itens = []
+    estado_final = {}
+    for item in parcial.alocar_entregas():
+        if "erro" in item:
+            itens.append((None, None, None, item["erro"]))
+            continue
+        caminhao = item["caminhao"]
+        itens.append((indice_caminhao[caminhao], item["rota"], item["tempo"], None))
+        estado_final[indice_caminhao[caminhao]] = (caminhao.rota, caminhao.tempo_rota_atual, caminhao.linha_tempo)
+    return itens, estado_final
\ No newline at end of file
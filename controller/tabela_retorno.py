@@ -0,0 +1,54 @@
+class TabelaRetornoCentros:
+    """
+    Pré-cálculo, para cada cidade do grafo, da distância de volta a cada centro de distribuição.
+
+    Todas as implementações de grafo do projeto são não direcionadas (adicionar_aresta liga
+    os dois sentidos), então a volta de uma cidade até o centro custa o mesmo que a ida
+    do centro até ela: basta a árvore de caminhos mínimos de cada centro. As árvores vêm
+    do OraculoCaminhos do Roteirizador, que já as usa para as rotas de ida; a tabela não
+    faz buscas próprias, e somar o trecho de retorno ao custo de uma rota é uma consulta
+    em dicionário.
+    """
+
+    def __init__(self, oraculo, centros=()):
+        """
+        Inicializa a tabela (as árvores só são lidas em construir() ou na primeira consulta).
+
+        Args:
+            oraculo (OraculoCaminhos): oráculo que fornece (e memoriza) as árvores dos centros.
+            centros (List[CentroDistribuicao]): centros pré-calculados em construir(); outros
+                centros são calculados na primeira consulta.
+        """
+        self.oraculo = oraculo
+        self.centros = list(centros)
+        self.arvores = {} # {cidade do centro: (distancias, anterior)}, as mesmas do oráculo
+
+    def construir(self):
+        """ Obtém do oráculo a árvore de cada centro ainda não lido. """
+        for centro in self.centros:
+            self.distancias_ate(centro.cidade)
+        return self
+
+    def _arvore(self, cidade_centro: str):
+        arvore = self.arvores.get(cidade_centro)
+        if arvore is None:
+            arvore = self.arvores[cidade_centro] = self.oraculo.arvore(cidade_centro)
+        return arvore
+
+    def distancias_ate(self, cidade_centro: str) -> dict:
+        """ Retorna {cidade: distância da cidade de volta ao centro}. """
+        return self._arvore(cidade_centro)[0]
+
+    def retorno(self, cidade: str, cidade_centro: str) -> float:
+        """ Distância da cidade de volta ao centro (inf se inalcançável). """
+        return self.distancias_ate(cidade_centro).get(cidade, float('inf'))
+
+    def caminho_retorno(self, cidade: str, cidade_centro: str):
+        """ Caminho da cidade de volta ao centro (a árvore do centro percorrida ao contrário), ou None. """
+        if self.retorno(cidade, cidade_centro) == float('inf'):
+            return None
+        caminho, _ = self.oraculo.caminho_mais_curto(cidade_centro, cidade)
+        return caminho[::-1] if caminho else None
+
+    def __repr__(self):
+        return f"TabelaRetornoCentros com {len(self.arvores)} centros calculados"
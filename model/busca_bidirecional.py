@@ -0,0 +1,73 @@
+import heapq
+
+
+def dijkstra_bidirecional(vizinhos, origem, destino):
+    """
+    Dijkstra bidirecional ponto a ponto para grafos não direcionados: uma busca parte da
+    origem, outra do destino (com as mesmas arestas), e a cada passo avança a que tem o
+    menor topo de fila.
+
+    Cada aresta examinada (u, v) com v já alcançado pela outra busca é um candidato a
+    ponto de encontro (dist_u + peso + dist_outro_lado[v]); as buscas param quando a soma
+    dos dois topos de fila não é menor que o melhor candidato, o que garante que nenhum
+    caminho ainda não examinado seja mais curto. O caminho é emendado pela aresta de
+    encontro: antecessores da busca direta até u, depois os da busca reversa a partir de v.
+
+    Args:
+        vizinhos (Callable): vértice -> iterável de (vizinho, peso). Os vértices podem ser
+            nomes de cidade ou índices, desde que origem e destino existam no grafo.
+        origem: vértice de partida.
+        destino: vértice de chegada.
+
+    Returns:
+        tuple:
+            list: Caminho mais curto como lista de vértices (ou None se inalcançável).
+            float: Distância total do caminho (ou inf).
+            int: Vértices fechados pelas duas buscas.
+    """
+    if origem == destino:
+        return [origem], 0, 0
+
+    inf = float('inf')
+    distancias = ({origem: 0}, {destino: 0})    # [0] busca direta, [1] busca reversa
+    anterior = ({origem: None}, {destino: None})
+    filas = ([(0, origem)], [(0, destino)])
+    melhor = inf
+    encontro = None # (vértice da busca direta, vértice da busca reversa)
+    fechados = 0
+
+    while filas[0] and filas[1]:
+        if filas[0][0][0] + filas[1][0][0] >= melhor:
+            break
+        lado = 0 if filas[0][0][0] <= filas[1][0][0] else 1
+        dist_lado, dist_outro, anterior_lado = distancias[lado], distancias[1 - lado], anterior[lado]
+
+        dist_u, u = heapq.heappop(filas[lado])
+        if dist_u > dist_lado[u]:
+            continue
+        fechados += 1
+
+        for vizinho, peso in vizinhos(u):
+            nova = dist_u + peso
+            if nova < dist_lado.get(vizinho, inf):
+                dist_lado[vizinho] = nova
+                anterior_lado[vizinho] = u
+                heapq.heappush(filas[lado], (nova, vizinho))
+            if vizinho in dist_outro and nova + dist_outro[vizinho] < melhor:
+                melhor = nova + dist_outro[vizinho]
+                encontro = (u, vizinho) if lado == 0 else (vizinho, u)
+
+    if encontro is None:
+        return None, inf, fechados
+
+    caminho = []
+    atual = encontro[0]
+    while atual is not None:
+        caminho.append(atual)
+        atual = anterior[0][atual]
+    caminho.reverse()
+    atual = encontro[1]
+    while atual is not None:
+        caminho.append(atual)
+        atual = anterior[1][atual]
+    return caminho, melhor, fechados
@@ -24,6 +24,7 @@ class Caminhao:
         self.centro_origem = centro_origem
         self.entregas = []
         self.rota = [] # Lista de cidades da rota atual
+        self.linha_tempo = None # LinhaTempoRota com chegadas e folgas das paradas da rota atual
 
     @property
     def capacidade_kg_disponivel(self):
@@ -46,10 +47,25 @@ class Caminhao:
             self.entregas.remove(entrega)
             self.capacidade_kg_usada -= entrega.peso
 
-    def atualizar_rota_e_tempo(self, nova_rota: list, tempo_total_nova_rota: float):
-        """ Atualiza a rota planejada e o tempo total de operação para essa rota. """
+    def atualizar_rota_e_tempo(self, nova_rota: list, tempo_total_nova_rota: float, linha_tempo=None):
+        """ Atualiza a rota planejada, o tempo total de operação e (opcionalmente) a linha do tempo das paradas. """
         self.rota = nova_rota
         self.tempo_rota_atual = tempo_total_nova_rota
+        self.linha_tempo = linha_tempo
+
+    def paradas_na_ordem(self) -> list:
+        """ Cidades de entrega na ordem de visita (da linha do tempo ou, sem ela, da primeira passagem da rota). """
+        if self.linha_tempo is not None:
+            return list(self.linha_tempo.paradas)
+        destinos = {e.destino for e in self.entregas}
+        paradas = []
+        for cidade in self.rota:
+            if cidade in destinos and cidade not in paradas:
+                paradas.append(cidade)
+        for entrega in self.entregas: # Segurança: destinos que a rota atual não cobre vão para o fim
+            if entrega.destino not in paradas:
+                paradas.append(entrega.destino)
+        return paradas
 
     def pode_adicionar_carga(self, peso_adicional: float) -> bool:
         """ Verifica se uma carga adicional cabe na capacidade restante. """
@@ -0,0 +1,154 @@
+from enum import IntEnum
+
+
+class MotivoFalha(IntEnum):
+    """ Códigos dos motivos pelos quais uma entrega não foi alocada (índices dos contadores). """
+    DESTINO_INALCANCAVEL = 0    # Nenhum centro (ou o centro do lote) alcança o destino
+    SEM_CD_ORIGEM = 1           # Caminhões ignorados por não terem centro de origem
+    CAPACIDADE = 2              # Caminhões sem capacidade para o peso
+    ROTA_INVALIDA = 3           # Tentativas de rota inválida/inalcançável
+    PRAZO_ENTREGA = 4           # Tentativas que estourariam o prazo da entrega
+    HORAS_CAMINHAO = 5          # Tentativas que estourariam as horas do caminhão
+    PRAZO_OUTRAS_ENTREGAS = 6   # Tentativas que violariam prazos de entregas já no caminhão
+    TEMPO_ESGOTADO = 7          # Orçamento de tempo acabou antes de avaliar a entrega
+    AVALIACAO_INTERROMPIDA = 8  # Orçamento de tempo acabou no meio da avaliação dos caminhões
+    SEM_CAMINHAO_LIVRE = 9      # Lote: nenhum caminhão livre comporta a rota da entrega
+
+
+class DiagnosticoFalha:
+    """
+    Motivos da falha de uma entrega em forma compacta: um contador inteiro por MotivoFalha
+    e o pouco de contexto necessário para o texto (caminhões verificados, centro do lote).
+
+    O texto em português só é montado em mensagens(), quando alguém for exibi-lo ou
+    exportá-lo; o relatório da alocação guarda apenas este objeto.
+    """
+    __slots__ = ("entrega", "contadores", "verificados", "validos", "centro")
+
+    def __init__(self, entrega, contadores, verificados: int = 0, validos: int = 0, centro: str = None):
+        """
+        Args:
+            entrega (Entrega): entrega não alocada.
+            contadores (Sequence[int]): contadores indexados por MotivoFalha.
+            verificados (int): total de caminhões da frota considerados.
+            validos (int): caminhões com centro de origem e capacidade verificável.
+            centro (str): cidade do centro, nas falhas da alocação em lote.
+        """
+        self.entrega = entrega
+        self.contadores = tuple(contadores)
+        self.verificados = verificados
+        self.validos = validos
+        self.centro = centro
+
+    @classmethod
+    def simples(cls, entrega, motivo: MotivoFalha, centro: str = None) -> 'DiagnosticoFalha':
+        """ Diagnóstico de um único motivo (contador 1). """
+        contadores = [0] * len(MotivoFalha)
+        contadores[motivo] = 1
+        return cls(entrega, contadores, centro=centro)
+
+    def contagem(self, motivo: MotivoFalha) -> int:
+        return self.contadores[motivo]
+
+    def motivos(self) -> list:
+        """ Motivos com contador diferente de zero, em ordem de código. """
+        return [motivo for motivo in MotivoFalha if self.contadores[motivo]]
+
+    def mensagens(self) -> list:
+        """ Monta o texto de cada motivo (mesmas mensagens que o relatório exibia antes). """
+        if self.contadores[MotivoFalha.SEM_CAMINHAO_LIVRE]:
+            return ["Nenhum caminhão livre nos Centros de Distribuição comporta a rota desta entrega."]
+        if self.centro is not None:
+            return [self._mensagem_lote()]
+
+        c = self.contadores
+        entrega = self.entrega
+        if c[MotivoFalha.DESTINO_INALCANCAVEL]:
+            return [f"Destino '{entrega.destino}' inalcançável por qualquer Centro de Distribuição."]
+        if c[MotivoFalha.TEMPO_ESGOTADO]:
+            return ["Tempo limite da alocação esgotado antes de avaliar esta entrega."]
+
+        mensagens = []
+        sem_cd, verificados, validos = c[MotivoFalha.SEM_CD_ORIGEM], self.verificados, self.validos
+        if sem_cd == verificados and verificados > 0:
+            mensagens.append(f"AVISO INTERNO: Todos os {verificados} caminhões verificados foram ignorados por não terem Centro de Distribuição de origem definido corretamente.")
+        elif sem_cd > 0:
+            mensagens.append(f"AVISO INTERNO: {sem_cd} caminhões ignorados por não terem Centro de Distribuição de origem definido corretamente.")
+
+        capacidade = c[MotivoFalha.CAPACIDADE]
+        if capacidade == validos and validos > 0:
+            mensagens.append(f"Todos os {validos} caminhões (com Centro de Distribuição definido e capacidade inicial verificável) não possuem capacidade de peso suficiente.")
+        elif capacidade > 0:
+            mensagens.append(f"{capacidade}/{validos} caminhões (com Centro de Distribuição definido) sem capacidade de peso.")
+
+        rota_invalida, com_capacidade = c[MotivoFalha.ROTA_INVALIDA], validos - capacidade
+        if rota_invalida == com_capacidade and com_capacidade > 0:
+            mensagens.append("Todos os caminhões com capacidade tiveram rotas inválidas/inalcançáveis.")
+        elif rota_invalida > 0:
+            mensagens.append(f"{rota_invalida} tentativas de rota falharam (rota inválida/inalcançável).")
+
+        if c[MotivoFalha.PRAZO_ENTREGA] > 0:
+            mensagens.append(f"{c[MotivoFalha.PRAZO_ENTREGA]} tentativas excederiam o prazo da entrega ({entrega.prazo}h).")
+        if c[MotivoFalha.HORAS_CAMINHAO] > 0:
+            mensagens.append(f"{c[MotivoFalha.HORAS_CAMINHAO]} tentativas excederiam as horas de operação do caminhão.")
+        if c[MotivoFalha.PRAZO_OUTRAS_ENTREGAS] > 0:
+            mensagens.append(f"{c[MotivoFalha.PRAZO_OUTRAS_ENTREGAS]} tentativas violariam prazos de entregas pré-existentes no caminhão.")
+        if c[MotivoFalha.AVALIACAO_INTERROMPIDA]:
+            mensagens.append("Tempo limite da alocação esgotado antes de avaliar todos os caminhões.")
+
+        if not mensagens:
+            if verificados > 0:
+                mensagens.append(f"Nenhum caminhão atendeu a todos os critérios (verificados: {verificados}).")
+            else:
+                mensagens.append("Nenhum caminhão disponível nos Centros de Distribuiçãos para verificação.")
+        return mensagens
+
+    def _mensagem_lote(self) -> str:
+        """ Texto da falha na alocação em lote (um único motivo, relativo ao centro). """
+        entrega, centro = self.entrega, self.centro
+        if self.contadores[MotivoFalha.CAPACIDADE]:
+            return f"Nenhum caminhão livre do Centro de Distribuição {centro} comporta {entrega.peso}kg."
+        if self.contadores[MotivoFalha.PRAZO_ENTREGA]:
+            return f"A viagem direta desde {centro} já excede o prazo da entrega ({entrega.prazo}h)."
+        if self.contadores[MotivoFalha.HORAS_CAMINHAO]:
+            return f"A viagem direta desde {centro} excede as horas de operação dos caminhões livres."
+        return f"Destino '{entrega.destino}' inalcançável a partir de {centro}."
+
+    def __repr__(self):
+        codigos = ", ".join(f"{motivo.name}={self.contadores[motivo]}" for motivo in self.motivos())
+        return f"DiagnosticoFalha da entrega {self.entrega.id} | {codigos}"
+
+
+class HistogramaFalhas:
+    """
+    Histograma dos motivos de falha ao longo de uma execução: por MotivoFalha, quantas
+    entregas não alocadas tiveram o motivo e quantas tentativas (caminhões) somaram.
+    """
+
+    def __init__(self):
+        self.entregas = [0] * len(MotivoFalha)
+        self.tentativas = [0] * len(MotivoFalha)
+        self.total_falhas = 0
+
+    def registrar(self, diagnostico: DiagnosticoFalha):
+        """ Soma os contadores de uma entrega não alocada. """
+        self.total_falhas += 1
+        for codigo, quantidade in enumerate(diagnostico.contadores):
+            if quantidade:
+                self.entregas[codigo] += 1
+                self.tentativas[codigo] += quantidade
+
+    def limpar(self):
+        self.entregas = [0] * len(MotivoFalha)
+        self.tentativas = [0] * len(MotivoFalha)
+        self.total_falhas = 0
+
+    def como_dict(self) -> dict:
+        """ {nome do motivo: {"entregas", "tentativas"}} só dos motivos que ocorreram. """
+        return {
+            motivo.name: {"entregas": self.entregas[motivo], "tentativas": self.tentativas[motivo]}
+            for motivo in MotivoFalha if self.entregas[motivo]
+        }
+
+    def __repr__(self):
+        return f"HistogramaFalhas com {self.total_falhas} entregas não alocadas"
@@ -0,0 +1,94 @@
+import numpy as np
+
+
+class FrotaColunar:
+    """
+    Estado da frota em colunas NumPy (capacidade, carga usada, horas máximas e índice do
+    centro de origem), uma linha por caminhão.
+
+    A viabilidade de uma entrega para a frota inteira (capacidade, prazo e horas contra o
+    tempo mínimo de viagem) é uma única máscara vetorizada; só os caminhões que sobram
+    passam pela roteirização. Os objetos Caminhao continuam sendo a visão individual usada
+    pelo simulador; atualizar() copia para as colunas o estado do caminhão alterado.
+
+    O tempo da rota atual não entra na máscara: uma parada no caminho da rota existente
+    pode custar quase nada, então "horas restantes >= ida direta" descartaria caminhões
+    viáveis. O corte válido é a ida direta contra as horas máximas do caminhão.
+    """
+
+    def __init__(self, centros):
+        """
+        Monta as colunas a partir dos caminhões de todos os centros.
+
+        Args:
+            centros (List[CentroDistribuicao]): centros com suas frotas já cadastradas.
+        """
+        self.caminhoes = []      # Linha i das colunas <-> self.caminhoes[i], na ordem original da frota
+        self.centros_origem = [] # Centros de origem distintos; indice_centro aponta para esta lista
+        self.linha = {}          # {Caminhao: índice da linha}
+        self.total_caminhoes = 0
+        self.sem_origem = 0      # Caminhões sem centro_origem.cidade (não entram nas colunas)
+
+        posicao_centro = {}
+        indices_centro = []
+        for centro in centros:
+            for caminhao in centro.caminhoes:
+                self.total_caminhoes += 1
+                if not hasattr(caminhao, 'centro_origem') or not hasattr(caminhao.centro_origem, 'cidade'):
+                    self.sem_origem += 1
+                    continue
+                origem = caminhao.centro_origem
+                if origem not in posicao_centro:
+                    posicao_centro[origem] = len(self.centros_origem)
+                    self.centros_origem.append(origem)
+                indices_centro.append(posicao_centro[origem])
+                self.linha[caminhao] = len(self.caminhoes)
+                self.caminhoes.append(caminhao)
+
+        self.capacidade_total = np.array([c.capacidade_kg_total for c in self.caminhoes], dtype=float)
+        self.capacidade_usada = np.array([c.capacidade_kg_usada for c in self.caminhoes], dtype=float)
+        self.horas_maximas = np.array([c.horas_operacao_maximas_dia for c in self.caminhoes], dtype=float)
+        self.indice_centro = np.array(indices_centro, dtype=np.int64)
+
+    def atualizar(self, caminhao):
+        """ Copia para as colunas a carga atual do caminhão. """
+        i = self.linha.get(caminhao)
+        if i is None:
+            return
+        self.capacidade_usada[i] = caminhao.capacidade_kg_usada
+
+    def candidatos(self, peso_minimo: float, tempo_minimo_por_origem=None, prazo: float = float('inf')):
+        """
+        Retorna os caminhões que comportam a carga e cujo tempo mínimo de viagem até o
+        destino cabe no prazo da entrega e nas horas do caminhão.
+
+        Args:
+            peso_minimo (float): peso da entrega a alocar.
+            tempo_minimo_por_origem (callable): cidade_origem -> tempo mínimo de qualquer rota
+                que passe pelo destino (ex.: distância direta). None = sem filtro de tempo.
+            prazo (float): prazo da entrega.
+
+        Returns:
+            tuple:
+                list[Caminhao]: candidatos na ordem original da frota.
+                dict: quantos caminhões foram descartados por capacidade, prazo e horas.
+        """
+        cabe = self.capacidade_usada + peso_minimo <= self.capacidade_total
+        if tempo_minimo_por_origem is not None and self.centros_origem:
+            tempo_por_centro = np.array([tempo_minimo_por_origem(c.cidade) for c in self.centros_origem], dtype=float)
+            tempo_minimo = tempo_por_centro[self.indice_centro]
+            no_prazo = tempo_minimo <= prazo
+            horas_ok = self.horas_maximas >= tempo_minimo
+        else:
+            no_prazo = horas_ok = np.ones(len(self.caminhoes), dtype=bool)
+
+        descartes = {
+            "capacidade": int(np.count_nonzero(~cabe)),
+            "prazo": int(np.count_nonzero(cabe & ~no_prazo)),
+            "horas": int(np.count_nonzero(cabe & no_prazo & ~horas_ok)),
+        }
+        mascara = cabe & no_prazo & horas_ok
+        return [self.caminhoes[i] for i in np.flatnonzero(mascara)], descartes
+
+    def __repr__(self):
+        return f"FrotaColunar com {self.total_caminhoes} caminhões em {len(self.centros_origem)} centros"
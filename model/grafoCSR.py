@@ -0,0 +1,295 @@
+import heapq
+from array import array
+
+import numpy as np
+
+from model.busca_bidirecional import dijkstra_bidirecional
+
+class GrafoCSR:
+    """
+    Grafo não direcionado em formato CSR (compressed sparse row), para mapas grandes.
+
+    Cada nome de cidade é convertido uma única vez num índice inteiro denso; as arestas
+    ficam em três buffers contíguos (array): `deslocamentos[i]:deslocamentos[i + 1]` é o
+    trecho de `alvos`/`pesos` com os vizinhos do vértice i. O Dijkstra trabalha só com
+    inteiros e floats nesses buffers, sem hash de strings nem tuplas por relaxamento, e a
+    memória por aresta fica em 12 bytes (alvo int32 + peso float64).
+
+    As arestas são acumuladas em adicionar_aresta e o CSR é (re)montado com NumPy na
+    primeira consulta depois de alguma mudança; os buffers de acumulação são liberados
+    depois da compactação.
+    """
+    def __init__(self, tipo_fila_dijkstra='heap', bidirecional=False):
+        """
+        Inicializa um grafo vazio.
+
+        Args:
+            tipo_fila_dijkstra (str): 'heap' (heapq) ou 'lista' (busca linear pelo menor).
+            bidirecional (bool): se True, caminho_mais_curto usa o Dijkstra bidirecional (com heap).
+        """
+        self.bidirecional = bidirecional
+        self.cidades = []          # índice -> nome da cidade
+        self.indice_cidade = {}    # nome da cidade -> índice
+        self._origens = array('i') # Arestas ainda não compactadas (os dois sentidos)
+        self._destinos = array('i')
+        self._pesos = array('d')
+        self.deslocamentos = array('q', [0])
+        self.alvos = array('i')
+        self.pesos = array('d')
+        self._compactado = True
+        self.tipo_fila_dijkstra = tipo_fila_dijkstra.lower()
+        if self.tipo_fila_dijkstra not in ['heap', 'lista']:
+            raise ValueError("tipo_fila_dijkstra deve ser 'heap' ou 'lista'")
+
+    def _indice(self, cidade: str) -> int:
+        """ Índice da cidade, criando o vértice se ainda não existir. """
+        idx = self.indice_cidade.get(cidade)
+        if idx is None:
+            idx = self.indice_cidade[cidade] = len(self.cidades)
+            self.cidades.append(cidade)
+        return idx
+
+    def adicionar_aresta(self, origem, destino, distancia):
+        """
+        Adiciona uma aresta bidirecional entre duas cidades com uma distância específica.
+        Como em GrafoListaAdjacencia, uma aresta repetida mantém a primeira distância.
+
+        Args:
+            origem (str): Cidade de origem.
+            destino (str): Cidade de destino.
+            distancia (float): Distância entre origem e destino.
+        """
+        if self._compactado and self.alvos:
+            self._reabrir()
+        i, j = self._indice(origem), self._indice(destino)
+        self._origens.extend((i, j))
+        self._destinos.extend((j, i))
+        self._pesos.extend((distancia, distancia))
+        self._compactado = False
+
+    def _compactar(self):
+        """ Monta deslocamentos/alvos/pesos a partir das arestas acumuladas. """
+        if self._compactado:
+            return
+        n = len(self.cidades)
+        origens = np.frombuffer(self._origens, dtype=np.int32)
+        destinos = np.frombuffer(self._destinos, dtype=np.int32)
+        pesos = np.frombuffer(self._pesos, dtype=np.float64)
+
+        # Primeira ocorrência de cada par (origem, destino), na ordem de inserção
+        _, primeiras = np.unique(origens.astype(np.int64) * n + destinos, return_index=True)
+        primeiras.sort()
+        ordem = primeiras[np.argsort(origens[primeiras], kind='stable')]
+
+        self.deslocamentos = array('q', np.concatenate(([0], np.cumsum(np.bincount(origens[ordem], minlength=n)))).astype(np.int64).tobytes())
+        self.alvos = array('i', destinos[ordem].tobytes())
+        self.pesos = array('d', pesos[ordem].tobytes())
+        self._origens, self._destinos, self._pesos = array('i'), array('i'), array('d')
+        self._compactado = True
+
+    def _reabrir(self):
+        """ Devolve as arestas do CSR aos buffers de acumulação, antes de novas inserções. """
+        graus = np.diff(np.frombuffer(self.deslocamentos, dtype=np.int64))
+        self._origens = array('i', np.repeat(np.arange(len(graus), dtype=np.int32), graus).tobytes())
+        self._destinos = array('i', self.alvos)
+        self._pesos = array('d', self.pesos)
+
+    def vizinhos(self, cidade):
+        """ Retorna a lista de tuplas (vizinho, distancia) de uma cidade. """
+        idx = self.indice_cidade.get(cidade)
+        if idx is None:
+            return []
+        self._compactar()
+        inicio, fim = self.deslocamentos[idx], self.deslocamentos[idx + 1]
+        cidades = self.cidades
+        return [(cidades[v], p) for v, p in zip(self.alvos[inicio:fim], self.pesos[inicio:fim])]
+
+    def _vizinhos_indice(self, idx: int):
+        """ Pares (índice do vizinho, peso) do vértice idx no CSR compactado. """
+        inicio, fim = self.deslocamentos[idx], self.deslocamentos[idx + 1]
+        return zip(self.alvos[inicio:fim], self.pesos[inicio:fim])
+
+    def __contains__(self, cidade):
+        return cidade in self.indice_cidade
+
+    def obter_nos(self):
+        """ Retorna uma lista de todos os nós (cidades) no grafo. """
+        return list(self.cidades)
+
+    def _dijkstra_indices(self, idx_origem: int):
+        """
+        Dijkstra sobre os índices inteiros.
+
+        Returns:
+            tuple:
+                array('d'): menor distância de cada vértice (inf se inalcançável).
+                array('i'): antecessor de cada vértice no caminho mais curto (-1 se nenhum).
+        """
+        self._compactar()
+        n = len(self.cidades)
+        inf = float('inf')
+        distancias = array('d', [inf]) * n
+        anterior = array('i', [-1]) * n
+        distancias[idx_origem] = 0
+        deslocamentos, alvos, pesos = self.deslocamentos, self.alvos, self.pesos
+
+        if self.tipo_fila_dijkstra == 'heap':
+            pq = [(0, idx_origem)]
+            while pq:
+                dist_u, u = heapq.heappop(pq)
+                if dist_u > distancias[u]:
+                    continue
+                for k in range(deslocamentos[u], deslocamentos[u + 1]):
+                    v = alvos[k]
+                    nova = dist_u + pesos[k]
+                    if nova < distancias[v]:
+                        distancias[v] = nova
+                        anterior[v] = u
+                        heapq.heappush(pq, (nova, v))
+        else:
+            visitados = bytearray(n)
+            for _ in range(n):
+                u, min_dist = -1, inf
+                for i in range(n):
+                    if not visitados[i] and distancias[i] < min_dist:
+                        u, min_dist = i, distancias[i]
+                if u == -1: # Nenhum nó alcançável restante
+                    break
+                visitados[u] = 1
+                for k in range(deslocamentos[u], deslocamentos[u + 1]):
+                    v = alvos[k]
+                    if min_dist + pesos[k] < distancias[v]:
+                        distancias[v] = min_dist + pesos[k]
+                        anterior[v] = u
+        return distancias, anterior
+
+    def dijkstra(self, origem_str: str):
+        """
+        Executa o algoritmo de Dijkstra a partir de uma cidade (mesmo contrato das demais estruturas).
+
+        Returns:
+            tuple:
+                dict: Mapeamento de cidades para suas menores distâncias desde a origem.
+                dict: Mapeamento de cada cidade para seu antecessor no caminho mais curto.
+        """
+        idx_origem = self.indice_cidade.get(origem_str)
+        if idx_origem is None:
+            return {c: float('inf') for c in self.cidades}, {c: None for c in self.cidades}
+
+        distancias, anterior = self._dijkstra_indices(idx_origem)
+        cidades = self.cidades
+        return (dict(zip(cidades, distancias)),
+                {cidade: (cidades[a] if a >= 0 else None) for cidade, a in zip(cidades, anterior)})
+
+    def _dijkstra_ate(self, idx_origem: int, idx_destinos: set):
+        """
+        Dijkstra com parada antecipada usado por caminho_mais_curto e dijkstra_multialvo: para
+        assim que todos os destinos saem da fila e guarda distância/antecessor só dos vértices
+        alcançados (dicionários por índice), em vez de alocar os buffers do tamanho do grafo inteiro.
+
+        Returns:
+            tuple (dict, dict): distâncias e antecessores (-1 na origem) dos vértices alcançados.
+        """
+        self._compactar()
+        inf = float('inf')
+        distancias = {idx_origem: 0}
+        anterior = {idx_origem: -1}
+        pendentes = set(idx_destinos)
+        deslocamentos, alvos, pesos = self.deslocamentos, self.alvos, self.pesos
+
+        if self.tipo_fila_dijkstra == 'heap':
+            pq = [(0, idx_origem)]
+            while pq:
+                dist_u, u = heapq.heappop(pq)
+                if dist_u > distancias[u]:
+                    continue
+                if u in pendentes:
+                    pendentes.discard(u)
+                    if not pendentes:
+                        break
+                for k in range(deslocamentos[u], deslocamentos[u + 1]):
+                    v = alvos[k]
+                    nova = dist_u + pesos[k]
+                    if nova < distancias.get(v, inf):
+                        distancias[v] = nova
+                        anterior[v] = u
+                        heapq.heappush(pq, (nova, v))
+        else:
+            abertos = {idx_origem: 0} # Vértices alcançados e ainda não fechados
+            while abertos:
+                u = min(abertos, key=abertos.get)
+                dist_u = abertos.pop(u)
+                if u in pendentes:
+                    pendentes.discard(u)
+                    if not pendentes:
+                        break
+                for k in range(deslocamentos[u], deslocamentos[u + 1]):
+                    v = alvos[k]
+                    nova = dist_u + pesos[k]
+                    if nova < distancias.get(v, inf):
+                        distancias[v] = abertos[v] = nova
+                        anterior[v] = u
+        return distancias, anterior
+
+    def dijkstra_multialvo(self, origem: str, alvos):
+        """
+        Dijkstra a partir da origem, com a fila configurada, interrompido quando todos os alvos
+        alcançáveis têm distância final (mesmo contrato das demais estruturas).
+
+        Returns:
+            tuple:
+                dict: Distâncias das cidades alcançadas (alvo ausente = inalcançável).
+                dict: Antecessor de cada cidade alcançada (None na origem).
+        """
+        idx_origem = self.indice_cidade.get(origem)
+        if idx_origem is None:
+            return {}, {}
+        indice = self.indice_cidade
+        distancias, anterior = self._dijkstra_ate(idx_origem, {indice[alvo] for alvo in alvos if alvo in indice})
+        cidades = self.cidades
+        return ({cidades[i]: d for i, d in distancias.items()},
+                {cidades[i]: (cidades[a] if a >= 0 else None) for i, a in anterior.items()})
+
+    def caminho_mais_curto(self, origem: str, destino: str):
+        """
+        Encontra o caminho mais curto entre duas cidades utilizando Dijkstra, interrompido
+        assim que o destino é fechado.
+
+        Returns:
+            tuple:
+                list: Caminho mais curto como lista de cidades (ou None).
+                float: Distância total do caminho (ou inf).
+        """
+        idx_origem = self.indice_cidade.get(origem)
+        idx_destino = self.indice_cidade.get(destino)
+        if idx_origem is None or idx_destino is None:
+            return None, float('inf')
+
+        if self.bidirecional:
+            self._compactar()
+            caminho, distancia, _ = dijkstra_bidirecional(self._vizinhos_indice, idx_origem, idx_destino)
+            return ([self.cidades[i] for i in caminho] if caminho else None), distancia
+
+        distancias, anterior = self._dijkstra_ate(idx_origem, {idx_destino})
+        if idx_destino not in distancias:
+            return None, float('inf')
+
+        caminho = []
+        atual = idx_destino
+        while atual != -1:
+            caminho.append(self.cidades[atual])
+            if atual == idx_origem:
+                caminho.reverse()
+                return caminho, distancias[idx_destino]
+            atual = anterior[atual]
+        return None, float('inf') # Caminho quebrado
+
+    def memoria_bytes(self) -> int:
+        """ Bytes ocupados pelos buffers do CSR (sem os nomes das cidades). """
+        self._compactar()
+        return sum(buffer.itemsize * len(buffer) for buffer in (self.deslocamentos, self.alvos, self.pesos))
+
+    def __repr__(self):
+        arestas = len(self.alvos) if self._compactado else len(self._destinos)
+        return (f"GrafoCSR com {len(self.cidades)} cidades e {arestas} arestas dirigidas "
+                f"(Fila Dijkstra: {self.tipo_fila_dijkstra})")
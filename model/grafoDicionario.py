@@ -1,12 +1,17 @@
 import heapq
 
+from model.busca_bidirecional import dijkstra_bidirecional
+
 class GrafoDicionario:
-    def __init__(self, tipo_fila_dijkstra='heap'): # Adicionado parâmetro
+    def __init__(self, tipo_fila_dijkstra='heap', bidirecional=False): # Adicionado parâmetro
         """
         Inicializa o grafo usando um dicionário de dicionários.
         self.grafo = {origem: {destino1: peso1, destino2: peso2}, ...}
+
+        Com bidirecional=True, caminho_mais_curto usa o Dijkstra bidirecional (com heap).
         """
         self.grafo = {}
+        self.bidirecional = bidirecional
         self.tipo_fila_dijkstra = tipo_fila_dijkstra.lower()
         if self.tipo_fila_dijkstra not in ['heap', 'lista']:
             raise ValueError("tipo_fila_dijkstra deve ser 'heap' ou 'lista'")
@@ -21,6 +26,9 @@ class GrafoDicionario:
         """ Retorna os vizinhos de um nó e os pesos das arestas. """
         return self.grafo.get(no_atual, {}).items() # Eficiente
 
+    def __contains__(self, no):
+        return no in self.grafo
+
     def obter_nos(self):
         """ Retorna uma lista de todos os nós (cidades) no grafo. """
         return list(self.grafo.keys())
@@ -82,11 +90,76 @@ class GrafoDicionario:
             
         return distancias, anterior
 
+    def _dijkstra_ate(self, origem: str, destinos: set):
+        """
+        Dijkstra com parada antecipada usado por caminho_mais_curto e dijkstra_multialvo: para
+        assim que todos os destinos saem da fila e só cria entradas de distancias/anterior para
+        os vértices alcançados pela busca.
+
+        Returns:
+            tuple:
+                dict: Distâncias dos vértices alcançados (ausente = inalcançado).
+                dict: Antecessor de cada vértice alcançado.
+        """
+        distancias = {origem: 0}
+        anterior = {origem: None}
+        pendentes = set(destinos)
+
+        if self.tipo_fila_dijkstra == 'heap':
+            pq = [(0, origem)]
+            while pq:
+                dist_u, u = heapq.heappop(pq)
+                if dist_u > distancias[u]:
+                    continue
+                if u in pendentes:
+                    pendentes.discard(u)
+                    if not pendentes:
+                        break
+                for vizinho, peso in self.grafo[u].items():
+                    nova = dist_u + peso
+                    if nova < distancias.get(vizinho, float('inf')):
+                        distancias[vizinho] = nova
+                        anterior[vizinho] = u
+                        heapq.heappush(pq, (nova, vizinho))
+        else:
+            abertos = {origem: 0} # Vértices alcançados e ainda não fechados
+            while abertos:
+                u = min(abertos, key=abertos.get)
+                dist_u = abertos.pop(u)
+                if u in pendentes:
+                    pendentes.discard(u)
+                    if not pendentes:
+                        break
+                for vizinho, peso in self.grafo[u].items():
+                    nova = dist_u + peso
+                    if nova < distancias.get(vizinho, float('inf')):
+                        distancias[vizinho] = abertos[vizinho] = nova
+                        anterior[vizinho] = u
+        return distancias, anterior
+
+    def dijkstra_multialvo(self, origem: str, alvos):
+        """
+        Dijkstra a partir da origem, com a fila configurada, interrompido quando todos os alvos
+        alcançáveis têm distância final.
+
+        Returns:
+            tuple:
+                dict: Distâncias dos vértices alcançados (alvo ausente = inalcançável).
+                dict: Antecessor de cada vértice alcançado (None na origem).
+        """
+        if origem not in self:
+            return {}, {}
+        return self._dijkstra_ate(origem, {alvo for alvo in alvos if alvo in self})
+
     def caminho_mais_curto(self, origem: str, destino: str):
         if origem not in self.grafo or destino not in self.grafo: # Verifica se origem e destino existem
             return None, float('inf')
 
-        distancias, anterior = self.dijkstra(origem)
+        if self.bidirecional:
+            caminho, distancia, _ = dijkstra_bidirecional(lambda u: self.grafo[u].items(), origem, destino)
+            return caminho, distancia
+
+        distancias, anterior = self._dijkstra_ate(origem, {destino})
 
         if distancias.get(destino, float('inf')) == float('inf'): # Destino inalcançável
             return None, float('inf')
@@ -1,14 +1,21 @@
 import heapq
 
+from model.busca_bidirecional import dijkstra_bidirecional
+
 class GrafoListaAdjacencia:
     """
     Representa um grafo não direcionado onde os vértices são cidades e as arestas representam estradas com distâncias associadas.
     """
-    def __init__(self, tipo_fila_dijkstra='heap'):
+    def __init__(self, tipo_fila_dijkstra='heap', bidirecional=False):
         """
         Inicializa um grafo vazio com um dicionário de adjacência.
+
+        Args:
+            tipo_fila_dijkstra (str): 'heap' ou 'lista'.
+            bidirecional (bool): se True, caminho_mais_curto usa o Dijkstra bidirecional (com heap).
         """
         self.vertices = {}  # {cidade: [(vizinho, distancia)]}
+        self.bidirecional = bidirecional
         self.tipo_fila_dijkstra = tipo_fila_dijkstra.lower()
         if self.tipo_fila_dijkstra not in ['heap', 'lista']:
             raise ValueError("tipo_fila_dijkstra deve ser 'heap' ou 'lista'")
@@ -34,6 +41,13 @@ class GrafoListaAdjacencia:
         if not any(v == origem for v, d in self.vertices[destino]):
             self.vertices[destino].append((origem, distancia))
 
+    def vizinhos(self, cidade):
+        """ Retorna a lista de tuplas (vizinho, distancia) de uma cidade. """
+        return self.vertices.get(cidade, [])
+
+    def __contains__(self, cidade):
+        return cidade in self.vertices
+
     def dijkstra(self, origem_str: str):
         """
         Executa o algoritmo de Dijkstra para encontrar o menor caminho de uma cidade origem até todas as outras.
@@ -101,6 +115,67 @@ class GrafoListaAdjacencia:
             
         return distancias, anterior
 
+    def _dijkstra_ate(self, origem: str, destinos: set):
+        """
+        Dijkstra com parada antecipada usado por caminho_mais_curto e dijkstra_multialvo: para
+        assim que todos os destinos saem da fila e só cria entradas de distancias/anterior para
+        os vértices alcançados pela busca.
+
+        Returns:
+            tuple:
+                dict: Distâncias dos vértices alcançados (ausente = inalcançado).
+                dict: Antecessor de cada vértice alcançado.
+        """
+        distancias = {origem: 0}
+        anterior = {origem: None}
+        pendentes = set(destinos)
+
+        if self.tipo_fila_dijkstra == 'heap':
+            pq = [(0, origem)]
+            while pq:
+                dist_u, u = heapq.heappop(pq)
+                if dist_u > distancias[u]:
+                    continue
+                if u in pendentes:
+                    pendentes.discard(u)
+                    if not pendentes:
+                        break
+                for vizinho, peso in self.vertices[u]:
+                    nova = dist_u + peso
+                    if nova < distancias.get(vizinho, float('inf')):
+                        distancias[vizinho] = nova
+                        anterior[vizinho] = u
+                        heapq.heappush(pq, (nova, vizinho))
+        else:
+            abertos = {origem: 0} # Vértices alcançados e ainda não fechados
+            while abertos:
+                u = min(abertos, key=abertos.get)
+                dist_u = abertos.pop(u)
+                if u in pendentes:
+                    pendentes.discard(u)
+                    if not pendentes:
+                        break
+                for vizinho, peso in self.vertices[u]:
+                    nova = dist_u + peso
+                    if nova < distancias.get(vizinho, float('inf')):
+                        distancias[vizinho] = abertos[vizinho] = nova
+                        anterior[vizinho] = u
+        return distancias, anterior
+
+    def dijkstra_multialvo(self, origem: str, alvos):
+        """
+        Dijkstra a partir da origem, com a fila configurada, interrompido quando todos os alvos
+        alcançáveis têm distância final.
+
+        Returns:
+            tuple:
+                dict: Distâncias dos vértices alcançados (alvo ausente = inalcançável).
+                dict: Antecessor de cada vértice alcançado (None na origem).
+        """
+        if origem not in self:
+            return {}, {}
+        return self._dijkstra_ate(origem, {alvo for alvo in alvos if alvo in self})
+
     def caminho_mais_curto(self, origem: str, destino: str):
         """
         Encontra o caminho mais curto entre duas cidades utilizando Dijkstra.
@@ -117,7 +192,11 @@ class GrafoListaAdjacencia:
         if origem not in self.vertices or destino not in self.vertices:
             return None, float('inf') # Cidades não existem no grafo
 
-        distancias, anterior = self.dijkstra(origem)
+        if self.bidirecional:
+            caminho, distancia, _ = dijkstra_bidirecional(self.vertices.__getitem__, origem, destino)
+            return caminho, distancia
+
+        distancias, anterior = self._dijkstra_ate(origem, {destino})
 
         if distancias.get(destino, float('inf')) == float('inf'):
             return None, float('inf')
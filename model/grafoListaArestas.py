@@ -8,6 +8,7 @@ class GrafoListaArestas:
         """
         self.arestas = []  # Lista de arestas
         self.nos_do_grafo = None # Cache para os nós
+        self.conjunto_nos = None # Mesmos nós em set, para testes de pertinência em O(1)
         self.tipo_fila_dijkstra = tipo_fila_dijkstra.lower()
         if self.tipo_fila_dijkstra not in ['heap', 'lista']:
             raise ValueError("tipo_fila_dijkstra deve ser 'heap' ou 'lista'")
@@ -17,6 +18,7 @@ class GrafoListaArestas:
         self.arestas.append((origem, destino, peso))
         self.arestas.append((destino, origem, peso))
         self.nos_do_grafo = None # Invalida o cache de nós ao adicionar aresta
+        self.conjunto_nos = None
 
     def _atualizar_nos(self):
         """ Helper interno para obter e armazenar os nós únicos do grafo. """
@@ -25,9 +27,14 @@ class GrafoListaArestas:
             for o, d, _ in self.arestas:
                 nos.add(o)
                 nos.add(d)
+            self.conjunto_nos = nos
             self.nos_do_grafo = list(nos)
         return self.nos_do_grafo
 
+    def __contains__(self, no):
+        self._atualizar_nos()
+        return no in self.conjunto_nos
+
     def vizinhos(self, no_atual):
         """ Retorna os vizinhos de um nó. """
         # Esta operação é O(E) e será o gargalo no Dijkstra para esta estrutura.
@@ -91,8 +98,72 @@ class GrafoListaArestas:
             
         return distancias, anterior
 
+    def _dijkstra_ate(self, origem: str, destinos: set):
+        """
+        Dijkstra com parada antecipada usado por caminho_mais_curto e dijkstra_multialvo: para
+        assim que todos os destinos saem da fila e só cria entradas de distancias/anterior para
+        os vértices alcançados pela busca.
+
+        Returns:
+            tuple:
+                dict: Distâncias dos vértices alcançados (ausente = inalcançado).
+                dict: Antecessor de cada vértice alcançado.
+        """
+        distancias = {origem: 0}
+        anterior = {origem: None}
+        pendentes = set(destinos)
+
+        if self.tipo_fila_dijkstra == 'heap':
+            pq = [(0, origem)]
+            while pq:
+                dist_u, u = heapq.heappop(pq)
+                if dist_u > distancias[u]:
+                    continue
+                if u in pendentes:
+                    pendentes.discard(u)
+                    if not pendentes:
+                        break
+                for vizinho, peso in self.vizinhos(u):
+                    nova = dist_u + peso
+                    if nova < distancias.get(vizinho, float('inf')):
+                        distancias[vizinho] = nova
+                        anterior[vizinho] = u
+                        heapq.heappush(pq, (nova, vizinho))
+        else:
+            abertos = {origem: 0} # Vértices alcançados e ainda não fechados
+            while abertos:
+                u = min(abertos, key=abertos.get)
+                dist_u = abertos.pop(u)
+                if u in pendentes:
+                    pendentes.discard(u)
+                    if not pendentes:
+                        break
+                for vizinho, peso in self.vizinhos(u):
+                    nova = dist_u + peso
+                    if nova < distancias.get(vizinho, float('inf')):
+                        distancias[vizinho] = abertos[vizinho] = nova
+                        anterior[vizinho] = u
+        return distancias, anterior
+
+    def dijkstra_multialvo(self, origem: str, alvos):
+        """
+        Dijkstra a partir da origem, com a fila configurada, interrompido quando todos os alvos
+        alcançáveis têm distância final.
+
+        Returns:
+            tuple:
+                dict: Distâncias dos vértices alcançados (alvo ausente = inalcançável).
+                dict: Antecessor de cada vértice alcançado (None na origem).
+        """
+        if origem not in self:
+            return {}, {}
+        return self._dijkstra_ate(origem, {alvo for alvo in alvos if alvo in self})
+
     def caminho_mais_curto(self, origem: str, destino: str):
-        distancias, anterior = self.dijkstra(origem)
+        if origem not in self:
+            return None, float('inf')
+
+        distancias, anterior = self._dijkstra_ate(origem, {destino})
 
         # Verificar se o destino é alcançável
         if distancias.get(destino, float('inf')) == float('inf'):
@@ -1,8 +1,15 @@
 import heapq
 
+import numpy as np
+
 class GrafoMatrizAdjacencia:
     """
     Representação de um grafo usando uma matriz de adjacência.
+
+    No modo 'numpy' a matriz é um ndarray e o Dijkstra é vetorizado: a cada passo o vértice
+    aberto mais próximo sai de um argmin sobre as distâncias (fechados mascarados com inf)
+    e a linha inteira desse vértice é relaxada numa única operação. Cada passo continua O(n),
+    mas sem laço interpretado, o que compensa em grafos densos com milhares de cidades.
     """
     def __init__(self, cidades, tipo_fila_dijkstra='lista'):
         """
@@ -10,18 +17,23 @@ class GrafoMatrizAdjacencia:
 
         Args:
             cidades (List[str]): Lista de cidades que formam os vértices do grafo.
+            tipo_fila_dijkstra (str): 'heap', 'lista' ou 'numpy' (matriz ndarray, Dijkstra vetorizado).
         """
+        self.tipo_fila_dijkstra = tipo_fila_dijkstra.lower()
+        if self.tipo_fila_dijkstra not in ['heap', 'lista', 'numpy']:
+            raise ValueError("tipo_fila_dijkstra deve ser 'heap', 'lista' ou 'numpy'")
+
         self.cidades = list(set(cidades)) # Garante cidades únicas e cria uma cópia
         self.n = len(self.cidades)
         self.map_cidade_para_idx = {cidade: i for i, cidade in enumerate(self.cidades)}
         
-        self.matriz = [[float('inf')] * self.n for _ in range(self.n)]
-        for i in range(self.n):
-            self.matriz[i][i] = 0
-        
-        self.tipo_fila_dijkstra = tipo_fila_dijkstra.lower()
-        if self.tipo_fila_dijkstra not in ['heap', 'lista']:
-            raise ValueError("tipo_fila_dijkstra deve ser 'heap' ou 'lista'")
+        if self.tipo_fila_dijkstra == 'numpy':
+            self.matriz = np.full((self.n, self.n), np.inf)
+            np.fill_diagonal(self.matriz, 0)
+        else:
+            self.matriz = [[float('inf')] * self.n for _ in range(self.n)]
+            for i in range(self.n):
+                self.matriz[i][i] = 0
 
     def adicionar_aresta(self, cidade1_str: str, cidade2_str: str, distancia: float):
         """
@@ -39,6 +51,20 @@ class GrafoMatrizAdjacencia:
             self.matriz[idx1][idx2] = distancia
             self.matriz[idx2][idx1] = distancia
 
+    def vizinhos(self, cidade_str: str):
+        """ Retorna os vizinhos de uma cidade como lista de tuplas (cidade_vizinha, distancia). O(n). """
+        idx = self.map_cidade_para_idx.get(cidade_str)
+        if idx is None:
+            return []
+        linha = self.matriz[idx]
+        if self.tipo_fila_dijkstra == 'numpy':
+            indices = np.flatnonzero(linha != np.inf)
+            return [(self.cidades[j], peso) for j, peso in zip(indices.tolist(), linha[indices].tolist()) if j != idx]
+        return [(self.cidades[j], linha[j]) for j in range(self.n) if j != idx and linha[j] != float('inf')]
+
+    def __contains__(self, cidade_str):
+        return cidade_str in self.map_cidade_para_idx
+
     def dijkstra(self, origem_str: int):
         idx_origem = self.map_cidade_para_idx.get(origem_str)
         if idx_origem is None:
@@ -47,6 +73,12 @@ class GrafoMatrizAdjacencia:
             ant_vazios_map = {c: None for c in self.cidades}
             return dist_vazias_map, ant_vazios_map
 
+        if self.tipo_fila_dijkstra == 'numpy':
+            dist, prev = self._dijkstra_numpy(idx_origem)
+            dist, prev = dist.tolist(), prev.tolist()
+            return ({self.cidades[i]: dist[i] for i in range(self.n)},
+                    {self.cidades[i]: (self.cidades[prev[i]] if prev[i] >= 0 else None) for i in range(self.n)})
+
         dist = [float('inf')] * self.n
         prev = [None] * self.n # Armazena índices dos predecessores
         dist[idx_origem] = 0
@@ -107,10 +139,119 @@ class GrafoMatrizAdjacencia:
             for i in range(self.n)
         }
         return dist_final_map, ant_final_map
+
+    def _dijkstra_numpy(self, idx_origem: int, idx_destinos=()):
+        """
+        Dijkstra vetorizado sobre a matriz ndarray. Escolhe o vértice como o modo 'lista'
+        (menor distância, empate pelo menor índice), então os resultados coincidem.
+
+        Args:
+            idx_origem (int): índice da cidade de origem.
+            idx_destinos (set): se informado, a busca para assim que todos esses vértices são fechados.
+
+        Returns:
+            tuple (ndarray, ndarray): distâncias e predecessores por índice (-1 se nenhum).
+        """
+        dist = np.full(self.n, np.inf)
+        prev = np.full(self.n, -1, dtype=np.int64)
+        abertos = np.full(self.n, np.inf) # Distâncias dos vértices ainda não fechados (fechados = inf)
+        dist[idx_origem] = abertos[idx_origem] = 0
+        pendentes = set(idx_destinos)
+
+        for _ in range(self.n):
+            u_idx = int(abertos.argmin())
+            if abertos[u_idx] == np.inf: # Nenhum nó alcançável restante
+                break
+            abertos[u_idx] = np.inf
+            if u_idx in pendentes:
+                pendentes.discard(u_idx)
+                if not pendentes:
+                    break
+
+            candidatas = self.matriz[u_idx] + dist[u_idx]
+            melhora = candidatas < dist
+            dist[melhora] = abertos[melhora] = candidatas[melhora]
+            prev[melhora] = u_idx
+
+        return dist, prev
     
+    def _dijkstra_ate(self, idx_origem: int, idx_destinos: set):
+        """
+        Dijkstra com parada antecipada dos modos 'heap' e 'lista': para assim que todos os
+        destinos são fechados e só guarda distância/antecessor dos vértices alcançados
+        (dicionários por índice).
+
+        Returns:
+            tuple (dict, dict): distâncias e antecessores (-1 na origem) dos vértices alcançados.
+        """
+        dist = {idx_origem: 0}
+        prev = {idx_origem: -1}
+        pendentes = set(idx_destinos)
+
+        if self.tipo_fila_dijkstra == 'heap':
+            pq = [(0, idx_origem)]
+            while pq:
+                d, u_idx = heapq.heappop(pq)
+                if d > dist[u_idx]:
+                    continue
+                if u_idx in pendentes:
+                    pendentes.discard(u_idx)
+                    if not pendentes:
+                        break
+                linha = self.matriz[u_idx]
+                for v_idx in range(self.n):
+                    peso_aresta = linha[v_idx]
+                    if peso_aresta != float('inf') and d + peso_aresta < dist.get(v_idx, float('inf')):
+                        dist[v_idx] = d + peso_aresta
+                        prev[v_idx] = u_idx
+                        heapq.heappush(pq, (dist[v_idx], v_idx))
+        else:
+            abertos = {idx_origem: 0} # Vértices alcançados e ainda não fechados
+            while abertos:
+                u_idx = min(abertos, key=abertos.get)
+                d = abertos.pop(u_idx)
+                if u_idx in pendentes:
+                    pendentes.discard(u_idx)
+                    if not pendentes:
+                        break
+                linha = self.matriz[u_idx]
+                for v_idx in range(self.n):
+                    peso_aresta = linha[v_idx]
+                    if peso_aresta != float('inf') and d + peso_aresta < dist.get(v_idx, float('inf')):
+                        dist[v_idx] = abertos[v_idx] = d + peso_aresta
+                        prev[v_idx] = u_idx
+        return dist, prev
+
+    def dijkstra_multialvo(self, origem_str: str, alvos):
+        """
+        Dijkstra a partir da origem, no modo configurado, interrompido quando todos os alvos
+        alcançáveis têm distância final (mesmo contrato das demais estruturas).
+
+        Returns:
+            tuple:
+                dict: Distâncias das cidades alcançadas (alvo ausente = inalcançável).
+                dict: Antecessor de cada cidade alcançada (None na origem).
+        """
+        idx_origem = self.map_cidade_para_idx.get(origem_str)
+        if idx_origem is None:
+            return {}, {}
+        idx_alvos = {self.map_cidade_para_idx[alvo] for alvo in alvos if alvo in self.map_cidade_para_idx}
+
+        if self.tipo_fila_dijkstra == 'numpy':
+            dist, prev = self._dijkstra_numpy(idx_origem, idx_alvos)
+            alcancados = np.flatnonzero(dist != np.inf).tolist()
+            dist = dict(zip(alcancados, dist[alcancados].tolist()))
+            prev = dict(zip(alcancados, prev[alcancados].tolist()))
+        else:
+            dist, prev = self._dijkstra_ate(idx_origem, idx_alvos)
+        cidades = self.cidades
+        return ({cidades[i]: d for i, d in dist.items()},
+                {cidades[i]: (cidades[p] if p >= 0 else None) for i, p in prev.items()})
+
     def caminho_mais_curto(self, origem_str: str, destino_str: str):
         """
-        Retorna o caminho mais curto e o tempo estimado usando o algoritmo de Dijkstra.
+        Retorna o caminho mais curto e o tempo estimado usando o algoritmo de Dijkstra,
+        interrompido assim que o destino é fechado.
 
         Args:
             origem (str): Nome da cidade de origem.
@@ -119,36 +260,34 @@ class GrafoMatrizAdjacencia:
         Returns:
             tuple (List[str], float): O caminho e o tempo estimado.
         """
-        if origem_str not in self.map_cidade_para_idx or destino_str not in self.map_cidade_para_idx:
+        idx_origem = self.map_cidade_para_idx.get(origem_str)
+        idx_destino = self.map_cidade_para_idx.get(destino_str)
+        if idx_origem is None or idx_destino is None:
             return None, float('inf')
 
-        distancias_map, anterior_map = self.dijkstra(origem_str)
-
-        dist_destino = distancias_map.get(destino_str, float('inf'))
+        if self.tipo_fila_dijkstra == 'numpy':
+            dist, prev = self._dijkstra_numpy(idx_origem, {idx_destino})
+            dist_destino = float(dist[idx_destino])
+        else:
+            dist, prev = self._dijkstra_ate(idx_origem, {idx_destino})
+            dist_destino = dist.get(idx_destino, float('inf'))
         if dist_destino == float('inf'):
             return None, float('inf')
 
-        caminho = []
-        atual_str = destino_str
-        # Loop de segurança para evitar ciclos infinitos se 'anterior_map' estiver malformado
-        for _ in range(self.n + 1): 
-            if atual_str is None: # Chegou ao fim da cadeia de predecessores sem encontrar a origem
-                # Isso não deveria acontecer se dist_destino não for inf e origem != destino
-                # A menos que a origem não seja um nó válido no 'anterior_map' do dijkstra.
-                return None, float('inf') # Caminho quebrado
-            
-            caminho.insert(0, atual_str)
-            if atual_str == origem_str:
+        caminho_idx = [idx_destino]
+        atual = idx_destino
+        # Loop de segurança para evitar ciclos infinitos se 'prev' estiver malformado
+        for _ in range(self.n):
+            if atual == idx_origem:
                 break # Caminho encontrado
-            atual_str = anterior_map.get(atual_str)
-        else: # Se o loop for..else for completado sem break (caminho muito longo ou ciclo)
+            atual = int(prev[atual])
+            if atual < 0: # Cadeia de predecessores quebrada
+                return None, float('inf')
+            caminho_idx.append(atual)
+        else:
             return None, float('inf') # Caminho não encontrado ou inválido
 
-        if not caminho or caminho[0] != origem_str:
-            # Redundante se o loop acima funcionou, mas como segurança
-            return None, float('inf') 
-            
-        return caminho, dist_destino
+        return [self.cidades[i] for i in reversed(caminho_idx)], dist_destino
 
     def __repr__(self):
         return f"GrafoMatrizAdjacencia com {self.n} cidades (Fila Dijkstra: {self.tipo_fila_dijkstra})"
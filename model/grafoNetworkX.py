@@ -19,6 +19,39 @@ class GrafoNetworkX:
         """
         self.grafo.add_edge(origem, destino, weight=distancia)
 
+    def vizinhos(self, no: str):
+        """ Retorna os vizinhos de um nó como lista de tuplas (vizinho, peso). """
+        if no not in self.grafo:
+            return []
+        return [(vizinho, dados['weight']) for vizinho, dados in self.grafo[no].items()]
+
+    def __contains__(self, no):
+        return no in self.grafo
+
+    def dijkstra(self, origem: str):
+        """
+        Executa o Dijkstra do NetworkX a partir de uma origem, devolvendo o mesmo
+        formato (distancias, anterior) das demais implementações de grafo.
+        """
+        distancias = {no: float('inf') for no in self.grafo.nodes}
+        anterior = {no: None for no in self.grafo.nodes}
+        if origem not in self.grafo:
+            return distancias, anterior
+
+        dist_nx, caminhos_nx = nx.single_source_dijkstra(self.grafo, source=origem, weight='weight')
+        for no, dist in dist_nx.items():
+            distancias[no] = dist
+            caminho = caminhos_nx[no]
+            anterior[no] = caminho[-2] if len(caminho) > 1 else None
+        return distancias, anterior
+
+    def dijkstra_multialvo(self, origem: str, alvos):
+        """
+        Mesmo contrato de dijkstra_multialvo das demais estruturas. O NetworkX não tem parada
+        por conjunto de alvos, então a árvore completa de single_source_dijkstra é devolvida.
+        """
+        return self.dijkstra(origem)
+
     def caminho_mais_curto(self, origem: str, destino: str):
         """
         Encontra o caminho mais curto e a distância usando as funções do NetworkX.
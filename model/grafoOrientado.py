@@ -1,5 +1,7 @@
 import heapq
 
+from model.busca_bidirecional import dijkstra_bidirecional
+
 class Aresta:
     def __init__(self, destino_nome: str, peso: float):
         self.destino_nome = destino_nome
@@ -23,8 +25,9 @@ class Vertice:
 
 
 class GrafoOrientado: # Vamos chamá-la de GrafoComObjetos para o teste
-    def __init__(self, tipo_fila_dijkstra='heap'): # Adicionado parâmetro
+    def __init__(self, tipo_fila_dijkstra='heap', bidirecional=False): # Adicionado parâmetro
         self.vertices = {}  # Mapeia nome_cidade para objeto Vertice
+        self.bidirecional = bidirecional # caminho_mais_curto com Dijkstra bidirecional (heap)
         self.tipo_fila_dijkstra = tipo_fila_dijkstra.lower()
         if self.tipo_fila_dijkstra not in ['heap', 'lista']:
             raise ValueError("tipo_fila_dijkstra deve ser 'heap' ou 'lista'")
@@ -52,6 +55,9 @@ class GrafoOrientado: # Vamos chamá-la de GrafoComObjetos para o teste
             return [(aresta.destino_nome, aresta.peso) for aresta in vertice_atual_obj.arestas]
         return []
 
+    def __contains__(self, nome_no: str):
+        return nome_no in self.vertices
+
     def obter_nomes_dos_nos(self) -> list: # Renomeado para clareza
         return list(self.vertices.keys())
 
@@ -109,11 +115,76 @@ class GrafoOrientado: # Vamos chamá-la de GrafoComObjetos para o teste
             
         return distancias, anterior
 
+    def _dijkstra_ate(self, origem: str, destinos: set):
+        """
+        Dijkstra com parada antecipada usado por caminho_mais_curto e dijkstra_multialvo: para
+        assim que todos os destinos saem da fila e só cria entradas de distancias/anterior para
+        os vértices alcançados pela busca.
+
+        Returns:
+            tuple:
+                dict: Distâncias dos vértices alcançados (ausente = inalcançado).
+                dict: Antecessor de cada vértice alcançado.
+        """
+        distancias = {origem: 0}
+        anterior = {origem: None}
+        pendentes = set(destinos)
+
+        if self.tipo_fila_dijkstra == 'heap':
+            pq = [(0, origem)]
+            while pq:
+                dist_u, u = heapq.heappop(pq)
+                if dist_u > distancias[u]:
+                    continue
+                if u in pendentes:
+                    pendentes.discard(u)
+                    if not pendentes:
+                        break
+                for vizinho, peso in ((aresta.destino_nome, aresta.peso) for aresta in self.vertices[u].arestas):
+                    nova = dist_u + peso
+                    if nova < distancias.get(vizinho, float('inf')):
+                        distancias[vizinho] = nova
+                        anterior[vizinho] = u
+                        heapq.heappush(pq, (nova, vizinho))
+        else:
+            abertos = {origem: 0} # Vértices alcançados e ainda não fechados
+            while abertos:
+                u = min(abertos, key=abertos.get)
+                dist_u = abertos.pop(u)
+                if u in pendentes:
+                    pendentes.discard(u)
+                    if not pendentes:
+                        break
+                for vizinho, peso in ((aresta.destino_nome, aresta.peso) for aresta in self.vertices[u].arestas):
+                    nova = dist_u + peso
+                    if nova < distancias.get(vizinho, float('inf')):
+                        distancias[vizinho] = abertos[vizinho] = nova
+                        anterior[vizinho] = u
+        return distancias, anterior
+
+    def dijkstra_multialvo(self, origem: str, alvos):
+        """
+        Dijkstra a partir da origem, com a fila configurada, interrompido quando todos os alvos
+        alcançáveis têm distância final.
+
+        Returns:
+            tuple:
+                dict: Distâncias dos vértices alcançados (alvo ausente = inalcançável).
+                dict: Antecessor de cada vértice alcançado (None na origem).
+        """
+        if origem not in self:
+            return {}, {}
+        return self._dijkstra_ate(origem, {alvo for alvo in alvos if alvo in self})
+
     def caminho_mais_curto(self, origem_str: str, destino_str: str):
         if origem_str not in self.vertices or destino_str not in self.vertices:
             return None, float('inf')
 
-        distancias, anterior = self.dijkstra(origem_str)
+        if self.bidirecional:
+            caminho, distancia, _ = dijkstra_bidirecional(self.vizinhos, origem_str, destino_str)
+            return caminho, distancia
+
+        distancias, anterior = self._dijkstra_ate(origem_str, {destino_str})
 
         if distancias.get(destino_str, float('inf')) == float('inf'):
             return None, float('inf')
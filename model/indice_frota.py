@@ -0,0 +1,174 @@
+import bisect
+
+
+class _GrupoOrigem:
+    """
+    Caminhões de uma cidade de origem numa lista ordenada em baldes (estilo SortedList):
+    cada balde guarda no máximo 2 * CARGA chaves (capacidade_disponivel, ordem) ordenadas,
+    com os caminhões em lista paralela. Inserir ou remover faz duas buscas binárias e
+    desloca só o balde (O(log n + CARGA)), em vez da lista inteira da origem.
+
+    Cada balde também guarda o maior horas_operacao_maximas_dia dos seus caminhões, para
+    que a consulta descarte por horas um balde inteiro sem visitar os caminhões.
+    """
+    CARGA = 128
+
+    def __init__(self):
+        self.chaves = []    # Baldes de chaves ordenadas
+        self.caminhoes = [] # Baldes de caminhões, paralelos a self.chaves
+        self.maximos = []   # Última (maior) chave de cada balde
+        self.horas = []     # Maior horas_operacao_maximas_dia de cada balde
+        self.tamanho = 0
+
+    def inserir(self, chave: tuple, caminhao):
+        self.tamanho += 1
+        if not self.chaves:
+            self.chaves.append([chave])
+            self.caminhoes.append([caminhao])
+            self.maximos.append(chave)
+            self.horas.append(caminhao.horas_operacao_maximas_dia)
+            return
+        b = min(bisect.bisect_left(self.maximos, chave), len(self.chaves) - 1)
+        chaves, caminhoes = self.chaves[b], self.caminhoes[b]
+        posicao = bisect.bisect_left(chaves, chave)
+        chaves.insert(posicao, chave)
+        caminhoes.insert(posicao, caminhao)
+        self.maximos[b] = chaves[-1]
+        self.horas[b] = max(self.horas[b], caminhao.horas_operacao_maximas_dia)
+        if len(chaves) > 2 * self.CARGA:
+            self._dividir(b)
+
+    def _dividir(self, b: int):
+        """ Parte o balde b ao meio (os baldes seguintes andam uma posição: O(n / CARGA)). """
+        chaves, caminhoes = self.chaves[b], self.caminhoes[b]
+        meio = len(chaves) // 2
+        self.chaves[b:b + 1] = [chaves[:meio], chaves[meio:]]
+        self.caminhoes[b:b + 1] = [caminhoes[:meio], caminhoes[meio:]]
+        self.maximos[b:b + 1] = [chaves[meio - 1], chaves[-1]]
+        self.horas[b:b + 1] = [max(c.horas_operacao_maximas_dia for c in caminhoes[:meio]),
+                               max(c.horas_operacao_maximas_dia for c in caminhoes[meio:])]
+
+    def remover(self, chave: tuple):
+        b = bisect.bisect_left(self.maximos, chave)
+        chaves, caminhoes = self.chaves[b], self.caminhoes[b]
+        posicao = bisect.bisect_left(chaves, chave)
+        del chaves[posicao]
+        caminhao = caminhoes.pop(posicao)
+        self.tamanho -= 1
+        if not chaves:
+            del self.chaves[b], self.caminhoes[b], self.maximos[b], self.horas[b]
+            return
+        self.maximos[b] = chaves[-1]
+        if caminhao.horas_operacao_maximas_dia == self.horas[b]: # Pode ter saído o maior
+            self.horas[b] = max(c.horas_operacao_maximas_dia for c in caminhoes)
+
+    def corte(self, chave: tuple):
+        """
+        Primeira posição com chave >= chave.
+
+        Returns:
+            tuple: (balde, posição no balde, quantos caminhões ficam antes do corte).
+        """
+        b = bisect.bisect_left(self.maximos, chave)
+        if b == len(self.chaves):
+            return b, 0, self.tamanho
+        posicao = bisect.bisect_left(self.chaves[b], chave)
+        return b, posicao, sum(map(len, self.chaves[:b])) + posicao
+
+
+class IndiceFrota:
+    """
+    Índice da frota agrupado pela cidade de origem dos caminhões e ordenado pela
+    capacidade disponível (kg) dentro de cada grupo.
+
+    A consulta "caminhões que ainda levam W kg" é uma busca binária: os caminhões sem
+    capacidade ficam antes do ponto de corte e nem são visitados. Depois de cada alocação
+    o caminhão é reposicionado com atualizar(), que só desloca um balde de até
+    2 * _GrupoOrigem.CARGA caminhões (O(log n + CARGA)).
+
+    As horas máximas de cada caminhão são fixas; o filtro de horas descarta baldes inteiros
+    pelo maior valor do balde e só compara caminhão a caminhão nos baldes restantes.
+    """
+
+    def __init__(self, centros):
+        """
+        Monta o índice a partir dos caminhões de todos os centros.
+
+        Args:
+            centros (List[CentroDistribuicao]): centros com suas frotas já cadastradas.
+        """
+        self.grupos = {}      # {cidade_origem: _GrupoOrigem}
+        self.chave_atual = {} # {Caminhao: (cidade_origem, chave)}
+        self.total_caminhoes = 0
+        self.sem_origem = 0   # Caminhões sem centro_origem.cidade (não entram no índice)
+
+        for centro in centros:
+            for caminhao in centro.caminhoes:
+                ordem = self.total_caminhoes # Posição na frota original: desempate determinístico
+                self.total_caminhoes += 1
+                if not hasattr(caminhao, 'centro_origem') or not hasattr(caminhao.centro_origem, 'cidade'):
+                    self.sem_origem += 1
+                    continue
+                self._inserir(caminhao, caminhao.centro_origem.cidade, (caminhao.capacidade_kg_disponivel, ordem))
+
+    def _inserir(self, caminhao, origem: str, chave: tuple):
+        grupo = self.grupos.get(origem)
+        if grupo is None:
+            grupo = self.grupos[origem] = _GrupoOrigem()
+        grupo.inserir(chave, caminhao)
+        self.chave_atual[caminhao] = (origem, chave)
+
+    def atualizar(self, caminhao):
+        """ Reposiciona o caminhão após mudança na carga (ex.: nova entrega alocada). """
+        if caminhao not in self.chave_atual:
+            return
+        origem, chave = self.chave_atual[caminhao]
+        self.grupos[origem].remover(chave)
+        self._inserir(caminhao, origem, (caminhao.capacidade_kg_disponivel, chave[1]))
+
+    def candidatos(self, peso_minimo: float, tempo_minimo_por_origem=None, prazo: float = float('inf')):
+        """
+        Retorna os caminhões com capacidade disponível >= peso_minimo e cujo tempo mínimo
+        de viagem até o destino cabe no prazo da entrega e nas horas do caminhão.
+
+        Args:
+            peso_minimo (float): peso da entrega a alocar.
+            tempo_minimo_por_origem (callable): cidade_origem -> tempo mínimo de qualquer rota
+                que passe pelo destino (ex.: distância direta). None = sem filtro de tempo.
+            prazo (float): prazo da entrega.
+
+        Returns:
+            tuple:
+                list[Caminhao]: candidatos na ordem original da frota.
+                dict: quantos caminhões foram descartados por capacidade, prazo e horas.
+        """
+        selecionados = []
+        descartes = {"capacidade": 0, "prazo": 0, "horas": 0}
+        for origem, grupo in self.grupos.items():
+            balde_corte, posicao_corte, sem_capacidade = grupo.corte((peso_minimo, -1))
+            descartes["capacidade"] += sem_capacidade
+            if sem_capacidade == grupo.tamanho:
+                continue
+
+            tempo_minimo = tempo_minimo_por_origem(origem) if tempo_minimo_por_origem else 0
+            if tempo_minimo > prazo: # Nenhum caminhão desta origem chega a tempo
+                descartes["prazo"] += grupo.tamanho - sem_capacidade
+                continue
+            for b in range(balde_corte, len(grupo.chaves)):
+                inicio = posicao_corte if b == balde_corte else 0
+                chaves, caminhoes = grupo.chaves[b], grupo.caminhoes[b]
+                if grupo.horas[b] < tempo_minimo: # Nenhum caminhão do balde tem horas suficientes
+                    descartes["horas"] += len(chaves) - inicio
+                    continue
+                for i in range(inicio, len(chaves)):
+                    caminhao = caminhoes[i]
+                    if caminhao.horas_operacao_maximas_dia >= tempo_minimo:
+                        selecionados.append((chaves[i][1], caminhao))
+                    else:
+                        descartes["horas"] += 1
+
+        selecionados.sort(key=lambda item: item[0])
+        return [caminhao for _, caminhao in selecionados], descartes
+
+    def __repr__(self):
+        return f"IndiceFrota com {self.total_caminhoes} caminhões em {len(self.grupos)} origens"
@@ -0,0 +1,198 @@
+class LinhaTempoRota:
+    """
+    Linha do tempo de uma rota planejada.
+
+    Guarda as paradas na ordem de visita, o tempo acumulado de chegada em cada uma, o
+    prazo mais apertado entre as entregas da parada e a folga mínima (prazo - chegada)
+    de cada parada até o fim da rota. Com isso, verificar se uma inserção cumpre todos
+    os prazos é uma comparação O(1), sem refazer a rota nem consultar o grafo.
+
+    Se a rota volta ao centro, `tempo_retorno` guarda o trecho da última parada até a
+    origem e entra em tempo_total. Os métodos que mudam a última parada recebem
+    `retorno` (cidade -> tempo de volta à origem), normalmente uma consulta à
+    TabelaRetornoCentros; sem ele, a rota termina na última entrega.
+    """
+
+    def __init__(self, origem: str, paradas: list = None, chegadas: list = None, prazos: list = None,
+                 tempo_retorno: float = 0):
+        """
+        Inicializa a linha do tempo.
+
+        Args:
+            origem (str): cidade de partida (centro de distribuição do caminhão).
+            paradas (list[str]): cidades de entrega na ordem de visita.
+            chegadas (list[float]): tempo acumulado de chegada em cada parada.
+            prazos (list[float]): prazo mais apertado de cada parada (inf = sem prazo).
+            tempo_retorno (float): tempo da última parada de volta à origem (0 = rota aberta).
+        """
+        self.origem = origem
+        self.paradas = list(paradas or [])
+        self.chegadas = list(chegadas or [])
+        self.prazos = list(prazos or [float('inf')] * len(self.paradas))
+        self.tempo_retorno = tempo_retorno if self.paradas else 0
+        self.folga_sufixo = [] # folga_sufixo[i] = menor (prazo - chegada) entre as paradas i..fim
+        self._recalcular_folgas(len(self.paradas) - 1)
+
+    @classmethod
+    def a_partir_de_paradas(cls, origem: str, paradas: list, prazos: list, distancia, retorno=None):
+        """
+        Monta a linha do tempo somando os trechos entre paradas consecutivas.
+
+        Args:
+            distancia (callable): distancia(a, b) -> menor distância entre duas cidades.
+            retorno (callable): cidade -> tempo de volta à origem (None = rota aberta).
+        """
+        chegadas = []
+        tempo = 0
+        anterior = origem
+        for parada in paradas:
+            tempo += distancia(anterior, parada)
+            chegadas.append(tempo)
+            anterior = parada
+        tempo_retorno = retorno(paradas[-1]) if retorno is not None and paradas else 0
+        return cls(origem, paradas, chegadas, prazos, tempo_retorno)
+
+    @property
+    def tempo_total(self) -> float:
+        """ Tempo de chegada na última parada mais o retorno à origem (se a rota volta ao centro). """
+        return self.chegadas[-1] + self.tempo_retorno if self.chegadas else 0
+
+    def _recalcular_folgas(self, a_partir_de: int):
+        """ Recalcula folga_sufixo das posições a_partir_de..0, supondo corretas as posteriores. """
+        m = len(self.paradas)
+        if len(self.folga_sufixo) != m + 1:
+            self.folga_sufixo = [float('inf')] * (m + 1)
+            a_partir_de = m - 1
+        for i in range(a_partir_de, -1, -1):
+            self.folga_sufixo[i] = min(self.prazos[i] - self.chegadas[i], self.folga_sufixo[i + 1])
+
+    def prazos_atendidos(self) -> bool:
+        """ True se todas as paradas são alcançadas dentro do prazo. O(1). """
+        return self.folga_sufixo[0] >= 0 if self.paradas else True
+
+    def avaliar_insercao(self, posicao: int, nova_parada: str, distancia, retorno=None):
+        """
+        Calcula o efeito de inserir `nova_parada` antes da parada `posicao`.
+
+        Returns:
+            tuple:
+                float: acréscimo no tempo de todas as paradas a partir de `posicao` (delta);
+                    no fim da rota, o acréscimo no tempo total (com a troca do retorno).
+                float: tempo de chegada na nova parada.
+        """
+        anterior = self.origem if posicao == 0 else self.paradas[posicao - 1]
+        tempo_anterior = 0 if posicao == 0 else self.chegadas[posicao - 1]
+        ate_nova = distancia(anterior, nova_parada)
+        if posicao < len(self.paradas):
+            trecho_original = self.chegadas[posicao] - tempo_anterior
+            delta = ate_nova + distancia(nova_parada, self.paradas[posicao]) - trecho_original
+        else:
+            volta = retorno(nova_parada) if retorno is not None else 0
+            delta = ate_nova + volta - self.tempo_retorno
+        return delta, tempo_anterior + ate_nova
+
+    def motivo_inviabilidade(self, posicao: int, delta: float, chegada_nova: float,
+                             prazo_nova: float, limite_total: float = float('inf')):
+        """
+        Verifica em O(1) se uma inserção avaliada cumpre todas as restrições.
+
+        Returns:
+            str: 'inalcancavel', 'prazo_nova_violado', 'prazo_outras_violado' ou
+            'horas_excedidas'; None se a inserção for viável.
+        """
+        if delta == float('inf'):
+            return "inalcancavel"
+        if chegada_nova > prazo_nova:
+            return "prazo_nova_violado"
+        if delta > self.folga_sufixo[posicao]:
+            return "prazo_outras_violado"
+        if self.tempo_total + delta > limite_total:
+            return "horas_excedidas"
+        return None
+
+    def melhor_insercao(self, nova_parada: str, prazo_nova: float, distancia, limite_total: float = float('inf'),
+                        retorno=None):
+        """
+        Posição de menor acréscimo de tempo que cumpre todos os prazos e o limite de horas.
+        Se a cidade já é parada, a entrega vai junto (delta 0) desde que chegue no prazo.
+
+        Returns:
+            tuple:
+                int: posição de inserção (None se nenhuma for viável).
+                float: tempo total da rota após a inserção (inf se inviável).
+                dict: posições testadas e quais restrições impediram as demais posições.
+        """
+        motivos = {
+            "posicoes_testadas": 0,
+            "prazo_nova_violado": False,
+            "prazo_outras_violado": False,
+            "horas_excedidas": False,
+            "inalcancavel": False,
+        }
+
+        if nova_parada in self.paradas:
+            motivos["posicoes_testadas"] = 1
+            posicao = self.paradas.index(nova_parada)
+            if self.chegadas[posicao] > prazo_nova:
+                motivos["prazo_nova_violado"] = True
+                return None, float('inf'), motivos
+            return posicao, self.tempo_total, motivos
+
+        melhor_posicao, melhor_delta = None, float('inf')
+        for posicao in range(len(self.paradas) + 1):
+            motivos["posicoes_testadas"] += 1
+            delta, chegada_nova = self.avaliar_insercao(posicao, nova_parada, distancia, retorno)
+            motivo = self.motivo_inviabilidade(posicao, delta, chegada_nova, prazo_nova, limite_total)
+            if motivo is not None:
+                motivos[motivo] = True
+            elif delta < melhor_delta:
+                melhor_posicao, melhor_delta = posicao, delta
+
+        if melhor_posicao is None:
+            return None, float('inf'), motivos
+        return melhor_posicao, self.tempo_total + melhor_delta, motivos
+
+    def inserir(self, posicao: int, nova_parada: str, prazo_nova: float, distancia, retorno=None):
+        """
+        Insere a parada (ou registra o prazo, se a cidade já for parada) atualizando
+        chegadas e folgas de forma incremental, sem consultar o grafo além dos dois trechos novos.
+        """
+        if nova_parada in self.paradas:
+            idx = self.paradas.index(nova_parada)
+            self.prazos[idx] = min(self.prazos[idx], prazo_nova)
+            self._recalcular_folgas(idx)
+            return
+
+        delta, chegada_nova = self.avaliar_insercao(posicao, nova_parada, distancia, retorno)
+        if posicao == len(self.paradas): # Nova última parada: o retorno passa a sair dela
+            self.tempo_retorno = retorno(nova_parada) if retorno is not None else 0
+        self.paradas.insert(posicao, nova_parada)
+        self.chegadas.insert(posicao, chegada_nova)
+        self.prazos.insert(posicao, prazo_nova)
+        for i in range(posicao + 1, len(self.chegadas)):
+            self.chegadas[i] += delta
+        # As folgas depois da nova parada caem todas do mesmo delta; as anteriores são recalculadas
+        self.folga_sufixo = (self.folga_sufixo[:posicao + 1]
+                             + [folga - delta for folga in self.folga_sufixo[posicao:-1]]
+                             + [float('inf')])
+        self._recalcular_folgas(posicao)
+
+    def copiar(self) -> 'LinhaTempoRota':
+        copia = LinhaTempoRota(self.origem)
+        copia.paradas = list(self.paradas)
+        copia.chegadas = list(self.chegadas)
+        copia.prazos = list(self.prazos)
+        copia.folga_sufixo = list(self.folga_sufixo)
+        copia.tempo_retorno = self.tempo_retorno
+        return copia
+
+    def com_insercao(self, posicao: int, nova_parada: str, prazo_nova: float, distancia,
+                     retorno=None) -> 'LinhaTempoRota':
+        """ Retorna uma cópia com a inserção aplicada (a linha do tempo original não muda). """
+        copia = self.copiar()
+        copia.inserir(posicao, nova_parada, prazo_nova, distancia, retorno)
+        return copia
+
+    def __repr__(self):
+        return (f"LinhaTempoRota {self.origem} → {' → '.join(self.paradas) or '(sem paradas)'} | "
+                f"Tempo: {self.tempo_total:.2f}h | Folga mínima: {self.folga_sufixo[0] if self.paradas else float('inf'):.2f}h")
@@ -0,0 +1,172 @@
+import heapq
+import sys
+from array import array
+
+
+class MarcosALT:
+    """
+    Busca A* com limites inferiores por marcos (ALT: A*, landmarks, triangle inequality).
+
+    No pré-processamento são escolhidos K vértices-marco, espalhados pelo mapa (cada novo
+    marco é o vértice mais distante dos já escolhidos), e guardada a distância exata de cada
+    marco a todos os vértices, com um Dijkstra por marco. Como os grafos do projeto são não
+    direcionados, pela desigualdade triangular |d(L, t) - d(L, v)| <= d(v, t) para qualquer
+    marco L: o maior desses valores é um limite inferior admissível (e consistente) da
+    distância de v até t, que guia o A* de caminho_mais_curto e pode ser usado por quem
+    precisar descartar candidatos sem buscar no grafo (limite_inferior).
+
+    As distâncias ficam num único array('d') com K posições por vértice. Funciona com
+    qualquer implementação de grafo do projeto (usa apenas dijkstra e vizinhos) e parte do
+    princípio de que o grafo não muda depois de construir().
+    """
+
+    def __init__(self, grafo, vertice_inicial: str, quantidade: int = 8):
+        """
+        Inicializa a tabela (os Dijkstras só são executados em construir()).
+
+        Args:
+            grafo (Grafo): qualquer implementação de grafo do projeto.
+            vertice_inicial (str): vértice a partir do qual o primeiro marco é escolhido
+                (o mais distante dele); qualquer cidade do mapa serve.
+            quantidade (int): número de marcos K.
+        """
+        self.grafo = grafo
+        self.vertice_inicial = vertice_inicial
+        self.quantidade = quantidade
+        self.marcos = []
+        self.indice = {}                # {cidade: posição do vértice na tabela}
+        self.distancias = array('d')    # distancias[i * K + k] = d(marco k, vértice i)
+        self.consultas = 0
+        self.fechados_total = 0
+        self.fechados_ultima_consulta = 0
+
+    def construir(self):
+        """ Escolhe os marcos e calcula a distância de cada marco a todos os vértices. """
+        distancias_inicial, _ = self.grafo.dijkstra(self.vertice_inicial)
+        vertices = list(distancias_inicial)
+        self.indice = {cidade: i for i, cidade in enumerate(vertices)}
+        self.marcos = []
+        arvores = []
+
+        # Distância de cada vértice ao marco mais próximo (inicialmente, ao vértice inicial)
+        mais_proximo = list(distancias_inicial.values())
+        while len(self.marcos) < min(self.quantidade, len(vertices)):
+            candidatos = [(d, i) for i, d in enumerate(mais_proximo) if d != float('inf')]
+            if not candidatos:
+                break
+            distancia, i = max(candidatos)
+            if self.marcos and distancia == 0: # Todos os vértices alcançáveis já são marcos
+                break
+            marco = vertices[i]
+            distancias_marco, _ = self.grafo.dijkstra(marco)
+            self.marcos.append(marco)
+            arvores.append([distancias_marco.get(cidade, float('inf')) for cidade in vertices])
+            mais_proximo = [min(atual, nova) for atual, nova in zip(mais_proximo, arvores[-1])]
+
+        self.distancias = array('d', (d for linha in zip(*arvores) for d in linha))
+        return self
+
+    def _linha(self, cidade: str):
+        """ Distâncias de cada marco até a cidade (None se a cidade não está na tabela). """
+        i = self.indice.get(cidade)
+        if i is None:
+            return None
+        k = len(self.marcos)
+        return self.distancias[i * k:(i + 1) * k]
+
+    @staticmethod
+    def _limite(linha_u, linha_v) -> float:
+        """ max_k |d(L_k, u) - d(L_k, v)|; inf quando algum marco alcança só um dos dois. """
+        limite = 0
+        for a, b in zip(linha_u, linha_v):
+            if a != b: # Dois inf (marco em outro componente) não dizem nada
+                diferenca = abs(a - b)
+                if diferenca > limite:
+                    limite = diferenca
+        return limite
+
+    def limite_inferior(self, origem: str, destino: str) -> float:
+        """
+        Limite inferior admissível da distância entre origem e destino (0 se alguma das
+        cidades não está na tabela; inf se estão em componentes diferentes do grafo).
+        """
+        linha_origem, linha_destino = self._linha(origem), self._linha(destino)
+        if linha_origem is None or linha_destino is None:
+            return 0
+        return self._limite(linha_origem, linha_destino)
+
+    def caminho_mais_curto(self, origem: str, destino: str):
+        """
+        A* guiado pelos marcos; mesmo contrato de Grafo.caminho_mais_curto. Registra os
+        vértices fechados pela consulta (ver estatisticas()).
+
+        Returns:
+            tuple:
+                list: Caminho mais curto como lista de cidades (ou None).
+                float: Distância total do caminho (ou inf).
+        """
+        self.consultas += 1
+        self.fechados_ultima_consulta = 0
+        linha_destino = self._linha(destino)
+        if linha_destino is None or origem not in self.indice:
+            return None, float('inf')
+
+        linha, limite = self._linha, self._limite
+        distancias = {origem: 0}
+        anterior = {origem: None}
+        estimativas = {origem: limite(linha(origem), linha_destino)}
+        fila = [(estimativas[origem], 0, origem)] # (distancia + estimativa, distancia, cidade)
+        fechados = 0
+        encontrado = False
+
+        while fila:
+            _, dist_u, u = heapq.heappop(fila)
+            if dist_u > distancias[u]:
+                continue
+            fechados += 1
+            if u == destino:
+                encontrado = True
+                break
+            for vizinho, peso in self.grafo.vizinhos(u):
+                nova = dist_u + peso
+                if nova < distancias.get(vizinho, float('inf')):
+                    estimativa = estimativas.get(vizinho)
+                    if estimativa is None:
+                        linha_vizinho = linha(vizinho)
+                        estimativa = estimativas[vizinho] = limite(linha_vizinho, linha_destino) if linha_vizinho is not None else 0
+                    if estimativa == float('inf'): # Componente sem ligação com o destino
+                        continue
+                    distancias[vizinho] = nova
+                    anterior[vizinho] = u
+                    heapq.heappush(fila, (nova + estimativa, nova, vizinho))
+
+        self.fechados_ultima_consulta = fechados
+        self.fechados_total += fechados
+        if not encontrado:
+            return None, float('inf')
+
+        caminho = []
+        atual = destino
+        while atual is not None:
+            caminho.append(atual)
+            atual = anterior[atual]
+        caminho.reverse()
+        return caminho, distancias[destino]
+
+    def memoria_bytes(self) -> int:
+        """ Bytes da tabela de marcos: o array de distâncias e o índice das cidades. """
+        return self.distancias.itemsize * len(self.distancias) + sys.getsizeof(self.indice)
+
+    def estatisticas(self) -> dict:
+        """ Retorna os marcos, a memória da tabela e os vértices fechados por consulta. """
+        return {
+            "marcos": list(self.marcos),
+            "memoria_bytes": self.memoria_bytes(),
+            "consultas": self.consultas,
+            "fechados_por_consulta": (self.fechados_total / self.consultas) if self.consultas else 0.0,
+            "fechados_ultima_consulta": self.fechados_ultima_consulta,
+        }
+
+    def __repr__(self):
+        return (f"MarcosALT com {len(self.marcos)} marcos sobre {len(self.indice)} cidades "
+                f"(~{self.memoria_bytes()} bytes)")
@@ -0,0 +1,67 @@
+class ParadaConsolidada:
+    """
+    Entregas para a mesma cidade tratadas como uma única parada da rota.
+
+    Tem o peso somado e o prazo mais apertado das entregas que agrupa. Como expõe
+    `destino`, `peso` e `prazo` como uma Entrega, pode substituí-las nos cálculos de rota
+    (prazos por parada, matriz de distâncias), que assim nunca permutam cidades repetidas.
+    `entregas` guarda as entregas originais para expandir o resultado de volta a elas.
+    """
+    __slots__ = ("destino", "peso", "prazo", "entregas")
+
+    def __init__(self, destino: str, entregas: list = None):
+        """
+        Args:
+            destino (str): cidade da parada.
+            entregas (list[Entrega]): entregas iniciais (todas com este destino).
+        """
+        self.destino = destino
+        self.peso = 0
+        self.prazo = float('inf')
+        self.entregas = []
+        for entrega in entregas or []:
+            self.adicionar(entrega)
+
+    def adicionar(self, entrega):
+        """ Junta a entrega à parada, somando o peso e mantendo o menor prazo. """
+        self.entregas.append(entrega)
+        self.peso += entrega.peso
+        self.prazo = min(self.prazo, entrega.prazo)
+
+    @classmethod
+    def agrupar(cls, entregas: list, capacidade_maxima: float = float('inf')) -> list:
+        """
+        Agrupa as entregas por destino, na ordem da primeira aparição de cada cidade.
+
+        Com `capacidade_maxima`, a carga de uma cidade que não cabe num caminhão é dividida
+        em várias paradas (em ordem de prazo, para manter juntas as entregas mais urgentes);
+        uma entrega sozinha acima do limite fica numa parada própria.
+
+        Args:
+            entregas (list[Entrega]): entregas a agrupar.
+            capacidade_maxima (float): peso máximo de uma parada.
+
+        Returns:
+            list[ParadaConsolidada]: paradas com as entregas agrupadas.
+        """
+        por_destino = {}
+        for entrega in entregas:
+            por_destino.setdefault(entrega.destino, []).append(entrega)
+
+        paradas = []
+        for destino, do_destino in por_destino.items():
+            if sum(e.peso for e in do_destino) <= capacidade_maxima:
+                paradas.append(cls(destino, do_destino))
+                continue
+            abertas = []
+            for entrega in sorted(do_destino, key=lambda e: e.prazo):
+                parada = next((p for p in abertas if p.peso + entrega.peso <= capacidade_maxima), None)
+                if parada is None:
+                    parada = cls(destino)
+                    abertas.append(parada)
+                parada.adicionar(entrega)
+            paradas.extend(abertas)
+        return paradas
+
+    def __repr__(self):
+        return f"Parada {self.destino} | {len(self.entregas)} entregas | Peso: {self.peso}kg | Prazo: {self.prazo}h"
@@ -15,6 +15,7 @@ from model.grafoListaArestas import GrafoListaArestas
 from model.grafoDicionario import GrafoDicionario
 from model.grafoOrientado import GrafoOrientado
 from model.grafoNetworkX import GrafoNetworkX
+from model.grafoCSR import GrafoCSR
 from controller.roteirizador import Roteirizador
 
 
@@ -44,6 +45,11 @@ def obter_configuracoes_teste():
             "classe_grafo": GrafoMatrizAdjacencia,
             "tipo_fila_dijkstra": "lista"
         },
+        {
+            "nome_estrutura": "Matriz de Adjacência (NumPy)",
+            "classe_grafo": GrafoMatrizAdjacencia,
+            "tipo_fila_dijkstra": "numpy"
+        },
         {
             "nome_estrutura": "Lista de Arestas (Heap)",
             "classe_grafo": GrafoListaArestas,
@@ -86,6 +92,18 @@ def obter_configuracoes_teste():
             "tipo_fila_dijkstra": "nativo_nx_heap",
             "requer_lista_cidades_init": False
         },
+        {
+            "nome_estrutura": "CSR com Índices Inteiros (Heap)",
+            "classe_grafo": GrafoCSR,
+            "tipo_fila_dijkstra": "heap",
+            "requer_lista_cidades_init": False
+        },
+        {
+            "nome_estrutura": "CSR com Índices Inteiros (Lista Simples)",
+            "classe_grafo": GrafoCSR,
+            "tipo_fila_dijkstra": "lista",
+            "requer_lista_cidades_init": False
+        },
     ]
 
 def executar_testes_em_lote(cenarios, quantidades):
@@ -162,7 +180,7 @@ def executar_teste_configurado(config: dict,
         print(f"\n  Erros encontrados em '{nome_estrutura_teste}' com {len(entregas_teste)} entregas:")
         for item_erro in erros_lista:
             entrega_obj = item_erro["entrega"]
-            motivos = item_erro["erro"]
+            motivos = item_erro["erro"].mensagens()
             print(f"    - Entrega {entrega_obj.id} (Dest: {entrega_obj.destino}):")
             if isinstance(motivos, list):
                 for m in motivos: print(f"      - {m}")
@@ -0,0 +1,51 @@
+import time, os, sys, random
+
+sys.path.append(os.path.abspath(os.path.join(__file__, '..', '..')))
+
+from model.grafoCSR import GrafoCSR
+from model.busca_bidirecional import dijkstra_bidirecional
+from model.marcos_alt import MarcosALT
+from testes.teste_csr import gerar_malha_rodoviaria
+
+def comparar_alt(lado: int = 317, consultas: int = 20, quantidades_marcos=(4, 8, 16)):
+    """
+    Compara os vértices fechados por consulta do Dijkstra com parada no destino, do
+    Dijkstra bidirecional e do A* com marcos (ALT) numa malha de lado x lado cidades,
+    junto com o tempo de pré-processamento e a memória da tabela de marcos.
+    """
+    grafo = GrafoCSR()
+    for origem, destino, peso in gerar_malha_rodoviaria(lado):
+        grafo.adicionar_aresta(origem, destino, peso)
+    rnd = random.Random(7)
+    pares = [(f"C{rnd.randrange(lado)}_{rnd.randrange(lado)}", f"C{rnd.randrange(lado)}_{rnd.randrange(lado)}")
+             for _ in range(consultas)]
+    print(f"Malha {lado}x{lado}: {lado * lado} cidades")
+
+    fechados_dijkstra = fechados_bidirecional = 0
+    esperado = {}
+    for origem, destino in pares:
+        distancias, _ = grafo.dijkstra(origem)
+        esperado[(origem, destino)] = distancias[destino]
+        fechados_dijkstra += sum(1 for d in distancias.values() if d <= distancias[destino])
+        fechados_bidirecional += dijkstra_bidirecional(grafo.vizinhos, origem, destino)[2]
+    print(f"  Dijkstra:      {fechados_dijkstra / consultas:8.0f} fechados por consulta")
+    print(f"  Bidirecional:  {fechados_bidirecional / consultas:8.0f} fechados por consulta")
+
+    for quantidade in quantidades_marcos:
+        inicio = time.perf_counter()
+        marcos = MarcosALT(grafo, pares[0][0], quantidade=quantidade).construir()
+        tempo_preprocessamento = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        for origem, destino in pares:
+            _, distancia = marcos.caminho_mais_curto(origem, destino)
+            assert distancia == esperado[(origem, destino)], "ALT retornou distância diferente do Dijkstra"
+        tempo_consulta = (time.perf_counter() - inicio) / consultas
+
+        estatisticas = marcos.estatisticas()
+        print(f"  ALT ({quantidade:2d} marcos): {estatisticas['fechados_por_consulta']:8.0f} fechados por consulta | "
+              f"consulta: {tempo_consulta:.4f}s | pré-processamento: {tempo_preprocessamento:.1f}s | "
+              f"tabela: {estatisticas['memoria_bytes'] / 1024 / 1024:.1f} MB")
+
+if __name__ == "__main__":
+    comparar_alt()
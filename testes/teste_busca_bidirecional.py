@@ -0,0 +1,57 @@
+import time, os, sys, random
+
+sys.path.append(os.path.abspath(os.path.join(__file__, '..', '..')))
+
+from model.grafoCSR import GrafoCSR
+from model.grafoListaAdjacencia import GrafoListaAdjacencia
+from model.busca_bidirecional import dijkstra_bidirecional
+from testes.teste_csr import gerar_malha_rodoviaria
+
+def comparar_buscas(lado: int = 317, consultas: int = 20):
+    """
+    Compara caminho_mais_curto unidirecional e bidirecional numa malha de lado x lado cidades:
+    vértices fechados por consulta e tempo médio, para pares locais (até 20 quadras) e pares
+    quaisquer. Na busca unidirecional com parada no destino, os fechados são os vértices com
+    distância menor ou igual à do destino (contados na árvore completa da origem).
+    """
+    arestas = gerar_malha_rodoviaria(lado)
+    grafos = {}
+    for bidirecional in (False, True):
+        grafos[bidirecional] = GrafoListaAdjacencia(bidirecional=bidirecional), GrafoCSR(bidirecional=bidirecional)
+        for grafo in grafos[bidirecional]:
+            for origem, destino, peso in arestas:
+                grafo.adicionar_aresta(origem, destino, peso)
+    print(f"Malha {lado}x{lado}: {lado * lado} cidades, {len(arestas)} estradas")
+
+    rnd = random.Random(7)
+    def cidade(i, j):
+        return f"C{min(max(i, 0), lado - 1)}_{min(max(j, 0), lado - 1)}"
+    locais = []
+    for _ in range(consultas):
+        i, j = rnd.randrange(lado), rnd.randrange(lado)
+        locais.append((cidade(i, j), cidade(i + rnd.randint(-20, 20), j + rnd.randint(-20, 20))))
+    quaisquer = [(cidade(rnd.randrange(lado), rnd.randrange(lado)), cidade(rnd.randrange(lado), rnd.randrange(lado)))
+                 for _ in range(consultas)]
+
+    referencia = grafos[False][0]
+    for nome_pares, pares in (("locais", locais), ("quaisquer", quaisquer)):
+        fechados_uni = fechados_bi = 0
+        for origem, destino in pares:
+            distancias, _ = referencia.dijkstra(origem)
+            fechados_uni += sum(1 for d in distancias.values() if d <= distancias[destino])
+            fechados_bi += dijkstra_bidirecional(referencia.vizinhos, origem, destino)[2]
+        print(f"  Pares {nome_pares}: fechados por consulta {fechados_uni / consultas:.0f} (unidirecional) x "
+              f"{fechados_bi / consultas:.0f} (bidirecional) -> {fechados_uni / max(fechados_bi, 1):.1f}x menos")
+
+        for indice, nome in enumerate(("Lista de Adjacência", "CSR")):
+            tempos = []
+            for bidirecional in (False, True):
+                grafo = grafos[bidirecional][indice]
+                inicio = time.perf_counter()
+                for origem, destino in pares:
+                    grafo.caminho_mais_curto(origem, destino)
+                tempos.append((time.perf_counter() - inicio) / consultas)
+            print(f"    {nome:<20} caminho_mais_curto: {tempos[0]:.4f}s (unidirecional) x {tempos[1]:.4f}s (bidirecional)")
+
+if __name__ == "__main__":
+    comparar_buscas()
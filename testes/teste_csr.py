@@ -0,0 +1,109 @@
+import time, tracemalloc, os, sys, random
+
+sys.path.append(os.path.abspath(os.path.join(__file__, '..', '..')))
+
+from model.entrega import Entrega
+from model.centro_distribuicao import CentroDistribuicao
+from model.grafoCSR import GrafoCSR
+from model.grafoListaAdjacencia import GrafoListaAdjacencia
+from controller.roteirizador import Roteirizador
+
+def preparar_grafo(arestas_mapa: list[tuple[str, str, int]]) -> GrafoCSR:
+    """
+    Recebe uma lista de arestas e as adiciona no grafo CSR.
+    """
+    g = GrafoCSR(tipo_fila_dijkstra='heap')
+    for origem, destino, peso in arestas_mapa:
+        g.adicionar_aresta(origem, destino, peso)
+    return g
+
+def executar_teste(centros: list[CentroDistribuicao],
+                   entregas: list[Entrega],
+                   arestas_mapa: list[tuple[str, str, int]],
+                   todas_cidades_mapa: list[str],
+                   mostrar_erros: bool=False) -> dict:
+    """
+    Executa o teste com grafo CSR (índices inteiros), medindo tempo e memória.
+    """
+    grafo_teste = preparar_grafo(arestas_mapa)
+
+    tracemalloc.start()
+    inicio_tempo = time.perf_counter()
+
+    roteirizador = Roteirizador(centros, entregas, grafo_teste)
+    resultado_alocacao = roteirizador.alocar_entregas()
+
+    fim_tempo = time.perf_counter()
+    memoria_atual, memoria_pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    erros_lista = [r for r in resultado_alocacao if "erro" in r]
+
+    if mostrar_erros and erros_lista:
+        print(f"\n  Erros encontrados em 'CSR (Heap)' com {len(entregas)} entregas:")
+        for item_erro in erros_lista:
+            entrega_obj = item_erro["entrega"]
+            print(f"    - Entrega {entrega_obj.id} (Dest: {entrega_obj.destino}):")
+            for m in item_erro["erro"].mensagens():
+                print(f"      - {m}")
+
+    return {
+        "estrutura": "CSR com Índices Inteiros (Heap)",
+        "qtd_entregas": len(entregas),
+        "tempo": fim_tempo - inicio_tempo,
+        "memoria_pico_kb": memoria_pico / 1024,
+        "sucessos": len(entregas) - len(erros_lista),
+        "erros": len(erros_lista),
+    }
+
+def gerar_malha_rodoviaria(lado: int, semente: int = 42) -> list[tuple[str, str, int]]:
+    """
+    Malha lado x lado com pesos aleatórios (estradas entre vizinhos na grade), usada para
+    comparar as estruturas em mapas grandes (lado=317 dá ~100 mil cidades).
+    """
+    rnd = random.Random(semente)
+    arestas = []
+    for i in range(lado):
+        for j in range(lado):
+            if j + 1 < lado:
+                arestas.append((f"C{i}_{j}", f"C{i}_{j + 1}", rnd.randint(10, 120)))
+            if i + 1 < lado:
+                arestas.append((f"C{i}_{j}", f"C{i + 1}_{j}", rnd.randint(10, 120)))
+    return arestas
+
+def comparar_mapa_grande(lado: int = 317, consultas: int = 5):
+    """
+    Compara GrafoCSR e GrafoListaAdjacencia num mapa sintético grande: memória do grafo
+    montado e tempo médio de um Dijkstra completo e de caminho_mais_curto.
+    """
+    arestas = gerar_malha_rodoviaria(lado)
+    rnd = random.Random(7)
+    pares = [(f"C{rnd.randrange(lado)}_{rnd.randrange(lado)}", f"C{rnd.randrange(lado)}_{rnd.randrange(lado)}")
+             for _ in range(consultas)]
+    print(f"Malha {lado}x{lado}: {lado * lado} cidades, {len(arestas)} estradas")
+
+    for nome, classe in (("Lista de Adjacência", GrafoListaAdjacencia), ("CSR", GrafoCSR)):
+        tracemalloc.start()
+        grafo = classe(tipo_fila_dijkstra='heap')
+        for origem, destino, peso in arestas:
+            grafo.adicionar_aresta(origem, destino, peso)
+        if isinstance(grafo, GrafoCSR):
+            grafo._compactar()
+        memoria_atual, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        inicio = time.perf_counter()
+        for origem, _ in pares:
+            grafo.dijkstra(origem)
+        tempo_dijkstra = (time.perf_counter() - inicio) / consultas
+
+        inicio = time.perf_counter()
+        for origem, destino in pares:
+            grafo.caminho_mais_curto(origem, destino)
+        tempo_caminho = (time.perf_counter() - inicio) / consultas
+
+        print(f"  {nome:<20} memória: {memoria_atual / 1024 / 1024:8.1f} MB | "
+              f"dijkstra: {tempo_dijkstra:.3f}s | caminho_mais_curto: {tempo_caminho:.3f}s")
+
+if __name__ == "__main__":
+    comparar_mapa_grande()
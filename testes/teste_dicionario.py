@@ -37,7 +37,7 @@ def executar_teste(centros: list[CentroDistribuicao], entregas: list[Entrega], a
 
     if mostrar_erros:
         for item in erros:
-            print(f"{item['erro']} {item['entrega'].id}")
+            print(f"{item['erro'].mensagens()} {item['entrega'].id}")
 
     return {
         "estrutura": "Dicionário de Dicionários",
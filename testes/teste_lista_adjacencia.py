@@ -43,7 +43,7 @@ def executar_teste(centros: list[CentroDistribuicao],
         for item_erro in erros_lista: # Renomeado
             # Acessar a entrega e a lista de motivos de erro
             entrega_obj = item_erro["entrega"]
-            motivos = item_erro["erro"] # Que agora é uma lista de strings
+            motivos = item_erro["erro"].mensagens() # Texto montado só aqui, a partir do DiagnosticoFalha
             print(f"    - Entrega {entrega_obj.id} (Dest: {entrega_obj.destino}):")
             if isinstance(motivos, list):
                 for m in motivos:
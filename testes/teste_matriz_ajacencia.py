@@ -1,10 +1,13 @@
-import time, tracemalloc, os, sys
+import time, tracemalloc, os, sys, random
 
 sys.path.append(os.path.abspath(os.path.join(__file__, '..', '..')))
 
 from model.entrega import Entrega
 from model.centro_distribuicao import CentroDistribuicao
 from model.grafoMatrizAdjacencia import GrafoMatrizAdjacencia
+from model.grafoListaAdjacencia import GrafoListaAdjacencia
+from model.grafoDicionario import GrafoDicionario
+from model.grafoCSR import GrafoCSR
 from controller.roteirizador import Roteirizador
 
 def preparar_grafo(arestas: list[tuple[str, str, int]]) -> GrafoMatrizAdjacencia:
@@ -42,7 +45,7 @@ def executar_teste(centros: list[CentroDistribuicao], entregas: list[Entrega], a
 
     if mostrar_erros:
         for item in erros:
-            print(f"{item['erro']} {item['entrega'].id}")
+            print(f"{item['erro'].mensagens()} {item['entrega'].id}")
     
     return {
         "estrutura": "Matriz de Adjacência",
@@ -53,3 +56,40 @@ def executar_teste(centros: list[CentroDistribuicao], entregas: list[Entrega], a
         "sucessos": len(entregas) - len(erros),
         "erros": len(erros),
     }
+
+def gerar_grafo_denso(qtd_cidades: int, densidade: float, semente: int = 42) -> list[tuple[str, str, int]]:
+    """
+    Arestas de um grafo regional denso: cada par de cidades tem estrada com probabilidade `densidade`.
+    """
+    rnd = random.Random(semente)
+    return [(f"C{i}", f"C{j}", rnd.randint(10, 300))
+            for i in range(qtd_cidades) for j in range(i + 1, qtd_cidades) if rnd.random() < densidade]
+
+def comparar_grafo_denso(qtd_cidades: int = 1000, densidade: float = 0.3, consultas: int = 5):
+    """
+    Tempo médio de um Dijkstra completo num grafo denso: Matriz de Adjacência (NumPy)
+    contra as estruturas com heap.
+    """
+    arestas = gerar_grafo_denso(qtd_cidades, densidade)
+    cidades = [f"C{i}" for i in range(qtd_cidades)]
+    origens = random.Random(7).sample(cidades, consultas)
+    print(f"Grafo denso: {qtd_cidades} cidades, {len(arestas)} estradas")
+
+    estruturas = (
+        ("Matriz de Adjacência (NumPy)", lambda: GrafoMatrizAdjacencia(cidades, tipo_fila_dijkstra='numpy')),
+        ("Matriz de Adjacência (Heap)", lambda: GrafoMatrizAdjacencia(cidades, tipo_fila_dijkstra='heap')),
+        ("Lista de Adjacência (Heap)", lambda: GrafoListaAdjacencia(tipo_fila_dijkstra='heap')),
+        ("Dicionário de Dicionários (Heap)", lambda: GrafoDicionario(tipo_fila_dijkstra='heap')),
+        ("CSR com Índices Inteiros (Heap)", lambda: GrafoCSR(tipo_fila_dijkstra='heap')),
+    )
+    for nome, criar in estruturas:
+        grafo = criar()
+        for origem, destino, peso in arestas:
+            grafo.adicionar_aresta(origem, destino, peso)
+        inicio = time.perf_counter()
+        for origem in origens:
+            grafo.dijkstra(origem)
+        print(f"  {nome:<34} dijkstra: {(time.perf_counter() - inicio) / consultas:.4f}s")
+
+if __name__ == "__main__":
+    comparar_grafo_denso()
@@ -0,0 +1,111 @@
+import os, sys
+
+raiz = os.path.abspath(os.path.join(__file__, "..", ".."))
+if raiz not in sys.path:
+    sys.path.append(raiz)
+
+import argparse
+import asyncio
+import json
+import time
+
+from utils.mapa_logistico import obter_estrutura_mapa
+from utils.gerador_entregas import gerar_entregas
+
+
+async def _conexao(host: str, porta: int, entregas: list, intervalo: float, latencias: list, resultados: list):
+    """ Uma conexão JSON por linha: envia as entregas no ritmo pedido e mede a latência de cada resposta. """
+    leitor, escritor = await asyncio.open_connection(host, porta)
+    enviado_em = {}
+
+    async def enviar():
+        for entrega_obj in entregas:
+            pedido = {"id": entrega_obj.id, "destino": entrega_obj.destino, "peso": entrega_obj.peso, "prazo": entrega_obj.prazo}
+            enviado_em[entrega_obj.id] = time.perf_counter()
+            escritor.write(json.dumps(pedido, ensure_ascii=False).encode() + b"\n")
+            await escritor.drain()
+            if intervalo:
+                await asyncio.sleep(intervalo)
+        escritor.write_eof()
+
+    envio = asyncio.create_task(enviar())
+    for _ in range(len(entregas)):
+        linha = await leitor.readline()
+        if not linha:
+            break
+        resultado = json.loads(linha)
+        latencias.append(time.perf_counter() - enviado_em[resultado["id"]])
+        resultados.append(resultado)
+    await envio
+    escritor.close()
+
+
+def _percentil(valores_ordenados: list, p: float) -> float:
+    if not valores_ordenados:
+        return float('nan')
+    return valores_ordenados[min(len(valores_ordenados) - 1, int(p / 100 * len(valores_ordenados)))]
+
+
+def _com_id(entrega_obj, id_entrega: str):
+    entrega_obj.id = id_entrega # Ids únicos entre conexões
+    return entrega_obj
+
+
+async def gerar_carga(host: str = "127.0.0.1", porta: int = 8765, conexoes: int = 8, entregas_por_conexao: int = 50,
+                      taxa_por_conexao: float = 0) -> dict:
+    """
+    Dispara entregas aleatórias do mapa padrão contra o servidor de despacho por várias
+    conexões simultâneas.
+
+    Args:
+        host (str): endereço do servidor.
+        porta (int): porta do servidor.
+        conexoes (int): conexões TCP simultâneas.
+        entregas_por_conexao (int): entregas enviadas por conexão.
+        taxa_por_conexao (float): entregas por segundo em cada conexão (0 = sem pausa).
+
+    Returns:
+        dict: {"entregas", "alocadas", "segundos", "vazao", "latencia_ms": {"p50", "p95", "p99", "max"}}.
+    """
+    _, _, destinos = obter_estrutura_mapa()
+    intervalo = 1 / taxa_por_conexao if taxa_por_conexao > 0 else 0
+    latencias, resultados = [], []
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(
+        _conexao(host, porta,
+                 [_com_id(e, f"C{c:02d}-{e.id}") for e in gerar_entregas(entregas_por_conexao, destinos)],
+                 intervalo, latencias, resultados)
+        for c in range(conexoes)
+    ))
+    segundos = time.perf_counter() - inicio
+
+    latencias.sort()
+    return {
+        "entregas": len(resultados),
+        "alocadas": sum(1 for r in resultados if r.get("alocada")),
+        "segundos": segundos,
+        "vazao": len(resultados) / segundos if segundos > 0 else float('inf'),
+        "latencia_ms": {
+            "p50": _percentil(latencias, 50) * 1000,
+            "p95": _percentil(latencias, 95) * 1000,
+            "p99": _percentil(latencias, 99) * 1000,
+            "max": (latencias[-1] if latencias else float('nan')) * 1000,
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gerador de carga local para o servidor de despacho.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--conexoes", type=int, default=8)
+    parser.add_argument("--entregas", type=int, default=50, help="entregas por conexão")
+    parser.add_argument("--taxa", type=float, default=0, help="entregas/s por conexão (0 = sem pausa)")
+    args = parser.parse_args()
+
+    resumo = asyncio.run(gerar_carga(args.host, args.porta, args.conexoes, args.entregas, args.taxa))
+    lat = resumo["latencia_ms"]
+    print(f"{resumo['entregas']} respostas ({resumo['alocadas']} alocadas) em {resumo['segundos']:.2f}s "
+          f"-> {resumo['vazao']:.1f} entregas/s")
+    print(f"Latência (ms): p50 {lat['p50']:.1f} | p95 {lat['p95']:.1f} | p99 {lat['p99']:.1f} | máx {lat['max']:.1f}")
@@ -0,0 +1,317 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from model.entrega import Entrega
+from model.grafoListaAdjacencia import GrafoListaAdjacencia
+from controller.roteirizador import Roteirizador
+from utils.mapa_logistico import obter_estrutura_mapa, adicionar_frota_padrao
+
+
+class ServidorDespacho:
+    """
+    Servidor de despacho asyncio (só biblioteca padrão) na frente de um Roteirizador aquecido.
+
+    O grafo, a frota e os caches de caminhos são montados uma vez e ficam em memória. As
+    entregas que chegam são agrupadas em janelas curtas (micro-lotes); cada lote é alocado
+    fora do laço de eventos, numa única thread (o Roteirizador não é thread-safe), pela
+    alocação em fluxo, e o resultado de cada entrega é enviado ao cliente assim que é decidido.
+    A estrutura da frota (FrotaColunar/IndiceFrota) é montada no primeiro lote e depois só
+    atualizada a cada alocação: o servidor é o único a alterar os caminhões.
+
+    Protocolos aceitos na mesma porta:
+        - TCP com JSON por linha: cada linha é uma entrega
+          {"id", "destino", "peso", "prazo"} e cada resposta é uma linha JSON com o mesmo "id".
+        - HTTP: POST com corpo JSON (uma entrega ou uma lista); a resposta é a lista de
+          resultados, na ordem do corpo.
+    """
+
+    LIMITE_LINHA = 64 * 1024 # Bytes por linha (pedido JSON ou cabeçalho HTTP)
+
+    def __init__(self, roteirizador: Roteirizador, janela: float = 0.02, tamanho_maximo_lote: int = 256,
+                 tamanho_maximo_corpo: int = 1024 * 1024):
+        """
+        Args:
+            roteirizador (Roteirizador): roteirizador com grafo e frota já montados.
+            janela (float): segundos que o primeiro pedido de um lote espera por outros.
+            tamanho_maximo_lote (int): fecha o lote antes da janela ao atingir este tamanho.
+            tamanho_maximo_corpo (int): maior corpo HTTP aceito, em bytes (acima disso, 413).
+        """
+        self.roteirizador = roteirizador
+        self.janela = janela
+        self.tamanho_maximo_lote = tamanho_maximo_lote
+        self.tamanho_maximo_corpo = tamanho_maximo_corpo
+        self.estatisticas = {"entregas": 0, "alocadas": 0, "lotes": 0, "segundos_alocando": 0.0}
+        self._pendentes = None # asyncio.Queue de (Entrega, Future), criada no laço de eventos
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="despacho")
+        self._servidor = None
+        self._tarefa_lotes = None
+
+    async def iniciar(self, host: str = "127.0.0.1", porta: int = 8765):
+        """ Abre a porta e inicia o agrupador de lotes. Retorna o asyncio.Server. """
+        self._pendentes = asyncio.Queue()
+        self._tarefa_lotes = asyncio.create_task(self._processar_lotes())
+        self._servidor = await asyncio.start_server(self._atender_conexao, host, porta, limit=self.LIMITE_LINHA)
+        return self._servidor
+
+    async def encerrar(self):
+        """ Fecha a porta, cancela o agrupador e libera a thread de alocação. """
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+        if self._tarefa_lotes is not None:
+            self._tarefa_lotes.cancel()
+            try:
+                await self._tarefa_lotes
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=True)
+
+    def despachar(self, entrega_obj: Entrega) -> asyncio.Future:
+        """ Enfileira a entrega no próximo lote; o Future recebe o resultado (dict serializável). """
+        futuro = asyncio.get_running_loop().create_future()
+        self._pendentes.put_nowait((entrega_obj, futuro))
+        return futuro
+
+    async def _processar_lotes(self):
+        laco = asyncio.get_running_loop()
+        while True:
+            lote = [await self._pendentes.get()]
+            fim_janela = laco.time() + self.janela
+            while len(lote) < self.tamanho_maximo_lote:
+                restante = fim_janela - laco.time()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(await asyncio.wait_for(self._pendentes.get(), restante))
+                except asyncio.TimeoutError:
+                    break
+            # Um lote por vez: o próximo só começa a ser alocado depois deste (estado da frota)
+            await laco.run_in_executor(self._executor, self._alocar_lote, lote, laco)
+
+    def _alocar_lote(self, lote: list, laco: asyncio.AbstractEventLoop):
+        """ Roda na thread de alocação; cada resultado volta ao laço de eventos assim que sai. """
+        inicio = time.perf_counter()
+        entregas = [entrega_obj for entrega_obj, _ in lote]
+        futuros = [futuro for _, futuro in lote]
+        try:
+            registros = self.roteirizador.alocar_entregas_em_fluxo(entregas, reutilizar_frota=True)
+            for futuro, registro in zip(futuros, registros):
+                resultado = self._serializar(registro)
+                self.estatisticas["alocadas"] += resultado["alocada"]
+                laco.call_soon_threadsafe(self._resolver, futuro, resultado)
+        except Exception as erro:
+            for futuro in futuros:
+                laco.call_soon_threadsafe(self._resolver, futuro, None, erro)
+        self.estatisticas["entregas"] += len(lote)
+        self.estatisticas["lotes"] += 1
+        self.estatisticas["segundos_alocando"] += time.perf_counter() - inicio
+
+    @staticmethod
+    def _resolver(futuro: asyncio.Future, resultado, erro: Exception = None):
+        if futuro.done(): # Cliente desconectou e o Future foi cancelado
+            return
+        if erro is not None:
+            futuro.set_exception(erro)
+        else:
+            futuro.set_result(resultado)
+
+    @staticmethod
+    def _serializar(registro: dict) -> dict:
+        entrega_obj = registro["entrega"]
+        if "erro" in registro:
+            diagnostico = registro["erro"]
+            return {"id": entrega_obj.id, "alocada": False, "erro": diagnostico.mensagens(),
+                    "motivos": [motivo.name for motivo in diagnostico.motivos()]}
+        return {
+            "id": entrega_obj.id,
+            "alocada": True,
+            "caminhao": registro["caminhao"].id,
+            "centro": registro["centro"].cidade,
+            "rota": registro["rota"],
+            "tempo": registro["tempo"],
+        }
+
+    @staticmethod
+    def _resultado_falha_interna(id_pedido, erro: Exception) -> dict:
+        return {"id": id_pedido, "alocada": False, "erro": [f"Falha interna na alocação: {erro}"]}
+
+    @classmethod
+    def _resultado_linha_longa(cls) -> dict:
+        return {"id": None, "alocada": False, "erro": [f"Linha excede o limite de {cls.LIMITE_LINHA} bytes."]}
+
+    @staticmethod
+    def _ler_entrega(dados) -> Entrega:
+        """ Converte o JSON de um pedido em Entrega. ValueError se faltar campo ou o tipo for inválido. """
+        if not isinstance(dados, dict):
+            raise ValueError("Pedido deve ser um objeto JSON.")
+        try:
+            return Entrega(str(dados["id"]), str(dados["destino"]), float(dados["peso"]), float(dados["prazo"]))
+        except KeyError as campo:
+            raise ValueError(f"Campo obrigatório ausente: {campo}.") from None
+        except (TypeError, ValueError):
+            raise ValueError("Campos 'peso' e 'prazo' devem ser numéricos.") from None
+
+    async def _atender_conexao(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        try:
+            try:
+                primeira_linha = await leitor.readline()
+            except ValueError: # Linha maior que LIMITE_LINHA (LimitOverrunError vira ValueError)
+                escritor.write(json.dumps(self._resultado_linha_longa(), ensure_ascii=False).encode() + b"\n")
+                await escritor.drain()
+                return
+            if primeira_linha.split(b" ", 1)[0] in (b"POST", b"GET"):
+                await self._atender_http(primeira_linha, leitor, escritor)
+            else:
+                await self._atender_linhas(primeira_linha, leitor, escritor)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+
+    async def _atender_linhas(self, linha: bytes, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        """ JSON por linha: as respostas são escritas na ordem em que ficam prontas. """
+        respostas = set()
+
+        async def responder(futuro, id_pedido):
+            try:
+                resultado = await futuro
+            except Exception as erro:
+                resultado = self._resultado_falha_interna(id_pedido, erro)
+            escritor.write(json.dumps(resultado, ensure_ascii=False).encode() + b"\n")
+            await escritor.drain()
+
+        while linha:
+            linha = linha.strip()
+            if linha:
+                id_pedido = None
+                try:
+                    dados = json.loads(linha)
+                    id_pedido = dados.get("id") if isinstance(dados, dict) else None
+                    entrega_obj = self._ler_entrega(dados)
+                except ValueError as erro: # json.JSONDecodeError também é ValueError
+                    escritor.write(json.dumps({"id": id_pedido, "alocada": False, "erro": [str(erro)]},
+                                              ensure_ascii=False).encode() + b"\n")
+                else:
+                    tarefa = asyncio.create_task(responder(self.despachar(entrega_obj), entrega_obj.id))
+                    respostas.add(tarefa)
+                    tarefa.add_done_callback(respostas.discard)
+            try:
+                linha = await leitor.readline()
+            except ValueError: # Linha longa demais: responde e para de ler esta conexão
+                escritor.write(json.dumps(self._resultado_linha_longa(), ensure_ascii=False).encode() + b"\n")
+                break
+
+        if respostas: # Cliente fechou o envio: termina de responder o que já foi pedido
+            await asyncio.gather(*respostas, return_exceptions=True)
+        await escritor.drain()
+
+    async def _atender_http(self, primeira_linha: bytes, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        """ HTTP/1.1 mínimo: um POST por conexão, resposta JSON com todos os resultados. """
+        tamanho_declarado = None
+        try:
+            while True:
+                cabecalho = await leitor.readline()
+                if cabecalho in (b"\r\n", b"\n", b""):
+                    break
+                nome, _, valor = cabecalho.decode("latin-1").partition(":")
+                if nome.strip().lower() == "content-length":
+                    tamanho_declarado = valor.strip()
+        except ValueError: # Cabeçalho maior que LIMITE_LINHA
+            status, corpo = "431 Request Header Fields Too Large", {"erro": [f"Cabeçalho excede o limite de {self.LIMITE_LINHA} bytes."]}
+        else:
+            if not primeira_linha.startswith(b"POST"):
+                status, corpo = "405 Method Not Allowed", {"erro": ["Use POST com uma entrega ou lista de entregas em JSON."]}
+            else:
+                status, corpo = await self._atender_post(tamanho_declarado, leitor)
+
+        conteudo = json.dumps(corpo, ensure_ascii=False).encode()
+        escritor.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(conteudo)}\r\nConnection: close\r\n\r\n".encode() + conteudo
+        )
+        await escritor.drain()
+
+    async def _atender_post(self, tamanho_declarado: str, leitor: asyncio.StreamReader):
+        """ Lê e aloca o corpo de um POST. Retorna (status HTTP, corpo da resposta). """
+        try:
+            tamanho = int(tamanho_declarado) if tamanho_declarado is not None else 0
+        except ValueError:
+            return "400 Bad Request", {"erro": ["Content-Length deve ser um inteiro."]}
+        if tamanho < 0:
+            return "400 Bad Request", {"erro": ["Content-Length não pode ser negativo."]}
+        if tamanho > self.tamanho_maximo_corpo:
+            return "413 Payload Too Large", {"erro": [f"Corpo excede o limite de {self.tamanho_maximo_corpo} bytes."]}
+
+        try:
+            dados = json.loads(await leitor.readexactly(tamanho)) if tamanho else None
+            pedidos = dados if isinstance(dados, list) else [dados]
+            entregas = [self._ler_entrega(pedido) for pedido in pedidos]
+        except ValueError as erro: # json.JSONDecodeError também é ValueError
+            return "400 Bad Request", {"erro": [str(erro)]}
+
+        # Uma falha na alocação vira o resultado daquela entrega, como no protocolo JSON por linha
+        resultados = await asyncio.gather(*(self.despachar(e) for e in entregas), return_exceptions=True)
+        return "200 OK", [
+            self._resultado_falha_interna(e.id, resultado) if isinstance(resultado, Exception) else resultado
+            for e, resultado in zip(entregas, resultados)
+        ]
+
+
+def criar_roteirizador_padrao(caminhoes_por_centro: int = 10, algoritmo_rota: str = 'insercao') -> Roteirizador:
+    """
+    Monta o Roteirizador do mapa logístico padrão, com os caminhos dos centros já aquecidos.
+
+    Args:
+        caminhoes_por_centro (int): tamanho da frota padrão de cada centro.
+        algoritmo_rota (str): algoritmo de roteirização (ver Roteirizador.ALGORITMOS_ROTA).
+
+    Returns:
+        Roteirizador: pronto para alocar_entregas_em_fluxo.
+    """
+    centros, arestas, _ = obter_estrutura_mapa()
+    adicionar_frota_padrao(centros, caminhoes_por_centro)
+    grafo = GrafoListaAdjacencia()
+    for origem, destino, tempo in arestas:
+        grafo.adicionar_aresta(origem, destino, tempo)
+
+    roteirizador = Roteirizador(centros, [], grafo, algoritmo_rota=algoritmo_rota)
+    roteirizador.obter_mapa_centros() # Dijkstra multi-fonte dos centros pago antes do primeiro pedido
+    return roteirizador
+
+
+async def servir(host: str, porta: int, janela: float, tamanho_maximo_lote: int, caminhoes_por_centro: int, algoritmo_rota: str):
+    inicio = time.perf_counter()
+    roteirizador = criar_roteirizador_padrao(caminhoes_por_centro, algoritmo_rota)
+    servidor = ServidorDespacho(roteirizador, janela, tamanho_maximo_lote)
+    await servidor.iniciar(host, porta)
+    print(f"Servidor de despacho em {host}:{porta} (pronto em {time.perf_counter() - inicio:.2f}s, "
+          f"janela {janela * 1000:.0f}ms, lote máximo {tamanho_maximo_lote}).")
+    try:
+        await asyncio.Event().wait() # Até Ctrl+C
+    finally:
+        await servidor.encerrar()
+        e = servidor.estatisticas
+        print(f"Encerrado: {e['entregas']} entregas ({e['alocadas']} alocadas) em {e['lotes']} lotes, "
+              f"{e['segundos_alocando']:.2f}s alocando.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor de despacho com micro-lotes na frente do Roteirizador.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--janela-ms", type=float, default=20, help="espera máxima para fechar um lote (ms)")
+    parser.add_argument("--lote-maximo", type=int, default=256)
+    parser.add_argument("--caminhoes-por-centro", type=int, default=10)
+    parser.add_argument("--algoritmo", default="insercao", choices=sorted(Roteirizador.ALGORITMOS_ROTA))
+    args = parser.parse_args()
+    try:
+        asyncio.run(servir(args.host, args.porta, args.janela_ms / 1000, args.lote_maximo,
+                           args.caminhoes_por_centro, args.algoritmo))
+    except KeyboardInterrupt:
+        pass
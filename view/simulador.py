@@ -5,6 +5,7 @@ from model.entrega import Entrega
 from model.caminhao import Caminhao # Presumo que esteja usando a versão refatorada de Caminhao
 from model.centro_distribuicao import CentroDistribuicao
 from model.grafoListaAdjacencia import GrafoListaAdjacencia # Certifique-se que o nome está correto
+from model.linha_tempo_rota import LinhaTempoRota
 from controller.roteirizador import Roteirizador
 from utils.mapa_logistico import obter_estrutura_mapa, adicionar_frota_padrao
 from utils.gerador_entregas import gerar_entregas
@@ -44,10 +45,10 @@ def simular():
     resultado_alocacao = roteirizador.alocar_entregas() # Chamada única
 
     # 5. Exibir resultados
-    exibir_resultados_detalhados(resultado_alocacao, lista_obj_centros, grafo, entregas_geradas)
+    exibir_resultados_detalhados(resultado_alocacao, lista_obj_centros, roteirizador, entregas_geradas)
 
 
-def exibir_resultados_detalhados(resultado_alocacao, todos_os_centros, grafo, todas_as_entregas_geradas):
+def exibir_resultados_detalhados(resultado_alocacao, todos_os_centros, roteirizador, todas_as_entregas_geradas):
     print("\n--- RELATÓRIO DETALHADO DA SIMULAÇÃO DE ENTREGAS ---")
 
     caminhoes_ativos = {}
@@ -76,10 +77,11 @@ def exibir_resultados_detalhados(resultado_alocacao, todos_os_centros, grafo, to
         else: # Falha na alocação
             entregas_nao_alocadas_info.append({
                 "entrega": entrega_processada,
-                "lista_de_motivos": item_resultado["erro"] # "erro" agora contém a lista de motivos
+                "diagnostico": item_resultado["erro"] # DiagnosticoFalha: o texto só é montado na exibição
             })
     
-    # ... (o restante da lógica para exibir caminhões ativos permanece o mesmo) ...
+    # Tempos vêm da linha do tempo planejada e o retorno da TabelaRetornoCentros: nenhum Dijkstra por trecho
+    tabela_retorno = roteirizador.obter_tabela_retorno()
     print("\nVISUALIZAÇÃO DA OPERAÇÃO POR CAMINHÃO:\n")
     if not caminhoes_ativos:
         print("Nenhum caminhão realizou entregas.")
@@ -92,71 +94,59 @@ def exibir_resultados_detalhados(resultado_alocacao, todos_os_centros, grafo, to
 
             caminhao = dados_caminhao["caminhao_obj"]
             cd_origem_obj = dados_caminhao["cd_origem_obj"] 
-            rota_ate_ultima_entrega = dados_caminhao["rota_parcial_entregas"]
-            tempo_ate_ultima_entrega = dados_caminhao["tempo_parcial_entregas"]
             entregas_nesta_rota = dados_caminhao["entregas_nesta_rota"]
+            # Estado final do caminhão (o relatório guarda a rota do momento de cada alocação)
+            rota_ate_ultima_entrega = caminhao.rota
+            linha_tempo = caminhao.linha_tempo
+            if linha_tempo is None: # Rota definida fora do roteirizador: trechos pelo oráculo
+                linha_tempo = LinhaTempoRota.a_partir_de_paradas(
+                    cd_origem_obj.cidade, caminhao.paradas_na_ordem(), None, roteirizador.oraculo.distancia
+                )
 
             print(f"--- Caminhão: {caminhao.id} (CD: {cd_origem_obj.cidade}) ---")
             print(f"  Capacidade Total: {caminhao.capacidade_kg_total}kg, Horas Máximas/Dia: {caminhao.horas_operacao_maximas_dia}h")
             
             if not rota_ate_ultima_entrega :
-                print("  Sem rota definida (possivelmente entrega no próprio CD ou erro na rota).")
-                if tempo_ate_ultima_entrega == 0 and len(entregas_nesta_rota) == 1 and entregas_nesta_rota[0].destino == cd_origem_obj.cidade:
-                    print(f"  Entrega realizada no próprio CD: {entregas_nesta_rota[0]}")
+                print("  Sem rota definida (possivelmente erro na rota).")
                 print(f"  Caminhão permanece no CD: {cd_origem_obj.cidade}\n")
                 continue
 
+            tempo_ate_ultima_entrega = linha_tempo.chegadas[-1] if linha_tempo.chegadas else 0
             print(f"  Rota Planejada (Entregas): {' → '.join(rota_ate_ultima_entrega)}")
             print(f"  Tempo Estimado (Entregas): {tempo_ate_ultima_entrega}h")
             peso_inicial_carregado = sum(e.peso for e in entregas_nesta_rota)
             print(f"  Peso Inicial Carregado: {peso_inicial_carregado:.2f}kg")
             print("\n  Detalhes da Rota e Entregas:")
-            cidade_anterior_rota = rota_ate_ultima_entrega[0]
-            tempo_acumulado_simulado = 0
+            print(f"    PARTIDA: {cd_origem_obj.cidade}")
             peso_simulado_no_caminhao = peso_inicial_carregado
-
-            if len(rota_ate_ultima_entrega) == 1 and rota_ate_ultima_entrega[0] == cd_origem_obj.cidade:
-                print(f"    PARTIDA: {cd_origem_obj.cidade} (próprio CD)")
-                for entrega_obj_sim in entregas_nesta_rota:
-                    if entrega_obj_sim.destino == cd_origem_obj.cidade:
-                        print(f"    => CHEGADA: {cd_origem_obj.cidade} (Próprio CD, Tempo: 0h)")
-                        print(f"       ENTREGA REALIZADA: {entrega_obj_sim}")
-                        peso_simulado_no_caminhao -= entrega_obj_sim.peso
-                        print(f"       Peso restante no caminhão: {peso_simulado_no_caminhao:.2f}kg")
-                print(f"    RETORNO: Caminhão já está no CD de origem ({cd_origem_obj.cidade}).")
-                print(f"  Tempo Total da Viagem (com retorno implícito): {tempo_ate_ultima_entrega}h")
-                horas_restantes_dia = caminhao.horas_operacao_maximas_dia - caminhao.tempo_rota_atual
-                print(f"  Horas restantes do caminhão no dia: {horas_restantes_dia:.2f}h\n")
-                input("Aperte enter para continuar para a próxima entrega.")
-                continue
-                
-
-            for idx_cidade, cidade_atual_rota in enumerate(rota_ate_ultima_entrega):
-                if idx_cidade == 0:
-                    print(f"    PARTIDA: {cidade_atual_rota}")
+            posicao_na_rota = 0
+            tempo_anterior = 0
+
+            for parada, chegada in zip(linha_tempo.paradas, linha_tempo.chegadas):
+                # Cidades do trecho: da parada anterior até a primeira passagem por esta na rota expandida
+                fim_trecho = rota_ate_ultima_entrega.index(parada, posicao_na_rota)
+                cidades_trecho = rota_ate_ultima_entrega[posicao_na_rota:fim_trecho + 1]
+                posicao_na_rota = fim_trecho
+                if len(cidades_trecho) > 1:
+                    print(f"    TRECHO: {' → '.join(cidades_trecho)} (Tempo: {chegada - tempo_anterior}h)")
+                    print(f"    => CHEGADA: {parada} (Tempo acumulado na rota: {chegada}h)")
                 else:
-                    _, tempo_trecho_simulado = grafo.caminho_mais_curto(cidade_anterior_rota, cidade_atual_rota)
-                    if tempo_trecho_simulado == float('inf'):
-                        print(f"    ERRO: Não foi possível calcular trecho de {cidade_anterior_rota} para {cidade_atual_rota}")
-                        break 
-                    tempo_acumulado_simulado += tempo_trecho_simulado
-                    print(f"    TRECHO: {cidade_anterior_rota} → {cidade_atual_rota} (Tempo: {tempo_trecho_simulado}h)")
-                    print(f"    => CHEGADA: {cidade_atual_rota} (Tempo acumulado na rota: {tempo_acumulado_simulado}h)")
-                entregas_nesta_cidade_sim = [e for e in entregas_nesta_rota if e.destino == cidade_atual_rota]
-                for entrega_obj_sim in entregas_nesta_cidade_sim:
+                    print(f"    => CHEGADA: {parada} (Próprio CD, Tempo: {chegada}h)")
+                tempo_anterior = chegada
+                for entrega_obj_sim in (e for e in entregas_nesta_rota if e.destino == parada):
                     print(f"       ENTREGA REALIZADA: {entrega_obj_sim}")
                     peso_simulado_no_caminhao -= entrega_obj_sim.peso
                     print(f"       Peso restante no caminhão: {peso_simulado_no_caminhao:.2f}kg")
-                cidade_anterior_rota = cidade_atual_rota
-            
-            ultima_parada_rota = rota_ate_ultima_entrega[-1]
+
+            ultima_parada_rota = linha_tempo.paradas[-1] if linha_tempo.paradas else cd_origem_obj.cidade
             tempo_total_com_retorno_simulado = tempo_ate_ultima_entrega
             rota_completa_com_retorno_simulada = list(rota_ate_ultima_entrega)
 
             if ultima_parada_rota != cd_origem_obj.cidade:
-                caminho_retorno_sim, tempo_retorno_sim = grafo.caminho_mais_curto(ultima_parada_rota, cd_origem_obj.cidade)
+                caminho_retorno_sim = tabela_retorno.caminho_retorno(ultima_parada_rota, cd_origem_obj.cidade)
                 if caminho_retorno_sim:
-                    print(f"\n    TRECHO RETORNO: {ultima_parada_rota} → {cd_origem_obj.cidade} (Tempo: {tempo_retorno_sim}h)")
+                    tempo_retorno_sim = tabela_retorno.retorno(ultima_parada_rota, cd_origem_obj.cidade)
+                    print(f"\n    TRECHO RETORNO: {' → '.join(caminho_retorno_sim)} (Tempo: {tempo_retorno_sim}h)")
                     rota_completa_com_retorno_simulada.extend(caminho_retorno_sim[1:])
                     tempo_total_com_retorno_simulado += tempo_retorno_sim
                     print(f"    => CHEGADA AO CD DE ORIGEM: {cd_origem_obj.cidade}")
@@ -169,8 +159,8 @@ def exibir_resultados_detalhados(resultado_alocacao, todos_os_centros, grafo, to
             print(f"  Tempo Total da Viagem Simulado (com retorno): {tempo_total_com_retorno_simulado:.2f}h")
             if tempo_total_com_retorno_simulado > caminhao.horas_operacao_maximas_dia:
                 print(f"  ATENÇÃO: Tempo total simulado com retorno ({tempo_total_com_retorno_simulado:.2f}h) excede as horas máximas do caminhão ({caminhao.horas_operacao_maximas_dia:.2f}h)!")
-            horas_restantes_dia_apos_entregas = caminhao.horas_operacao_maximas_dia - caminhao.tempo_rota_atual 
-            print(f"  Horas restantes do caminhão no dia (após rota de entregas): {horas_restantes_dia_apos_entregas:.2f}h")
+            horas_restantes_dia_apos_entregas = caminhao.horas_operacao_maximas_dia - tempo_total_com_retorno_simulado
+            print(f"  Horas restantes do caminhão no dia (após retorno ao CD): {horas_restantes_dia_apos_entregas:.2f}h")
             # Removi a separação com input para não travar a execução
             if i < len(caminhoes_ativos) -1 : # Adiciona separador visual entre caminhões
                  print("-" * 50 + "\n")
@@ -187,7 +177,7 @@ def exibir_resultados_detalhados(resultado_alocacao, todos_os_centros, grafo, to
         print(f"Total de {len(entregas_nao_alocadas_info)} entregas não puderam ser alocadas:")
         for info_nao_alocada in entregas_nao_alocadas_info:
             entrega_na = info_nao_alocada["entrega"]
-            lista_de_motivos_erro = info_nao_alocada["lista_de_motivos"] # Agora é uma lista
+            lista_de_motivos_erro = info_nao_alocada["diagnostico"].mensagens()
 
             print(f"  - Entrega: {entrega_na}") # Usa o __repr__ da Entrega
             print(f"    Motivos:")
@@ -201,5 +191,11 @@ def exibir_resultados_detalhados(resultado_alocacao, todos_os_centros, grafo, to
             print("-" * 50) # Separador para a próxima entrega não alocada
         print() # Linha extra no final da seção
 
+        # 4. Histograma dos motivos de falha (já agregado pelo roteirizador durante a alocação)
+        print("--- MOTIVOS DE FALHA (entregas afetadas | tentativas) ---\n")
+        for nome_motivo, contagem in sorted(roteirizador.histograma_falhas.como_dict().items(), key=lambda item: -item[1]["entregas"]):
+            print(f"  {nome_motivo:<25} {contagem['entregas']:>6} | {contagem['tentativas']:>8}")
+        print()
+
 if __name__ == "__main__":
     simular()
\ No newline at end of file